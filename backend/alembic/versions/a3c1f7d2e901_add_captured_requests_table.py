@@ -0,0 +1,50 @@
+"""Add captured_requests table for mock traffic capture
+
+Revision ID: a3c1f7d2e901
+Revises: 93eecd814e97
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'a3c1f7d2e901'
+down_revision = '93eecd814e97'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'captured_requests',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('group_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('endpoint_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('method', sa.String(), nullable=False),
+        sa.Column('path', sa.String(), nullable=False),
+        sa.Column('query', sa.String(), nullable=True),
+        sa.Column('headers', sa.JSON(), nullable=True),
+        sa.Column('body_sha256', sa.String(length=64), nullable=True),
+        sa.Column('body_size', sa.Integer(), nullable=False),
+        sa.Column('chaos_effect', sa.String(), nullable=True),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('duration_ms', sa.Float(), nullable=False),
+        sa.Column('received_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at_epoch', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_captured_requests'))
+    )
+    op.create_index(op.f('ix_captured_requests_group_id'), 'captured_requests', ['group_id'], unique=False)
+    op.create_index(op.f('ix_captured_requests_endpoint_id'), 'captured_requests', ['endpoint_id'], unique=False)
+    op.create_index(op.f('ix_captured_requests_received_at'), 'captured_requests', ['received_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_captured_requests_received_at'), table_name='captured_requests')
+    op.drop_index(op.f('ix_captured_requests_endpoint_id'), table_name='captured_requests')
+    op.drop_index(op.f('ix_captured_requests_group_id'), table_name='captured_requests')
+    op.drop_table('captured_requests')
@@ -0,0 +1,42 @@
+"""Add endpoint hits table
+
+Revision ID: a9d4c2f7e315
+Revises: f1b6d3e8a472
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4c2f7e315'
+down_revision = 'f1b6d3e8a472'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'endpoint_hits',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('endpoint_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('group_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('chaos_effect', sa.String(), nullable=False),
+        sa.Column('hits', sa.BigInteger(), nullable=False),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at_epoch', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_endpoint_hits')),
+        sa.UniqueConstraint('endpoint_id', 'status_code', 'chaos_effect', name=op.f('uq_endpoint_hits_endpoint_id'))
+    )
+    op.create_index(op.f('ix_endpoint_hits_group_id'), 'endpoint_hits', ['group_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_endpoint_hits_group_id'), table_name='endpoint_hits')
+    op.drop_table('endpoint_hits')
@@ -0,0 +1,31 @@
+"""Cascade endpoint children on delete
+
+Revision ID: b3e8f5a1c947
+Revises: a9d4c2f7e315
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e8f5a1c947'
+down_revision = 'a9d4c2f7e315'
+branch_labels = None
+depends_on = None
+
+CHILD_TABLES = ('headers', 'url_parameters', 'chaos_scenarios')
+
+
+def upgrade() -> None:
+    for table in CHILD_TABLES:
+        name = op.f(f'fk_{table}_endpoint_id_endpoints')
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, 'endpoints', ['endpoint_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    for table in CHILD_TABLES:
+        name = op.f(f'fk_{table}_endpoint_id_endpoints')
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, 'endpoints', ['endpoint_id'], ['id'])
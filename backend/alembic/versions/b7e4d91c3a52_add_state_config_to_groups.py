@@ -0,0 +1,24 @@
+"""Add state_config to groups for stateful mocks
+
+Revision ID: b7e4d91c3a52
+Revises: a3c1f7d2e901
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4d91c3a52'
+down_revision = 'a3c1f7d2e901'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('groups', sa.Column('state_config', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('groups', 'state_config')
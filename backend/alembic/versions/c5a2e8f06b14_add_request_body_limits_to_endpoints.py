@@ -0,0 +1,26 @@
+"""Add request body limits to endpoints
+
+Revision ID: c5a2e8f06b14
+Revises: b7e4d91c3a52
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a2e8f06b14'
+down_revision = 'b7e4d91c3a52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('endpoints', sa.Column('max_request_body_bytes', sa.Integer(), nullable=True))
+    op.add_column('endpoints', sa.Column('stream_request_validation', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    op.drop_column('endpoints', 'stream_request_validation')
+    op.drop_column('endpoints', 'max_request_body_bytes')
@@ -0,0 +1,42 @@
+"""Cascade group deletes and index foreign keys
+
+Revision ID: c6a1d8e4b093
+Revises: b3e8f5a1c947
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6a1d8e4b093'
+down_revision = 'b3e8f5a1c947'
+branch_labels = None
+depends_on = None
+
+GROUP_CHILD_TABLES = ('endpoints', 'chaos_scenarios')
+# Cascaded deletes look children up by these columns; without an index each one is a sequential scan
+FOREIGN_KEY_INDEXES = (
+    ('endpoints', 'group_id'),
+    ('headers', 'endpoint_id'),
+    ('url_parameters', 'endpoint_id'),
+    ('chaos_scenarios', 'endpoint_id'),
+)
+
+
+def upgrade() -> None:
+    for table in GROUP_CHILD_TABLES:
+        name = op.f(f'fk_{table}_group_id_groups')
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, 'groups', ['group_id'], ['id'], ondelete='CASCADE')
+    for table, column in FOREIGN_KEY_INDEXES:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def downgrade() -> None:
+    for table, column in FOREIGN_KEY_INDEXES:
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+    for table in GROUP_CHILD_TABLES:
+        name = op.f(f'fk_{table}_group_id_groups')
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, 'groups', ['group_id'], ['id'])
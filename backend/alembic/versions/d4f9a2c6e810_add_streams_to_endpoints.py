@@ -0,0 +1,26 @@
+"""Add streams to endpoints
+
+Revision ID: d4f9a2c6e810
+Revises: c6a1d8e4b093
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f9a2c6e810'
+down_revision = 'c6a1d8e4b093'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('endpoints', sa.Column('stream_type', sa.String(), nullable=True))
+    op.add_column('endpoints', sa.Column('stream_config', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('endpoints', 'stream_config')
+    op.drop_column('endpoints', 'stream_type')
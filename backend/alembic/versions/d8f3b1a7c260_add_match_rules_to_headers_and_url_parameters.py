@@ -0,0 +1,30 @@
+"""Add match rules to headers and url parameters
+
+Revision ID: d8f3b1a7c260
+Revises: c5a2e8f06b14
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8f3b1a7c260'
+down_revision = 'c5a2e8f06b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ('headers', 'url_parameters'):
+        op.add_column(table, sa.Column('match_type', sa.String(), nullable=False, server_default='exact'))
+        op.add_column(table, sa.Column('minimum', sa.Float(), nullable=True))
+        op.add_column(table, sa.Column('maximum', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ('headers', 'url_parameters'):
+        op.drop_column(table, 'maximum')
+        op.drop_column(table, 'minimum')
+        op.drop_column(table, 'match_type')
@@ -0,0 +1,24 @@
+"""Add response size to endpoints
+
+Revision ID: e2c7a94b5d18
+Revises: d8f3b1a7c260
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c7a94b5d18'
+down_revision = 'd8f3b1a7c260'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('endpoints', sa.Column('response_size_bytes', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('endpoints', 'response_size_bytes')
@@ -0,0 +1,25 @@
+"""Add serving plan to endpoints
+
+Revision ID: e7b3c9f1a524
+Revises: d4f9a2c6e810
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3c9f1a524'
+down_revision = 'd4f9a2c6e810'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing endpoints get their plan on their next save; until then the mock path analyses them on first use
+    op.add_column('endpoints', sa.Column('serving_plan', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('endpoints', 'serving_plan')
@@ -0,0 +1,46 @@
+"""Add chaos scenarios table
+
+Revision ID: f1b6d3e8a472
+Revises: e2c7a94b5d18
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b6d3e8a472'
+down_revision = 'e2c7a94b5d18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'chaos_scenarios',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('group_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('endpoint_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('phases', sa.JSON(), nullable=False),
+        sa.Column('repeat', sa.Boolean(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_by_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at_epoch', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id'], name=op.f('fk_chaos_scenarios_group_id_groups')),
+        sa.ForeignKeyConstraint(['endpoint_id'], ['endpoints.id'], name=op.f('fk_chaos_scenarios_endpoint_id_endpoints')),
+        sa.ForeignKeyConstraint(['created_by_id'], ['user.id'], name=op.f('fk_chaos_scenarios_created_by_id_user')),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_chaos_scenarios'))
+    )
+    op.create_index(op.f('ix_chaos_scenarios_group_id'), 'chaos_scenarios', ['group_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_chaos_scenarios_group_id'), table_name='chaos_scenarios')
+    op.drop_table('chaos_scenarios')
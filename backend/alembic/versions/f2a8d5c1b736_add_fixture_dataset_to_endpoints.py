@@ -0,0 +1,24 @@
+"""Add fixture dataset to endpoints
+
+Revision ID: f2a8d5c1b736
+Revises: e7b3c9f1a524
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a8d5c1b736'
+down_revision = 'e7b3c9f1a524'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('endpoints', sa.Column('fixture_dataset', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('endpoints', 'fixture_dataset')
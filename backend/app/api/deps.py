@@ -1,4 +1,5 @@
 from typing import AsyncGenerator, Optional
+from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -9,6 +10,7 @@ from sqlalchemy import select
 
 from app.core.config import settings
 from app.db.session import AsyncSessionLocal
+from app.models.group import Group
 from app.models.user import User
 from app.schemas.token import TokenPayload
 
@@ -42,4 +44,15 @@ async def get_current_user(
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user 
\ No newline at end of file
+    return user
+
+async def get_live_group(
+    group_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> UUID:
+    """The group of a /groups/{group_id}/... route, or 404 once it is (soft) deleted."""
+    result = await db.execute(select(Group.id).where(Group.id == group_id, Group.deleted_at.is_(None)))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Group not found")
+    return group_id
@@ -0,0 +1,93 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import get_current_user
+from app.models.user import User
+from app.schemas.debug import AdmissionReport, MemoryReport, ProfileStart, ProfileSummary
+from app.services.admission import admission_controller
+from app.services.diagnostics import memory_report, memory_tracer, request_profiler
+
+router = APIRouter()
+
+
+@router.post("/profile", response_model=ProfileSummary)
+async def start_profile(
+    profile_in: ProfileStart,
+    current_user: User = Depends(get_current_user),
+):
+    """Sample-profile the next `requests` mock requests handled by this worker.
+
+    Replaces any running session. A session also ends after PROFILER_MAX_SECONDS.
+    """
+    session = request_profiler.start(profile_in.requests, group=profile_in.group, path=profile_in.path)
+    return session.summary()
+
+
+@router.get("/profile", response_model=ProfileSummary)
+async def read_profile(
+    current_user: User = Depends(get_current_user),
+):
+    """Progress of the running session, or the result of the last one."""
+    if request_profiler.last is None:
+        raise HTTPException(status_code=404, detail="No profiling session has run on this worker")
+    return request_profiler.last.summary()
+
+
+@router.get("/profile/folded", response_class=PlainTextResponse)
+async def read_profile_folded(
+    current_user: User = Depends(get_current_user),
+):
+    """The sampled stacks in folded format, for flamegraph.pl, speedscope or inferno."""
+    if request_profiler.last is None:
+        raise HTTPException(status_code=404, detail="No profiling session has run on this worker")
+    return request_profiler.last.folded()
+
+
+@router.delete("/profile", response_model=ProfileSummary)
+async def stop_profile(
+    current_user: User = Depends(get_current_user),
+):
+    """Stop the running session early; its samples are kept."""
+    session = request_profiler.stop() or request_profiler.last
+    if session is None:
+        raise HTTPException(status_code=404, detail="No profiling session has run on this worker")
+    return session.summary()
+
+
+@router.get("/memory", response_model=MemoryReport)
+async def read_memory(
+    structures: bool = Query(True, description="Walk the caches and pools to size them"),
+    limit: int = Query(20, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+):
+    """RSS, approximate deep sizes of the in-memory caches and pools and, while
+    tracemalloc runs, the top allocation sites and their growth since it started."""
+    # Walking the structures takes a while on big caches; keep it off the event loop
+    return await asyncio.to_thread(memory_report, structures, limit)
+
+
+@router.post("/memory/tracemalloc/start")
+async def start_tracemalloc(
+    current_user: User = Depends(get_current_user),
+):
+    """Start tracing allocations; /memory reports growth against this moment."""
+    await asyncio.to_thread(memory_tracer.start)
+    return {"tracing": True, "frames": memory_tracer.frames}
+
+
+@router.post("/memory/tracemalloc/stop")
+async def stop_tracemalloc(
+    current_user: User = Depends(get_current_user),
+):
+    """Stop tracing and free its bookkeeping."""
+    memory_tracer.stop()
+    return {"tracing": False}
+
+
+@router.get("/admission", response_model=AdmissionReport)
+async def read_admission(
+    current_user: User = Depends(get_current_user),
+):
+    """Event loop lag, and per request class its thresholds, requests in flight and shed counts on this worker."""
+    return admission_controller.stats()
@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user, get_db
 from app.models.user import User
 from app.repositories.endpoint import EndpointRepository
-from app.schemas.endpoint import Endpoint, EndpointCreate, EndpointUpdate
+from app.schemas.endpoint import Endpoint, EndpointBatchDelete, EndpointBatchUpdate, EndpointCreate, EndpointUpdate
 
 router = APIRouter()
 
@@ -33,6 +33,35 @@ async def create_endpoint(
     endpoint = await repo.create(endpoint_data, current_user.id)
     return endpoint
 
+# Declared before the "/{endpoint_id}" routes, which would otherwise match "batch"
+@router.patch("/batch", response_model=List[Endpoint])
+async def update_endpoints(
+    group_id: UUID,
+    updates: List[EndpointBatchUpdate],
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Partially update several endpoints of a group in one transaction.
+
+    Headers and URL parameters are replaced for the endpoints that set them.
+    """
+    if not updates:
+        return []
+    repo = EndpointRepository(db)
+    return await repo.update_many(group_id, updates)
+
+@router.post("/batch/delete")
+async def delete_endpoints(
+    group_id: UUID,
+    batch: EndpointBatchDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete several endpoints of a group in one statement."""
+    repo = EndpointRepository(db)
+    deleted = await repo.delete_many(group_id, batch.ids)
+    return {"message": f"{len(deleted)} endpoints deleted successfully", "deleted": deleted}
+
 @router.get("/{endpoint_id}", response_model=Endpoint)
 async def get_endpoint(
     group_id: UUID,
@@ -59,10 +88,10 @@ async def update_endpoint(
 ):
     """Update an endpoint."""
     repo = EndpointRepository(db)
-    endpoint = await repo.get_by_id(endpoint_id)
-    if not endpoint:
+    endpoint_group_id = await repo.get_group_id(endpoint_id)
+    if not endpoint_group_id:
         raise HTTPException(status_code=404, detail="Endpoint not found")
-    if endpoint.group_id != group_id:
+    if endpoint_group_id != group_id:
         raise HTTPException(status_code=404, detail="Endpoint not found in this group")
     updated_endpoint = await repo.update(endpoint_id, endpoint_data)
     if not updated_endpoint:
@@ -78,10 +107,10 @@ async def delete_endpoint(
 ):
     """Delete an endpoint."""
     repo = EndpointRepository(db)
-    endpoint = await repo.get_by_id(endpoint_id)
-    if not endpoint:
+    endpoint_group_id = await repo.get_group_id(endpoint_id)
+    if not endpoint_group_id:
         raise HTTPException(status_code=404, detail="Endpoint not found")
-    if endpoint.group_id != group_id:
+    if endpoint_group_id != group_id:
         raise HTTPException(status_code=404, detail="Endpoint not found in this group")
     success = await repo.delete(endpoint_id)
     if not success:
@@ -0,0 +1,136 @@
+import os
+from typing import List
+from uuid import UUID, uuid4
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_db
+from app.core.config import settings
+from app.models.endpoint import Endpoint
+from app.models.user import User
+from app.schemas.fixture import FIXTURE_NAME, FixtureGenerate, FixtureInfo, check_indexes
+from app.services.fixtures import fixture_store
+from app.utils.fixture_dataset import DatasetError
+
+router = APIRouter()
+
+
+def check_name(name: str) -> None:
+    if not FIXTURE_NAME.match(name):
+        raise HTTPException(status_code=400, detail="Fixture dataset names are 1 to 64 letters, digits, '_' or '-'")
+
+
+async def build(group_id: UUID, name: str, source: dict) -> dict:
+    try:
+        return await fixture_store.build(group_id, name, source)
+    except DatasetError as e:
+        raise HTTPException(status_code=400, detail=f"Fixture dataset not built: {e}")
+
+
+@router.get("", response_model=List[FixtureInfo])
+async def list_fixtures(
+    group_id: UUID,
+    current_user: User = Depends(get_current_user)
+):
+    """List the fixture datasets of a group, as currently served."""
+    return fixture_store.list(group_id)
+
+
+@router.get("/{name}", response_model=FixtureInfo)
+async def read_fixture(
+    group_id: UUID,
+    name: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get a dataset's current version, size and indexes."""
+    check_name(name)
+    info = fixture_store.info(group_id, name)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Fixture dataset not found")
+    return info
+
+
+@router.post("/{name}", response_model=FixtureInfo)
+async def generate_fixture(
+    group_id: UUID,
+    name: str,
+    fixture_in: FixtureGenerate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Generate `records` records from a schema and make them the dataset's current version.
+
+    Ids are numbered 1..N so detail URLs are predictable. Endpoints serving
+    the dataset pick up the new version without being saved again.
+    """
+    check_name(name)
+    if fixture_in.records > settings.FIXTURE_MAX_RECORDS:
+        raise HTTPException(status_code=400, detail=f"A dataset holds at most {settings.FIXTURE_MAX_RECORDS} records")
+    schema = fixture_in.schema_
+    if fixture_in.endpoint_id is not None:
+        result = await db.execute(
+            select(Endpoint.response_schema).where(Endpoint.id == fixture_in.endpoint_id, Endpoint.group_id == group_id)
+        )
+        schema = result.scalar_one_or_none()
+        if not isinstance(schema, dict):
+            raise HTTPException(status_code=404, detail="Endpoint not found in this group, or it has no response schema")
+        # A listing's schema describes the array; records are its items
+        if schema.get("type") == "array" and isinstance(schema.get("items"), dict):
+            schema = schema["items"]
+    return await build(group_id, name, {
+        "kind": "generated",
+        "schema": schema,
+        "records": fixture_in.records,
+        "id_field": fixture_in.id_field,
+        "indexes": fixture_in.indexes,
+    })
+
+
+@router.put("/{name}", response_model=FixtureInfo)
+async def upload_fixture(
+    request: Request,
+    group_id: UUID,
+    name: str,
+    id_field: str = Query("id"),
+    indexes: List[str] = Query([], description="Fields to index for filtered listings"),
+    current_user: User = Depends(get_current_user)
+):
+    """Replace the dataset with the request body: a JSON array of records or one JSON record per line.
+
+    Every record needs a unique `id_field`.
+    """
+    check_name(name)
+    try:
+        indexes = check_indexes(None, indexes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    uploads = os.path.join(settings.FIXTURE_DIR, ".uploads")
+    os.makedirs(uploads, exist_ok=True)
+    path = os.path.join(uploads, uuid4().hex)
+    try:
+        # Spooled to disk as it arrives; the build process reads it from there
+        with open(path, "wb") as file:
+            size = 0
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > settings.FIXTURE_MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail=f"Uploads are limited to {settings.FIXTURE_MAX_UPLOAD_BYTES} bytes")
+                file.write(chunk)
+        return await build(group_id, name, {"kind": "uploaded", "path": path, "id_field": id_field, "indexes": indexes})
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@router.delete("/{name}")
+async def delete_fixture(
+    group_id: UUID,
+    name: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Delete a dataset; endpoints serving it answer 500 until it is built again."""
+    check_name(name)
+    if not fixture_store.delete(group_id, name):
+        raise HTTPException(status_code=404, detail="Fixture dataset not found")
+    return {"message": "Fixture dataset deleted successfully"}
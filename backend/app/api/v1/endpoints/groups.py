@@ -1,21 +1,49 @@
+from datetime import datetime, timezone
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user, get_db, get_live_group
+from app.core.config import settings
 from app.models.group import Group
 from app.models.user import User
 from app.schemas.group import GroupCreate, GroupUpdate, GroupResponse
-from app.api.v1.endpoints import endpoints
+from app.services.mock_routes import route_cache
+from app.services.resource_store import resource_store
+from app.api.v1.endpoints import endpoints, fixtures, scenarios
 
 router = APIRouter()
 
-# Include endpoints router
+
+def check_group_name(name: str) -> None:
+    # Imported here: the API router includes this module
+    from app.api.v1.router import RESERVED_GROUP_NAMES
+
+    if name.lower() in RESERVED_GROUP_NAMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"'{name}' is reserved by the management API",
+        )
+
+# Include endpoints router; a soft-deleted group's sub-resources answer 404 like the group itself
 router.include_router(
     endpoints.router,
     prefix="/{group_id}/endpoints",
-    tags=["endpoints"]
+    tags=["endpoints"],
+    dependencies=[Depends(get_live_group)],
+)
+router.include_router(
+    scenarios.router,
+    prefix="/{group_id}/scenarios",
+    tags=["scenarios"],
+    dependencies=[Depends(get_live_group)],
+)
+router.include_router(
+    fixtures.router,
+    prefix="/{group_id}/fixtures",
+    tags=["fixtures"],
+    dependencies=[Depends(get_live_group)],
 )
 
 
@@ -24,7 +52,7 @@ async def read_groups(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> Any:
-    result = await db.execute(select(Group))
+    result = await db.execute(select(Group).where(Group.deleted_at.is_(None)))
     return list(result.scalars().all())
 
 
@@ -35,9 +63,10 @@ async def create_group(
     current_user: User = Depends(get_current_user),
     group_in: GroupCreate,
 ) -> Any:
+    check_group_name(group_in.name)
     # Check if a group with the same name already exists
     result = await db.execute(
-        select(Group).where(Group.name == group_in.name)
+        select(Group).where(Group.name == group_in.name, Group.deleted_at.is_(None))
     )
     existing_group = result.scalar_one_or_none()
     if existing_group:
@@ -49,6 +78,7 @@ async def create_group(
     group = Group(
         name=group_in.name,
         description=group_in.description,
+        state_config=group_in.state_config.model_dump() if group_in.state_config else None,
         created_by_id=str(current_user.id),
     )
     db.add(group)
@@ -66,7 +96,8 @@ async def read_group(
 ) -> Any:
     result = await db.execute(
         select(Group).where(
-            Group.id == group_id
+            Group.id == group_id,
+            Group.deleted_at.is_(None),
         )
     )
     group = result.scalar_one_or_none()
@@ -83,9 +114,12 @@ async def update_group(
     group_id: str,
     group_in: GroupUpdate,
 ) -> Any:
+    if group_in.name is not None:
+        check_group_name(group_in.name)
     result = await db.execute(
         select(Group).where(
-            Group.id == group_id
+            Group.id == group_id,
+            Group.deleted_at.is_(None),
         )
     )
     group = result.scalar_one_or_none()
@@ -98,6 +132,10 @@ async def update_group(
     db.add(group)
     await db.commit()
     await db.refresh(group)
+    # A rename changes the URL prefix of every mock endpoint in the group
+    route_cache.invalidate(group.id)
+    if "state_config" in group_in.model_fields_set:
+        resource_store.drop_group(group.id)
     return group
 
 
@@ -108,15 +146,22 @@ async def delete_group(
     current_user: User = Depends(get_current_user),
     group_id: str,
 ) -> Any:
-    result = await db.execute(
-        select(Group).where(
-            Group.id == group_id
+    # One statement either way: nothing of the group is loaded into the session
+    if settings.GROUP_SOFT_DELETE:
+        # Hidden right away; the purge job removes it after GROUP_PURGE_AFTER_SECONDS
+        statement = (
+            update(Group)
+            .where(Group.id == group_id, Group.deleted_at.is_(None))
+            .values(deleted_at=datetime.now(timezone.utc))
         )
-    )
-    group = result.scalar_one_or_none()
-    if not group:
+    else:
+        # Endpoints, their headers and parameters, and scenarios go by ON DELETE CASCADE
+        statement = delete(Group).where(Group.id == group_id)
+    result = await db.execute(statement.returning(Group.id))
+    deleted_id = result.scalar_one_or_none()
+    if not deleted_id:
         raise HTTPException(status_code=404, detail="Group not found")
-    
-    await db.delete(group)
     await db.commit()
-    return {"status": "success"} 
\ No newline at end of file
+    route_cache.invalidate(deleted_id)
+    resource_store.drop_group(deleted_id)
+    return {"status": "success"}
@@ -1,140 +1,127 @@
 import asyncio
 import random
 import json
-from typing import Any, Dict, Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import JSONResponse, PlainTextResponse
+import time
+from typing import Any, Dict, Optional, List, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, status
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from uuid import UUID
-from jsonschema import validate
-from jsonschema.exceptions import ValidationError
-from faker import Faker
+from uuid import UUID, uuid4
 
 from app.api.deps import get_db
-from app.utils.json_schema import generate_data_from_schema
+from app.core.config import settings
+from app.services.admission import HEAVY, admission_controller
+from app.db.session import AsyncSessionLocal
 from app.models.endpoint import Endpoint
-from app.models.group import Group
+from app.schemas.mock_batch import MockBatch, MockBatchResponse
+from app.services.mock_routes import route_cache, matcher_cache, template_cache, validator_cache, GroupRoutes
+from app.services.resource_store import resource_store, resolve_collection, apply_operation
+from app.services.traffic_capture import traffic_capture
+from app.services.hit_counters import hit_counters
+from app.services.faker_pools import faker_pools
+from app.services.schema_generation import schema_generator
+from app.services.sized_payload import response_size, sized_response
+from app.services.chaos_scenarios import apply_scenario, scenario_cache
+from app.services.embedded_store import embedded_store
+from app.services.diagnostics import request_profiler
+from app.services.mock_batch import run_batch
+from app.services.mock_streams import stream_hub
+from app.services.fixtures import fixture_store
+from app.services.serving_plan import CONSTANT, EMPTY, FIXTURE, INVALID, TEMPLATE, plan_cache
+from app.services.request_body import body_digest, first_error, read_body, read_json_body, supports_streaming, validate_array_stream
+from app.utils.response_template import TemplateContext, TemplateError
 
 router = APIRouter()
 
-# Initialize Faker instance
-fake = Faker()
 
-# --- Start: Modify post-processing helper for re-generation, rounding, and empty object filtering ---
-def post_process_data(data: Any, schema: Dict[str, Any], precision: int = 2) -> Any:
-    """Recursively processes generated data based on schema:
-       - Re-generates numbers if they fall outside min/max defined in schema.
-       - Rounds floats.
-       - Removes empty objects from arrays.
-    """
-    schema_type = schema.get("type")
-
-    if schema_type == "number" and isinstance(data, (int, float)):
-        min_val = schema.get("minimum", schema.get("min_value"))
-        max_val = schema.get("maximum", schema.get("max_value"))
-
-        processed_data = data
-        # --- Re-generation if out of bounds ---
-        is_out_of_bounds = False
-        if min_val is not None and processed_data < min_val:
-            is_out_of_bounds = True
-        if max_val is not None and processed_data > max_val:
-            is_out_of_bounds = True
-        
-        # Ensure both min and max are valid for uniform generation if needed
-        if is_out_of_bounds and min_val is not None and max_val is not None and min_val <= max_val:
-            processed_data = random.uniform(min_val, max_val)
-        # If bounds are invalid or missing, we keep the original (potentially out-of-bounds) data
-
-        # --- Rounding (only if it was originally float or re-generation resulted in float) ---
-        if isinstance(processed_data, float):
-             return round(processed_data, precision)
-        else:
-            return processed_data
-
-    elif schema_type == "integer" and isinstance(data, (int, float)):
-        min_val = schema.get("minimum", schema.get("min_value"))
-        max_val = schema.get("maximum", schema.get("max_value"))
-
-        # Ensure data is integer first (jsf might produce float for integer schema)
-        processed_data = int(round(data))
-
-        # --- Re-generation if out of bounds ---
-        is_out_of_bounds = False
-        if min_val is not None and processed_data < min_val:
-            is_out_of_bounds = True
-        if max_val is not None and processed_data > max_val:
-            is_out_of_bounds = True
-            
-        # Ensure both min and max are valid for randint generation if needed
-        if is_out_of_bounds and min_val is not None and max_val is not None and min_val <= max_val:
-            processed_data = random.randint(min_val, max_val)
-        # If bounds are invalid or missing, we keep the original (potentially out-of-bounds) int data
-
-        return processed_data
-
-    elif schema_type == "object" and isinstance(data, dict) and "properties" in schema:
-        properties = schema.get("properties", {})
-        # Process properties recursively
-        processed_obj = {
-            k: post_process_data(v, properties.get(k, {}), precision)
-            for k, v in data.items()
-            if k in properties
-        }
-        # Return the processed object, or None if it became empty (optional, decide if needed)
-        # For now, return even if empty, filtering happens at array level
-        return processed_obj
-
-    elif schema_type == "array" and isinstance(data, list) and "items" in schema:
-        item_schema = schema.get("items", {})
-        # Recursively process each item first
-        processed_items = [post_process_data(item, item_schema, precision) for item in data]
-        # --- Start: Filter out empty objects --- 
-        filtered_items = [item for item in processed_items if item != {}]
-        # --- End: Filter out empty objects --- 
-        return filtered_items
-
-    elif isinstance(data, float): # Fallback rounding
-        return round(data, precision)
-    else:
-        return data
-# --- End: Modify post-processing helper ---
+async def no_db() -> None:
+    return None
 
-async def handle_mock_endpoint(
+
+# Embedded mode serves from files; the mock routes then never open a database session
+MockDB = Depends(no_db) if embedded_store.enabled else Depends(get_db)
+
+async def serve_stateful(
     request: Request,
+    routes: GroupRoutes,
+    endpoint: Endpoint,
+    path_params: Dict[str, str],
+    request_body: Any,
+) -> Response:
+    """Applies the request to the group's in-memory collection and returns the stored state."""
+    collection_name, item_id = resolve_collection(endpoint.path, path_params)
+    collection = resource_store.collection(routes.group_id, collection_name, routes.state_config)
+    method = request.method
+    if method in ["POST", "PUT", "PATCH"] and request_body is None:
+        request_body = await read_json_body(request, body_limit(endpoint))
+    rule_params = {param.name for param in endpoint.url_parameters or []}
+    status_code, content = apply_operation(collection, method, item_id, request_body, dict(request.query_params), rule_params)
+    if status_code >= 300:
+        return JSONResponse(content=content, status_code=status_code)
+    if method != "GET":
+        resource_store.mark_dirty(routes.group_id)
+
+    final_status_code = getattr(request.state, "override_status_code", endpoint.response_status_code)
+    if final_status_code == 204:
+        return Response(status_code=204)
+    return JSONResponse(content=content, status_code=final_status_code)
+
+def body_limit(endpoint: Endpoint) -> int:
+    return endpoint.max_request_body_bytes or settings.MOCK_MAX_REQUEST_BODY_BYTES
+
+async def find_endpoint(
+    db: Optional[AsyncSession],
     group_name: str,
+    request_method: str,
     endpoint_path: str,
-    db: AsyncSession = Depends(get_db),
-) -> Any:
-    # Find the group and endpoint
-    # Case-insensitive search for group name
-    result = await db.execute(
-        select(Group).filter(func.lower(Group.name) == group_name.lower())
-    )
-    group = result.scalar_one_or_none()
-    if not group:
+) -> Tuple[GroupRoutes, Endpoint, Dict[str, str]]:
+    """Resolves a mock URL to the group's route table, the endpoint and its path parameters, or 404s."""
+    # Case-insensitive group lookup, served from the compiled route table
+    if embedded_store.enabled:
+        routes = embedded_store.get_group(group_name)
+    else:
+        routes = await route_cache.get_group(db, group_name)
+    if not routes:
         raise HTTPException(status_code=404, detail=f"Group '{group_name}' not found")
     
-    # Find the endpoint matching the path and method
-    request_method = request.method
-    result = await db.execute(
-        select(Endpoint)
-        .options(selectinload(Endpoint.headers), selectinload(Endpoint.url_parameters))
-        .filter(
-            Endpoint.group_id == str(group.id),
-            Endpoint.path == endpoint_path,
-            Endpoint.method == request_method
-        )
-    )
-    endpoint = result.scalar_one_or_none()
+    # Find the endpoint matching the path and method in the group's route trie
+    match = routes.match(request_method, endpoint_path)
+    endpoint = None
+    if match:
+        endpoint_id, path_params = match
+        if embedded_store.enabled:
+            endpoint = embedded_store.get_endpoint(endpoint_id)
+        else:
+            result = await db.execute(
+                select(Endpoint)
+                .options(selectinload(Endpoint.headers), selectinload(Endpoint.url_parameters))
+                .filter(Endpoint.id == endpoint_id)
+            )
+            endpoint = result.scalar_one_or_none()
+            if not endpoint:
+                # Deleted by another worker since the table was built
+                route_cache.invalidate(routes.group_id)
     
     if not endpoint:
         raise HTTPException(
             status_code=404, 
-            detail=f"No endpoint found with path '{endpoint_path}' and method '{request_method}' in group '{group.name}'"
+            detail=f"No endpoint found with path '{endpoint_path}' and method '{request_method}' in group '{routes.group_name}'"
         )
+    return routes, endpoint, path_params
+
+async def handle_mock_endpoint(
+    request: Request,
+    group_name: str,
+    endpoint_path: str,
+    db: Optional[AsyncSession] = MockDB,
+) -> Any:
+    request_method = request.method
+    routes, endpoint, path_params = await find_endpoint(db, group_name, request_method, endpoint_path)
+    request.state.path_params = path_params
+    request.state.mock_group_id = routes.group_id
+    request.state.mock_endpoint_id = endpoint.id
     
     is_chaos = request.url.path.endswith("/chaos")
     chaos_effect = None # Initialize chaos effect
@@ -142,8 +129,15 @@ async def handle_mock_endpoint(
     if is_chaos and not endpoint.chaos_mode:
         raise HTTPException(status_code=404, detail="Chaos mode not enabled for this endpoint")
 
-    # Handle chaos mode selection first
-    if is_chaos:
+    # A running scenario shapes every request in its scope, /chaos included,
+    # following its timeline instead of picking a random effect
+    # Scenarios are stored in the database, so embedded mode has none
+    scenario = None if embedded_store.enabled else await scenario_cache.current(db, routes.group_id, endpoint.id)
+    if scenario:
+        await apply_scenario(request, *scenario)
+
+    # Handle chaos mode selection first; streams get their chaos per message instead
+    if is_chaos and not scenario and not endpoint.stream_type:
         chaos_effect = random.choice([
             "timeout",
             "error_500",
@@ -152,7 +146,9 @@ async def handle_mock_endpoint(
             "random_body",
             "random_valid_status",
             "random_error_status",
+            "large_body",
         ])
+        request.state.chaos_effect = chaos_effect
         
         if chaos_effect == "timeout":
             await asyncio.sleep(30)
@@ -161,9 +157,9 @@ async def handle_mock_endpoint(
             raise HTTPException(status_code=500, detail="Chaos Mode: Simulated Internal Server Error")
         elif chaos_effect == "random_body":
             random_data = {
-                "chaos_id": fake.uuid4(),
-                "chaos_message": fake.sentence(),
-                "chaos_payload": {"key": fake.word(), "value": fake.random_int(min=1, max=1000)}
+                "chaos_id": str(uuid4()),
+                "chaos_message": faker_pools.sample("sentence"),
+                "chaos_payload": {"key": faker_pools.sample("word"), "value": random.randint(1, 1000)}
             }
             return JSONResponse(content=random_data, status_code=200)
         elif chaos_effect == "random_error_status":
@@ -180,112 +176,252 @@ async def handle_mock_endpoint(
             # Set override status, then fall through
             request.state.override_status_code = random.choice([200, 201, 202, 204])
             # Fall through
+        elif chaos_effect == "large_body":
+            # Response is replaced by a synthesized payload below; fall through
+            pass
+
+    try:
+        template = template_cache.get(endpoint)
+    except TemplateError as e:
+        raise HTTPException(status_code=500, detail=f"Invalid response template: {e}")
 
     # --- Request Body Validation --- (If applicable)
+    request_body: Any = None
     if request_method in ["POST", "PUT", "PATCH"] and endpoint.request_body_schema:
+        schema_to_validate = endpoint.request_body_schema
+        if not isinstance(schema_to_validate, dict):
+            raise HTTPException(status_code=500, detail="Request body schema not configured correctly.")
         try:
-            request_body = await request.json()
-        except json.JSONDecodeError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid JSON received in request body: {e}",
-            )
-        try:
-            schema_to_validate = endpoint.request_body_schema
-            if not isinstance(schema_to_validate, dict):
-                 raise HTTPException(status_code=500, detail="Request body schema not configured correctly.")
-            validate(instance=request_body, schema=schema_to_validate)
-        except ValidationError as e:
-            raise HTTPException(status_code=400, detail=f"Request body validation failed: {e.message} on path \'{list(e.path)}\'")
+            validator = validator_cache.get(endpoint)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"An unexpected error occurred during request body validation: {e}")
+        # Stateful groups and body-echoing templates need the parsed document
+        if endpoint.stream_request_validation and not routes.state_config and not template.needs_body and supports_streaming(schema_to_validate):
+            await validate_array_stream(request, body_limit(endpoint), validator)
+        else:
+            request_body = await read_json_body(request, body_limit(endpoint))
+            try:
+                error = first_error(validator, request_body)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"An unexpected error occurred during request body validation: {e}")
+            if error is not None:
+                raise HTTPException(status_code=400, detail=f"Request body validation failed: {error.message} on path \'{list(error.path)}\'")
 
     # --- Header/Parameter Validation --- (If applicable)
-    headers_list = endpoint.headers or []
-    for header in headers_list:
-        header_value = request.headers.get(header.name)
-        if header.required and header_value != header.value:
-            if header.default_response and header.default_status_code:
-                return JSONResponse(content=header.default_response, status_code=header.default_status_code)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid header: {header.name}",
-            )
-    
-    # Validate URL parameters
-    url_params_list = endpoint.url_parameters or []
-    for param in url_params_list:
-        param_value = request.query_params.get(param.name)
-        if param.required and param_value != param.value:
-            if param.default_response and param.default_status_code:
-                return JSONResponse(content=param.default_response, status_code=param.default_status_code)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid parameter: {param.name}",
-            )
+    try:
+        matcher = matcher_cache.get(endpoint)
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=f"Invalid header or parameter rule: {e}")
+    violation = matcher.check(request.headers, path_params, request.query_params) if matcher else None
+    if violation:
+        rule = violation.rule
+        if rule.default_response and rule.default_status_code:
+            return JSONResponse(content=rule.default_response, status_code=rule.default_status_code)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {violation.kind}: {rule.name}",
+        )
     
+    # --- Streams --- (Messages at the configured rate instead of one response)
+    if endpoint.stream_type == "sse":
+        # Open for as long as the client listens; the stream hub bounds what it costs, not admission
+        admission_controller.release(request)
+        return stream_hub.sse(endpoint, path_params, chaos=is_chaos)
+    if endpoint.stream_type == "websocket":
+        raise HTTPException(status_code=426, detail="This endpoint is a WebSocket stream", headers={"Upgrade": "websocket"})
+
     # --- Simulate Configured Delay (if chaos didn't already delay/exit) ---
-    if endpoint.max_wait_time > 0 and chaos_effect not in ["slow_response", "random_delay", "timeout"]:
+    if endpoint.max_wait_time > 0 and not scenario and chaos_effect not in ["slow_response", "random_delay", "timeout"]:
          await asyncio.sleep(random.uniform(0, endpoint.max_wait_time))
     
-    # --- Response Generation --- 
-    final_status_code = endpoint.response_status_code
-    response_content: Any = {}
-    response_media_type = "application/json"
+    # --- Stateful Groups --- (Stored items replace generated responses)
+    if routes.state_config:
+        return await serve_stateful(request, routes, endpoint, path_params, request_body)
 
-    if endpoint.response_schema:
-        try:
-            schema_data = endpoint.response_schema
-            if isinstance(schema_data, str):
-                try: schema_data = json.loads(schema_data)
-                except json.JSONDecodeError: raise HTTPException(status_code=500, detail="Invalid JSON schema definition stored.")
-            if not isinstance(schema_data, dict): raise HTTPException(status_code=500, detail="Response schema is not a valid dictionary.")
-            # Use the jsf-based generator function
-            response_content = generate_data_from_schema(schema_data)
-            
-            # --- Start: Apply post-processing (clamping & rounding) ---
-            # Pass both the generated content AND the original schema
-            response_content = post_process_data(response_content, schema_data, precision=2)
-            # --- End: Apply post-processing ---
-            
-        except HTTPException as http_exc: raise http_exc
-        except Exception as e: raise HTTPException(status_code=500, detail=f"Failed to generate response from schema: {e}")
-    elif endpoint.response_body:
-        try:
-            response_content = json.loads(endpoint.response_body)
-        except json.JSONDecodeError:
-            response_content = endpoint.response_body
-            response_media_type = "text/plain"
+    # --- Response Generation --- (Dispatched on the plan made when the endpoint was saved)
+    plan = plan_cache.get(endpoint)
+    if plan.kind == INVALID:
+        raise HTTPException(status_code=500, detail=plan.error)
+    final_status_code = getattr(request.state, "override_status_code", endpoint.response_status_code)
+    if plan.kind == FIXTURE:
+        # Stable records from the memory-mapped dataset: one by id, or a filtered page
+        return fixture_store.respond(endpoint, routes.group_id, path_params, request.query_params, final_status_code)
+    target_size = response_size(endpoint, chaos_effect)
+    if plan.offload or target_size:
+        admission_controller.escalate(request, HEAVY)
+    if target_size and final_status_code != 204:
+        # Streams copies of a few generated records up to the requested byte size
+        return await sized_response(endpoint, plan, target_size, final_status_code)
+    if plan.kind in (CONSTANT, EMPTY):
+        # Encoded once per endpoint version
+        return Response(content=plan.content, status_code=final_status_code, media_type=plan.media_type)
 
-    # --- Apply Chaos Status Code Override --- 
-    if hasattr(request.state, 'override_status_code'):
-        final_status_code = request.state.override_status_code
+    context = None
+    if template.active:
+        if template.needs_body and request_body is None and request_method in ["POST", "PUT", "PATCH", "DELETE"]:
+            # Not validated, so not read yet; a body that isn't JSON just leaves its fields empty
+            raw_body = await read_body(request, body_limit(endpoint))
+            try:
+                request_body = json.loads(raw_body) if raw_body else None
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                request_body = None
+        context = TemplateContext(request, path_params, request_body, faker_pools)
 
-    # --- Return Final Response --- 
-    if response_media_type == "application/json":
+    if plan.kind == TEMPLATE:
+        response_content, response_media_type = template.render_body(context)
+        if response_media_type != "application/json":
+            return PlainTextResponse(content=str(response_content), status_code=final_status_code)
         return JSONResponse(content=response_content, status_code=final_status_code)
-    else:
-        # Ensure content is string for PlainTextResponse
-        return PlainTextResponse(content=str(response_content), status_code=final_status_code)
 
+    try:
+        # jsf generation plus post-processing (clamping & rounding) and path params;
+        # schemas estimated as expensive are rendered off the event loop
+        response_content = await schema_generator.render(plan.schema, path_params, plan.offload)
+        if context is not None:
+            response_content = template.apply(response_content, context)
+    except HTTPException as http_exc: raise http_exc
+    except Exception as e: raise HTTPException(status_code=500, detail=f"Failed to generate response from schema: {e}")
+    return JSONResponse(content=response_content, status_code=final_status_code)
 
-# Dynamic route handler for all HTTP methods
-@router.api_route("/{group_name}/{endpoint_path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
-async def mock_endpoint(
+
+async def serve_mock_request(
     request: Request,
     group_name: str,
     endpoint_path: str,
-    db: AsyncSession = Depends(get_db),
+    db: Optional[AsyncSession],
 ) -> Any:
-    return await handle_mock_endpoint(request, group_name, endpoint_path, db)
+    """Runs handle_mock_endpoint, tags the response with the chaos effect that was applied
+       (X-Chaos-Effect) and hands a compact record of the exchange to traffic capture.
+    """
+    # Armed only while a profiling session is waiting for requests
+    profile = request_profiler.enter(group_name, endpoint_path) if request_profiler.session else None
+    try:
+        started = time.perf_counter()
+        try:
+            response = await handle_mock_endpoint(request, group_name, endpoint_path, db)
+        except HTTPException as exc:
+            chaos_effect = getattr(request.state, "chaos_effect", None)
+            if chaos_effect:
+                exc.headers = {**(exc.headers or {}), "X-Chaos-Effect": chaos_effect}
+            if hit_counters.enabled:
+                count_hit(request, exc.status_code)
+            if traffic_capture.enabled:
+                await capture_traffic(request, exc.status_code, started)
+            raise
+        chaos_effect = getattr(request.state, "chaos_effect", None)
+        if chaos_effect:
+            response.headers["X-Chaos-Effect"] = chaos_effect
+        if hit_counters.enabled:
+            count_hit(request, response.status_code)
+        if traffic_capture.enabled:
+            await capture_traffic(request, response.status_code, started)
+        return response
+    finally:
+        if profile is not None:
+            request_profiler.exit(profile)
+
+
+def count_hit(request: Request, status_code: int) -> None:
+    state = request.state
+    endpoint_id = getattr(state, "mock_endpoint_id", None)
+    # Requests that matched no endpoint have nothing to count against
+    if endpoint_id is not None:
+        hit_counters.record(state.mock_group_id, endpoint_id, status_code, getattr(state, "chaos_effect", None))
+
+
+async def capture_traffic(request: Request, status_code: int, started: float) -> None:
+    duration_ms = (time.perf_counter() - started) * 1000
+    # The handler records the digest while reading the body; otherwise it is hashed as it streams in
+    body_sha256, body_size = await body_digest(request) if request.method in ("POST", "PUT", "PATCH", "DELETE") else (None, 0)
+    traffic_capture.record(traffic_capture.build_record(request, body_sha256, body_size, status_code, duration_ms))
+
+
+async def serve_mock_websocket(websocket: WebSocket, group_name: str, endpoint_path: str) -> None:
+    """Subscribes a WebSocket to a stream endpoint; lookup and rule failures close it with 1008."""
+    is_chaos = websocket.url.path.endswith("/chaos")
+    try:
+        if embedded_store.enabled:
+            _, endpoint, path_params = await find_endpoint(None, group_name, "GET", endpoint_path)
+        else:
+            # Not a dependency: that session would stay checked out for the life of the socket
+            async with AsyncSessionLocal() as db:
+                _, endpoint, path_params = await find_endpoint(db, group_name, "GET", endpoint_path)
+        if endpoint.stream_type != "websocket":
+            raise HTTPException(status_code=404, detail="This endpoint is not a WebSocket stream")
+        if is_chaos and not endpoint.chaos_mode:
+            raise HTTPException(status_code=404, detail="Chaos mode not enabled for this endpoint")
+        try:
+            matcher = matcher_cache.get(endpoint)
+        except ValueError as e:
+            raise HTTPException(status_code=500, detail=f"Invalid header or parameter rule: {e}")
+        violation = matcher.check(websocket.headers, path_params, websocket.query_params) if matcher else None
+        if violation:
+            raise HTTPException(status_code=400, detail=f"Invalid {violation.kind}: {violation.rule.name}")
+    except HTTPException as exc:
+        # Close reasons are limited to 123 bytes
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(exc.detail)[:120])
+        return
+    await stream_hub.websocket(websocket, endpoint, path_params, chaos=is_chaos)
+
+
+@router.websocket("/{group_name}/{endpoint_path:path}/chaos")
+async def mock_websocket_chaos(websocket: WebSocket, group_name: str, endpoint_path: str) -> None:
+    await serve_mock_websocket(websocket, group_name, endpoint_path)
+
+
+@router.websocket("/{group_name}/{endpoint_path:path}")
+async def mock_websocket(websocket: WebSocket, group_name: str, endpoint_path: str) -> None:
+    await serve_mock_websocket(websocket, group_name, endpoint_path)
+
+
+@router.post("/{group_name}/_batch", response_model=MockBatchResponse)
+async def mock_batch(
+    request: Request,
+    group_name: str,
+    batch: MockBatch,
+    stream: bool = Query(False, description="Send results as NDJSON lines in completion order"),
+) -> Any:
+    """Runs many mock calls to one group in a single HTTP request.
+
+    Each sub-request goes through the same handling as a direct call (rules,
+    chaos, scenarios, hit counters, traffic capture) and yields a result with
+    its status, headers and body; failures are results too. Results come in
+    request order, or with `stream=true` as NDJSON lines as they complete.
+    """
+    if len(batch.requests) > settings.MOCK_BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch holds at most {settings.MOCK_BATCH_MAX_REQUESTS} requests",
+        )
+    results = run_batch(request, group_name, batch, serve_mock_request)
+    if stream:
+        async def lines() -> Any:
+            async for item in results:
+                yield json.dumps(item) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    collected = [item async for item in results]
+    collected.sort(key=lambda item: item["index"])
+    return {"results": collected}
 
 
 # Chaos mode endpoint
-@router.api_route("/{group_name}/{endpoint_path}/chaos", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
+# Declared first: endpoint_path spans several segments, so the plain route would also match ".../chaos"
+@router.api_route("/{group_name}/{endpoint_path:path}/chaos", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
 async def mock_endpoint_chaos(
     request: Request,
     group_name: str,
     endpoint_path: str,
-    db: AsyncSession = Depends(get_db),
+    db: Optional[AsyncSession] = MockDB,
+) -> Any:
+    return await serve_mock_request(request, group_name, endpoint_path, db)
+
+
+# Dynamic route handler for all HTTP methods
+@router.api_route("/{group_name}/{endpoint_path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
+async def mock_endpoint(
+    request: Request,
+    group_name: str,
+    endpoint_path: str,
+    db: Optional[AsyncSession] = MockDB,
 ) -> Any:
-    return await handle_mock_endpoint(request, group_name, endpoint_path, db) 
\ No newline at end of file
+    return await serve_mock_request(request, group_name, endpoint_path, db) 
\ No newline at end of file
@@ -0,0 +1,163 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_db
+from app.models.chaos_scenario import ChaosScenario
+from app.models.endpoint import Endpoint
+from app.models.user import User
+from app.schemas.chaos_scenario import (
+    ChaosScenarioCreate,
+    ChaosScenarioResponse,
+    ChaosScenarioStatus,
+    ChaosScenarioUpdate,
+)
+from app.services.chaos_scenarios import scenario_cache, scenario_status
+
+router = APIRouter()
+
+
+async def get_scenario(db: AsyncSession, group_id: UUID, scenario_id: UUID) -> ChaosScenario:
+    result = await db.execute(
+        select(ChaosScenario).where(ChaosScenario.id == scenario_id, ChaosScenario.group_id == group_id)
+    )
+    scenario = result.scalar_one_or_none()
+    if not scenario:
+        raise HTTPException(status_code=404, detail="Scenario not found in this group")
+    return scenario
+
+
+async def check_endpoint(db: AsyncSession, group_id: UUID, endpoint_id: Optional[UUID]) -> None:
+    if endpoint_id is None:
+        return
+    result = await db.execute(select(Endpoint.group_id).where(Endpoint.id == endpoint_id))
+    if result.scalar_one_or_none() != group_id:
+        raise HTTPException(status_code=404, detail="Endpoint not found in this group")
+
+
+@router.get("", response_model=List[ChaosScenarioResponse])
+async def list_scenarios(
+    group_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List the chaos scenarios of a group."""
+    result = await db.execute(select(ChaosScenario).where(ChaosScenario.group_id == group_id))
+    return list(result.scalars().all())
+
+
+@router.post("/", response_model=ChaosScenarioResponse)
+async def create_scenario(
+    group_id: UUID,
+    scenario_in: ChaosScenarioCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create a scenario; it does nothing until it is started."""
+    await check_endpoint(db, group_id, scenario_in.endpoint_id)
+    scenario = ChaosScenario(
+        **scenario_in.model_dump(exclude={"phases"}),
+        phases=[phase.model_dump() for phase in scenario_in.phases],
+        group_id=group_id,
+        created_by_id=current_user.id,
+    )
+    db.add(scenario)
+    await db.commit()
+    await db.refresh(scenario)
+    return scenario
+
+
+@router.get("/{scenario_id}", response_model=ChaosScenarioResponse)
+async def read_scenario(
+    group_id: UUID,
+    scenario_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a specific scenario."""
+    return await get_scenario(db, group_id, scenario_id)
+
+
+@router.put("/{scenario_id}", response_model=ChaosScenarioResponse)
+async def update_scenario(
+    group_id: UUID,
+    scenario_id: UUID,
+    scenario_in: ChaosScenarioUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Replace a scenario's definition; a running scenario keeps its start time."""
+    scenario = await get_scenario(db, group_id, scenario_id)
+    await check_endpoint(db, group_id, scenario_in.endpoint_id)
+    for field, value in scenario_in.model_dump(exclude={"phases"}).items():
+        setattr(scenario, field, value)
+    scenario.phases = [phase.model_dump() for phase in scenario_in.phases]
+    scenario.updated_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(scenario)
+    scenario_cache.invalidate(group_id)
+    return scenario
+
+
+@router.delete("/{scenario_id}")
+async def delete_scenario(
+    group_id: UUID,
+    scenario_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete a scenario."""
+    scenario = await get_scenario(db, group_id, scenario_id)
+    await db.delete(scenario)
+    await db.commit()
+    scenario_cache.invalidate(group_id)
+    return {"message": "Scenario deleted successfully"}
+
+
+@router.post("/{scenario_id}/start", response_model=ChaosScenarioStatus)
+async def start_scenario(
+    group_id: UUID,
+    scenario_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Start (or restart) the scenario's timeline now."""
+    scenario = await get_scenario(db, group_id, scenario_id)
+    scenario.started_at = datetime.now(timezone.utc)
+    scenario.updated_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(scenario)
+    scenario_cache.invalidate(group_id)
+    return scenario_status(scenario)
+
+
+@router.post("/{scenario_id}/stop", response_model=ChaosScenarioStatus)
+async def stop_scenario(
+    group_id: UUID,
+    scenario_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stop the scenario; requests are served normally again."""
+    scenario = await get_scenario(db, group_id, scenario_id)
+    scenario.started_at = None
+    scenario.updated_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(scenario)
+    scenario_cache.invalidate(group_id)
+    return scenario_status(scenario)
+
+
+@router.get("/{scenario_id}/status", response_model=ChaosScenarioStatus)
+async def read_scenario_status(
+    group_id: UUID,
+    scenario_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """The phase in effect right now and its latency, error rate and throughput cap."""
+    scenario = await get_scenario(db, group_id, scenario_id)
+    return scenario_status(scenario)
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_db
+from app.models.user import User
+from app.repositories.captured_request import CapturedRequestRepository
+from app.repositories.endpoint_hit import EndpointHitRepository
+from app.schemas.traffic import CapturedRequestResponse, EndpointHitSummary, HitCounterStats, TrafficCaptureStats
+from app.services.hit_counters import hit_counters
+from app.services.traffic_capture import traffic_capture
+
+router = APIRouter()
+
+
+@router.get("/groups/{group_id}/traffic", response_model=List[CapturedRequestResponse])
+async def list_captured_traffic(
+    group_id: UUID,
+    endpoint_id: Optional[UUID] = None,
+    method: Optional[str] = None,
+    status_code: Optional[int] = None,
+    chaos_effect: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List captured mock requests of a group, newest first."""
+    if traffic_capture.backend == "file":
+        filters = {
+            "group_id": group_id,
+            "endpoint_id": endpoint_id,
+            "method": method.upper() if method else None,
+            "status_code": status_code,
+            "chaos_effect": chaos_effect,
+        }
+        return await asyncio.to_thread(
+            traffic_capture.query_file, filters, limit, offset, since, until
+        )
+    repo = CapturedRequestRepository(db)
+    return await repo.list(
+        group_id,
+        endpoint_id=endpoint_id,
+        method=method,
+        status_code=status_code,
+        chaos_effect=chaos_effect,
+        since=since,
+        until=until,
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.get("/traffic/stats", response_model=TrafficCaptureStats)
+async def traffic_capture_stats(
+    current_user: User = Depends(get_current_user),
+):
+    """Counters of this worker's capture pipeline, including dropped records."""
+    return traffic_capture.stats()
+
+
+@router.get("/groups/{group_id}/hits", response_model=List[EndpointHitSummary])
+async def list_endpoint_hits(
+    group_id: UUID,
+    endpoint_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Request counts per endpoint of a group, busiest first.
+
+    Totals cover every worker up to its last flush (HIT_COUNTERS_FLUSH_INTERVAL_SECONDS).
+    """
+    repo = EndpointHitRepository(db)
+    return await repo.summaries(group_id, endpoint_id=endpoint_id)
+
+
+@router.get("/hits/stats", response_model=HitCounterStats)
+async def hit_counter_stats(
+    current_user: User = Depends(get_current_user),
+):
+    """Counters of this worker's hit aggregation, including failed flushes."""
+    return hit_counters.stats()
@@ -1,10 +1,17 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, groups, endpoints, mock
+from app.api.v1.endpoints import auth, debug, groups, endpoints, mock, traffic
+from app.services.admission import route_segments
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(groups.router, prefix="/groups", tags=["groups"])
+api_router.include_router(traffic.router, prefix="", tags=["traffic"])
+api_router.include_router(debug.router, prefix="/debug", tags=["debug"])
 # Endpoints are now handled by the groups router
-api_router.include_router(mock.router, prefix="", tags=["mock_api"]) 
\ No newline at end of file
+api_router.include_router(mock.router, prefix="", tags=["mock_api"])
+
+# First path segments of the management API. A group of the same name would put its mock
+# URLs on top of these routes, so group names are checked against them
+RESERVED_GROUP_NAMES = frozenset(route_segments(api_router.routes))
@@ -43,10 +43,120 @@ class Settings(BaseSettings):
     # CORS Settings
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:3000"]
 
+    # Mock serving
+    # How long a worker trusts its compiled route table before re-reading it from the DB
+    MOCK_ROUTE_CACHE_TTL_SECONDS: float = 5.0
+    # Request bodies above this size are rejected with 413 unless the endpoint sets its own limit
+    MOCK_MAX_REQUEST_BODY_BYTES: int = 10 * 1024 * 1024
+    # Size of the body served by the "large_body" chaos effect when the endpoint sets no response size
+    MOCK_CHAOS_LARGE_BODY_BYTES: int = 50 * 1024 * 1024
+    # Batch invocation (POST /{group}/_batch): sub-requests per batch, how many run at once
+    # (each with its own DB session) and the largest response body one of them may return
+    MOCK_BATCH_MAX_REQUESTS: int = 1000
+    MOCK_BATCH_CONCURRENCY: int = 8
+    MOCK_BATCH_MAX_CONCURRENCY: int = 32
+    MOCK_BATCH_MAX_RESPONSE_BYTES: int = 1024 * 1024
+    # Granularity of chaos scenario schedules: ramps advance in steps of this many seconds
+    CHAOS_SCENARIO_RESOLUTION_SECONDS: float = 1.0
+
+    # Traffic capture: "db" (batched multi-row inserts), "file" (rotating JSON lines) or "off"
+    TRAFFIC_CAPTURE_BACKEND: str = "db"
+    TRAFFIC_CAPTURE_QUEUE_SIZE: int = 10000
+    TRAFFIC_CAPTURE_BATCH_SIZE: int = 500
+    TRAFFIC_CAPTURE_FLUSH_INTERVAL_SECONDS: float = 1.0
+    TRAFFIC_CAPTURE_FILE: str = "traffic/capture.jsonl"
+    TRAFFIC_CAPTURE_FILE_MAX_BYTES: int = 50 * 1024 * 1024
+    TRAFFIC_CAPTURE_FILE_BACKUPS: int = 5
+    TRAFFIC_CAPTURE_REDACT_HEADERS: list[str] = ["authorization", "cookie", "proxy-authorization"]
+
+    # Per-endpoint hit counters: aggregated in memory, added to endpoint_hits with one upsert per interval
+    HIT_COUNTERS_ENABLED: bool = True
+    HIT_COUNTERS_FLUSH_INTERVAL_SECONDS: float = 10.0
+
+    # Serving (manage.py serve)
+    SERVE_HOST: str = "0.0.0.0"
+    SERVE_PORT: int = 8000
+    SERVE_WORKERS: int = os.cpu_count() or 1
+    # Recycle a worker after this many requests (0 disables), plus up to the jitter
+    SERVE_MAX_REQUESTS: int = 0
+    SERVE_MAX_REQUESTS_JITTER: int = 0
+    # How long in-flight requests (chaos sleeps included) get to finish on shutdown
+    SERVE_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    # Build route tables and open a DB connection before a worker accepts traffic
+    SERVE_WARM_UP: bool = True
+
+    # Faker value pools behind `$provider: faker.*` fields and chaos bodies
+    FAKER_POOLS_ENABLED: bool = True
+    FAKER_LOCALE: str = "en_US"
+    # Values kept per provider; memory is roughly pools x size x value size (faker_pools.stats() reports it)
+    FAKER_POOL_SIZE: int = 2000
+    # Values generated on the request path when a provider is first seen; the rest fill in the background
+    FAKER_POOL_INITIAL_SIZE: int = 32
+    # Providers beyond this many are called directly instead of pooled
+    FAKER_POOL_MAX_POOLS: int = 256
+    # Every pool is regenerated this often so long runs don't cycle the same values (0 disables)
+    FAKER_POOL_REFRESH_SECONDS: float = 300.0
+    # Providers whose values must stay unique are always called directly
+    FAKER_POOL_EXCLUDE: list[str] = ["uuid4", "uuid", "unique", "seed", "seed_instance", "random"]
+
+    # Response generation: schemas estimated above this many generated values are rendered
+    # in a process pool (0 workers keeps everything on the event loop)
+    GENERATION_OFFLOAD_THRESHOLD: int = 2000
+    GENERATION_POOL_WORKERS: int = 2
+    # CPU seconds a worker may spend on one response, and wall-clock seconds the request waits
+    GENERATION_CPU_BUDGET_SECONDS: float = 2.0
+    GENERATION_TIME_BUDGET_SECONDS: float = 5.0
+
+    # Group deletion: with soft delete, DELETE only sets deleted_at and a background job
+    # removes the group (and everything in it) once the retention has passed
+    GROUP_SOFT_DELETE: bool = False
+    GROUP_PURGE_AFTER_SECONDS: float = 7 * 24 * 3600
+    GROUP_PURGE_INTERVAL_SECONDS: float = 3600.0
+
+    # Embedded mode: serve mocks from a directory of JSON/YAML group files, without a database
+    EMBEDDED_CONFIG_DIR: Optional[str] = None
+    # How often the directory is checked for changes (0 disables hot reload)
+    EMBEDDED_RELOAD_INTERVAL_SECONDS: float = 1.0
+
+    # Debug API: sampling profiler for mock requests and memory introspection (tracemalloc
+    # only runs between the start and stop calls)
+    PROFILER_SAMPLE_INTERVAL_MS: float = 5.0
+    # A profiling session ends after this long even when fewer requests matched
+    PROFILER_MAX_SECONDS: float = 60.0
+    TRACEMALLOC_FRAMES: int = 10
+
+    # Admission control: requests are classed as admin, mock, chaos (/chaos) or heavy (rendered
+    # in the generation pool, or sized responses). A class is shed with 503 and Retry-After while
+    # the event loop lags more than its threshold or its in-flight requests reach the limit (0 disables either)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_LAG_SAMPLE_INTERVAL_MS: float = 50.0
+    ADMISSION_LAG_THRESHOLDS_MS: dict[str, float] = {"admin": 0, "mock": 500, "chaos": 250, "heavy": 100}
+    ADMISSION_MAX_IN_FLIGHT: dict[str, int] = {"admin": 0, "mock": 0, "chaos": 2000, "heavy": 64}
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Fixture datasets: record files mapped read-only by every worker (FIXTURE_DIR must be
+    # shared when workers run on several hosts)
+    FIXTURE_DIR: str = "fixtures"
+    FIXTURE_MAX_RECORDS: int = 10_000_000
+    FIXTURE_MAX_UPLOAD_BYTES: int = 2 * 1024 * 1024 * 1024
+    # How often a worker checks whether a dataset it serves was rebuilt
+    FIXTURE_RELOAD_INTERVAL_SECONDS: float = 1.0
+    FIXTURE_DEFAULT_PAGE_SIZE: int = 20
+    FIXTURE_MAX_PAGE_SIZE: int = 1000
+
+    # Static export: constant GET endpoints written as files plus an nginx include, so nginx
+    # serves them without calling the backend (unset disables). Re-exported after a configuration
+    # change, checked every interval; the NGINX_DIR is where nginx sees the directory, when it differs
+    STATIC_EXPORT_DIR: Optional[str] = None
+    STATIC_EXPORT_NGINX_DIR: Optional[str] = None
+    STATIC_EXPORT_INTERVAL_SECONDS: float = 5.0
+
+    # Stateful mock groups
+    STATE_DEFAULT_MAX_ITEMS: int = 10000
+    STATE_SNAPSHOT_DIR: str = "state"
+    STATE_SNAPSHOT_INTERVAL_SECONDS: float = 30.0
+
     model_config = SettingsConfigDict(case_sensitive=True, env_file=".env")
 
 
 settings = Settings()
-
-# Print the secret key being used for verification
-print(f"BACKEND: Using SECRET_KEY: {settings.SECRET_KEY[:5]}...{settings.SECRET_KEY[-5:] if len(settings.SECRET_KEY) > 10 else ''}") 
\ No newline at end of file
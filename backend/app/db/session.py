@@ -1,23 +1,48 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
-# Create async engine
-engine = create_async_engine(
-    str(settings.SQLALCHEMY_DATABASE_URI).replace("postgresql://", "postgresql+asyncpg://"),
-    echo=True,
-    future=True
-)
+# The engine (and the asyncpg dialect it imports) is created on first use, so
+# importing the app stays cheap for tools and tests that never touch the DB.
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[sessionmaker] = None
+
+
+def get_engine() -> AsyncEngine:
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(
+            str(settings.SQLALCHEMY_DATABASE_URI).replace("postgresql://", "postgresql+asyncpg://"),
+            echo=True,
+            future=True
+        )
+    return _engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Async session factory; same call sites as the sessionmaker it wraps."""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(
+            get_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
+    return _session_factory()
+
 
-# Create async session factory
-AsyncSessionLocal = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+async def dispose_engine() -> None:
+    """Closes pooled connections, if the engine was ever created."""
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _session_factory = None
 
 
 async def get_db():
@@ -25,4 +50,4 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
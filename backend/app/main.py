@@ -1,13 +1,102 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import select, text
 
 from app.core.config import settings
-from app.api.v1.router import api_router
+from app.api.v1.router import RESERVED_GROUP_NAMES, api_router
+from app.api.v1.endpoints import mock
+from app.db.session import AsyncSessionLocal, dispose_engine
+from app.models.endpoint import Endpoint
+from app.services.admission import AdmissionMiddleware, admission_controller
+from app.services.embedded_store import embedded_store
+from app.services.faker_pools import faker_pools, find_providers
+from app.services.group_purge import group_purger
+from app.services.hit_counters import hit_counters
+from app.services.mock_routes import route_cache
+from app.services.schema_generation import schema_generator
+from app.services.resource_store import resource_store
+from app.services.static_export import static_exporter
+from app.services.traffic_capture import traffic_capture
+from app.utils.json_schema import generate_data_from_schema
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_db() -> tuple:
+    """Opens a DB connection and builds every route table; returns (groups, response schemas)."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SELECT 1"))
+            groups = await route_cache.warm(db)
+            schemas = (await db.execute(select(Endpoint.response_schema))).scalars().all()
+    except Exception:
+        # A cold worker is still better than no worker; requests will retry the DB
+        logger.exception("Warm-up could not reach the database")
+        groups, schemas = 0, []
+    return groups, schemas
+
+
+async def warm_up() -> None:
+    """Pays the first-request costs before the worker accepts traffic."""
+    started = time.perf_counter()
+    if embedded_store.enabled:
+        groups = len(embedded_store.snapshot.routes)
+        schemas = [endpoint.response_schema for endpoint in embedded_store.endpoints()]
+    else:
+        groups, schemas = await warm_up_db()
+    # Imports jsf, Faker and jsonschema, which the app itself only loads on first use
+    generate_data_from_schema({"type": "object", "properties": {"id": {"type": "string"}}}, faker=faker_pools.proxy())
+    import jsonschema  # noqa: F401
+    await faker_pools.prebuild(provider for schema in schemas for provider in find_providers(schema))
+    logger.info("Worker warmed up in %.0f ms (%d route tables)", (time.perf_counter() - started) * 1000, groups)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background pipelines live for the whole process and are flushed on shutdown
+    key = settings.SECRET_KEY
+    logger.info("Using SECRET_KEY %s...%s", key[:5], key[-5:] if len(key) > 10 else "")
+    if embedded_store.enabled:
+        # No database: keep traffic in memory or on disk and skip the DB-backed jobs
+        await embedded_store.start()
+        if traffic_capture.backend == "db":
+            traffic_capture.backend = "off"
+        hit_counters.enabled = False
+        group_purger.enabled = False
+        static_exporter.enabled = False
+    if settings.SERVE_WARM_UP:
+        await warm_up()
+    await traffic_capture.start()
+    await hit_counters.start()
+    await resource_store.start()
+    await faker_pools.start()
+    await schema_generator.start()
+    await group_purger.start()
+    await admission_controller.start()
+    await static_exporter.start()
+    yield
+    await static_exporter.stop()
+    await admission_controller.stop()
+    await group_purger.stop()
+    await embedded_store.stop()
+    await faker_pools.stop()
+    await schema_generator.stop()
+    await resource_store.stop()
+    await hit_counters.stop()
+    await traffic_capture.stop()
+    # Close pooled connections only after the pipelines wrote their last batch
+    await dispose_engine()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set up CORS middleware
@@ -22,7 +111,21 @@ if settings.BACKEND_CORS_ORIGINS:
     )
 
 # Include API router
-app.include_router(api_router, prefix=settings.API_V1_STR)
+if embedded_store.enabled:
+    # Only the mock routes: the management API needs the database
+    app.include_router(mock.router, prefix=settings.API_V1_STR, tags=["mock_api"])
+    admin_segments = set()
+else:
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    admin_segments = set(RESERVED_GROUP_NAMES)
+
+# Outermost, so shed requests cost neither CORS handling nor routing
+app.add_middleware(
+    AdmissionMiddleware,
+    controller=admission_controller,
+    prefix=settings.API_V1_STR,
+    admin_segments=admin_segments,
+)
 
 @app.get("/")
 async def root():
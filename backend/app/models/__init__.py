@@ -3,5 +3,8 @@ from app.models.group import Group
 from app.models.endpoint import Endpoint
 from app.models.header import Header
 from app.models.url_parameter import UrlParameter
+from app.models.captured_request import CapturedRequest
+from app.models.chaos_scenario import ChaosScenario
+from app.models.endpoint_hit import EndpointHit
 
-__all__ = ["User", "Group", "Endpoint", "Header", "UrlParameter"] 
\ No newline at end of file
+__all__ = ["User", "Group", "Endpoint", "Header", "UrlParameter", "CapturedRequest", "ChaosScenario", "EndpointHit"] 
\ No newline at end of file
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class CapturedRequest(Base):
+    __tablename__ = "captured_requests"
+
+    # No foreign keys: captured traffic outlives the endpoints it was sent to
+    group_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    endpoint_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    method = Column(String, nullable=False)
+    path = Column(String, nullable=False)
+    query = Column(String, nullable=True)
+    headers = Column(JSON, nullable=True)
+    body_sha256 = Column(String(64), nullable=True)
+    body_size = Column(Integer, nullable=False, default=0)
+    chaos_effect = Column(String, nullable=True)
+    status_code = Column(Integer, nullable=False)
+    duration_ms = Column(Float, nullable=False, default=0)
+    received_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<CapturedRequest {self.method} {self.path} {self.status_code}>"
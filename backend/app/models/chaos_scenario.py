@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class ChaosScenario(Base):
+    __tablename__ = "chaos_scenarios"
+
+    name = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+    group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Scoped to one endpoint, or to every endpoint of the group when empty
+    endpoint_id = Column(UUID(as_uuid=True), ForeignKey("endpoints.id", ondelete="CASCADE"), nullable=True, index=True)
+    # Timeline of phases, see ScenarioPhase
+    phases = Column(JSON, nullable=False)
+    repeat = Column(Boolean, nullable=False, default=False)
+    # Set while the scenario runs; every worker derives the current phase from it
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    created_by_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
+
+    # Relationships
+    group = relationship("Group", back_populates="scenarios")
+    endpoint = relationship("Endpoint", back_populates="scenarios")
+
+    def __repr__(self) -> str:
+        return f"<ChaosScenario {self.name}>"
@@ -18,13 +18,23 @@ class Endpoint(Base):
     response_status_code = Column(Integer, nullable=False, default=200)
     response_body = Column(String, nullable=True)
     request_body_schema = Column(JSON, nullable=True)
-    group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id"), nullable=False)
+    max_request_body_bytes = Column(Integer, nullable=True)
+    stream_request_validation = Column(Boolean, nullable=False, default=False)
+    response_size_bytes = Column(Integer, nullable=True)
+    stream_type = Column(String, nullable=True)
+    stream_config = Column(JSON, nullable=True)
+    fixture_dataset = Column(String, nullable=True)
+    # Derived from the response fields on every write, see app/services/serving_plan.py
+    serving_plan = Column(JSON, nullable=True)
+    group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), nullable=False, index=True)
     created_by_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
 
     # Relationships
     group = relationship("Group", back_populates="endpoints")
-    headers = relationship("Header", back_populates="endpoint", cascade="all, delete-orphan")
-    url_parameters = relationship("UrlParameter", back_populates="endpoint", cascade="all, delete-orphan")
+    # Children go with the endpoint through ON DELETE CASCADE, so deleting one is a single statement
+    headers = relationship("Header", back_populates="endpoint", cascade="all, delete-orphan", passive_deletes=True)
+    url_parameters = relationship("UrlParameter", back_populates="endpoint", cascade="all, delete-orphan", passive_deletes=True)
+    scenarios = relationship("ChaosScenario", back_populates="endpoint", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self) -> str:
         return f"<Endpoint {self.name}>" 
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class EndpointHit(Base):
+    __tablename__ = "endpoint_hits"
+    __table_args__ = (UniqueConstraint("endpoint_id", "status_code", "chaos_effect"),)
+
+    # Rollup of mock requests, one row per (endpoint, status, chaos effect); no foreign
+    # keys, like captured traffic, so counting never contends with endpoint writes
+    endpoint_id = Column(UUID(as_uuid=True), nullable=False)
+    group_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    status_code = Column(Integer, nullable=False)
+    # Empty when no chaos effect was applied, so the row stays unique
+    chaos_effect = Column(String, nullable=False, default="")
+    hits = Column(BigInteger, nullable=False, default=0)
+    last_hit_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<EndpointHit {self.endpoint_id} {self.status_code} {self.hits}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, UUID
+from sqlalchemy import Column, String, ForeignKey, UUID, JSON
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -10,9 +10,13 @@ class Group(Base):
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     created_by_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
+    # Opt-in stateful mode for CRUD-style mocks, see GroupStateConfig
+    state_config = Column(JSON, nullable=True)
 
     # Relationships
-    endpoints = relationship("Endpoint", back_populates="group", cascade="all, delete-orphan")
+    # ON DELETE CASCADE removes endpoints (and their children) and scenarios in the database
+    endpoints = relationship("Endpoint", back_populates="group", cascade="all, delete-orphan", passive_deletes=True)
+    scenarios = relationship("ChaosScenario", back_populates="group", cascade="all, delete-orphan", passive_deletes=True)
     created_by = relationship("User", back_populates="groups")
 
     def __repr__(self) -> str:
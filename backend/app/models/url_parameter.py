@@ -1,5 +1,5 @@
 from uuid import UUID
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, Boolean, Float, ForeignKey, JSON
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
 
@@ -12,9 +12,12 @@ class UrlParameter(Base):
     name = Column(String, nullable=False)
     value = Column(String, nullable=False)
     required = Column(Boolean, nullable=False, default=False)
+    match_type = Column(String, nullable=False, default="exact")
+    minimum = Column(Float, nullable=True)
+    maximum = Column(Float, nullable=True)
     default_response = Column(JSON, nullable=True)
     default_status_code = Column(Integer, nullable=False, default=400)
-    endpoint_id = Column(PostgresUUID(as_uuid=True), ForeignKey("endpoints.id"), nullable=False)
+    endpoint_id = Column(PostgresUUID(as_uuid=True), ForeignKey("endpoints.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Relationships
     endpoint = relationship("Endpoint", back_populates="url_parameters")
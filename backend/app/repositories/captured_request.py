@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.captured_request import CapturedRequest
+
+
+class CapturedRequestRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def list(
+        self,
+        group_id: UUID,
+        endpoint_id: Optional[UUID] = None,
+        method: Optional[str] = None,
+        status_code: Optional[int] = None,
+        chaos_effect: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[CapturedRequest]:
+        """Newest captured requests of a group, optionally filtered."""
+        query = select(CapturedRequest).where(CapturedRequest.group_id == group_id)
+        if endpoint_id:
+            query = query.where(CapturedRequest.endpoint_id == endpoint_id)
+        if method:
+            query = query.where(CapturedRequest.method == method.upper())
+        if status_code:
+            query = query.where(CapturedRequest.status_code == status_code)
+        if chaos_effect:
+            query = query.where(CapturedRequest.chaos_effect == chaos_effect)
+        if since:
+            query = query.where(CapturedRequest.received_at >= since)
+        if until:
+            query = query.where(CapturedRequest.received_at <= until)
+        query = query.order_by(CapturedRequest.received_at.desc()).limit(limit).offset(offset)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
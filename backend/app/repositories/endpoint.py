@@ -1,23 +1,37 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
 from uuid import UUID
-from sqlalchemy import select, and_
+from sqlalchemy import delete, insert, select, update, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import HTTPException, status
 
 from app.models.endpoint import Endpoint
-from app.schemas.endpoint import EndpointCreate, EndpointUpdate
+from app.models.header import Header
+from app.models.url_parameter import UrlParameter
+from app.schemas.endpoint import STREAM_FIELDS, EndpointBatchUpdate, EndpointCreate, EndpointUpdate, check_stream
+from app.services.mock_routes import matcher_cache, route_cache, template_cache, validator_cache
+from app.services.serving_plan import PLAN_FIELDS, analyse, plan_cache
+from app.services.sized_payload import payload_cache
+from app.utils.route_trie import route_shape
+
+# Relationship fields whose rows are replaced wholesale when an update sets them
+CHILD_MODELS = (("headers", Header), ("url_parameters", UrlParameter))
+
 
 class EndpointRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
     async def check_duplicate_endpoint(self, group_id: UUID, path: str, method: str, endpoint_id: Optional[UUID] = None) -> bool:
-        """Check if there's already an endpoint with the same path and method in the group"""
-        query = select(Endpoint).where(
+        """Check if there's already an endpoint with the same path and method in the group.
+
+        Paths are compared by shape, so "orders/{id}" collides with "orders/{order_id}".
+        """
+        query = select(Endpoint.path).where(
             and_(
                 Endpoint.group_id == str(group_id),
-                Endpoint.path == path,
                 Endpoint.method == method
             )
         )
@@ -27,8 +41,8 @@ class EndpointRepository:
             query = query.where(Endpoint.id != endpoint_id)
             
         result = await self.session.execute(query)
-        existing_endpoint = result.scalar_one_or_none()
-        return existing_endpoint is not None
+        shape = route_shape(path)
+        return any(route_shape(existing_path) == shape for existing_path in result.scalars())
 
     async def create(self, endpoint_data: EndpointCreate, created_by_id: UUID) -> Endpoint:
         # Check for duplicates
@@ -42,14 +56,16 @@ class EndpointRepository:
                 detail=f"An endpoint with path '{endpoint_data.path}' and method '{endpoint_data.method}' already exists in this group"
             )
         
-        endpoint = Endpoint(
-            **endpoint_data.model_dump(),
-            created_by_id=created_by_id
-        )
+        data = endpoint_data.model_dump()
+        children = {field: data.pop(field) for field, _ in CHILD_MODELS}
+        endpoint = Endpoint(**data, serving_plan=analyse(data), created_by_id=created_by_id)
         self.session.add(endpoint)
+        await self.session.flush()
+        for field, model in CHILD_MODELS:
+            rows = await self._insert_children(model, {endpoint.id: children[field]})
+            set_committed_value(endpoint, field, rows)
         await self.session.commit()
-        # Refresh with relationship loading
-        await self.session.refresh(endpoint, attribute_names=['headers', 'url_parameters'])
+        route_cache.invalidate(endpoint.group_id)
         return endpoint
 
     async def get_by_id(self, endpoint_id: UUID) -> Optional[Endpoint]:
@@ -68,84 +84,206 @@ class EndpointRepository:
         )
         return list(result.scalars().all())
 
+    async def get_group_id(self, endpoint_id: UUID) -> Optional[UUID]:
+        """The endpoint's group, without loading the endpoint; None if it does not exist."""
+        result = await self.session.execute(select(Endpoint.group_id).where(Endpoint.id == endpoint_id))
+        return result.scalar_one_or_none()
+
     async def update(
         self, endpoint_id: UUID, endpoint_data: EndpointUpdate
     ) -> Optional[Endpoint]:
-        endpoint = await self.get_by_id(endpoint_id)
-        if endpoint:
-            # If path or method is changing, check for duplicates
-            if (endpoint_data.path and endpoint_data.path != endpoint.path) or \
-               (endpoint_data.method and endpoint_data.method != endpoint.method):
-                duplicate_exists = await self.check_duplicate_endpoint(
-                    endpoint.group_id, 
-                    endpoint_data.path or endpoint.path, 
-                    endpoint_data.method or endpoint.method,
-                    endpoint_id
+        result = await self.session.execute(
+            select(Endpoint.group_id, Endpoint.path, Endpoint.method).where(Endpoint.id == endpoint_id)
+        )
+        current = result.one_or_none()
+        if current is None:
+            return None
+        group_id, path, method = current
+        # If path or method is changing, check for duplicates
+        if (endpoint_data.path and endpoint_data.path != path) or \
+           (endpoint_data.method and endpoint_data.method != method):
+            duplicate_exists = await self.check_duplicate_endpoint(
+                group_id,
+                endpoint_data.path or path,
+                endpoint_data.method or method,
+                endpoint_id
+            )
+
+            if duplicate_exists:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"An endpoint with path '{endpoint_data.path or path}' and method '{endpoint_data.method or method}' already exists in this group"
                 )
-                
-                if duplicate_exists:
-                    raise HTTPException(
-                        status_code=status.HTTP_409_CONFLICT,
-                        detail=f"An endpoint with path '{endpoint_data.path or endpoint.path}' and method '{endpoint_data.method or endpoint.method}' already exists in this group"
-                    )
-            
-            # Process data to update
-            update_data = endpoint_data.model_dump(exclude_unset=True)
-            
-            # Handle special cases for relationship fields
-            headers_data = update_data.pop('headers', None)
-            url_parameters_data = update_data.pop('url_parameters', None)
-            
-            # Update the regular fields
-            for key, value in update_data.items():
-                setattr(endpoint, key, value)
-                
-            # Handle headers update if provided
-            if headers_data is not None:
-                # Remove existing headers
-                for header in endpoint.headers[:]:
-                    await self.session.delete(header)
-                
-                # Create new headers
-                from app.models.header import Header
-                new_headers = []
-                for header_dict in headers_data:
-                    header = Header(**header_dict, endpoint_id=endpoint_id)
-                    self.session.add(header)
-                    new_headers.append(header)
-                
-                # Will be refreshed during commit
-                endpoint.headers = new_headers
-                
-            # Handle url_parameters update if provided
-            if url_parameters_data is not None:
-                # Remove existing url parameters
-                for param in endpoint.url_parameters[:]:
-                    await self.session.delete(param)
-                
-                # Create new url parameters
-                from app.models.url_parameter import UrlParameter
-                new_params = []
-                for param_dict in url_parameters_data:
-                    param = UrlParameter(**param_dict, endpoint_id=endpoint_id)
-                    self.session.add(param)
-                    new_params.append(param)
-                
-                # Will be refreshed during commit
-                endpoint.url_parameters = new_params
-                
-            await self.session.commit()
-            # Refresh with relationship loading after updating - SAFER ALTERNATIVE:
-            # await self.session.refresh(endpoint, attribute_names=['headers', 'url_parameters'])
-            # Re-fetch using get_by_id to ensure all data (including relationships) is loaded
-            refreshed_endpoint = await self.get_by_id(endpoint_id)
-            return refreshed_endpoint # Return the re-fetched object
-        return None # Should return None if endpoint wasn't found initially
+
+        endpoints = await self._write({endpoint_id: endpoint_data.model_dump(exclude_unset=True)})
+        await self.session.commit()
+        self._forget(group_id, [endpoint_id])
+        return endpoints[0]
+
+    async def update_many(self, group_id: UUID, updates: List[EndpointBatchUpdate]) -> List[Endpoint]:
+        """Applies partial updates to several endpoints of a group in one transaction."""
+        ids = [item.id for item in updates]
+        if len(set(ids)) != len(ids):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Each endpoint may appear only once in a batch")
+
+        # Duplicate check for the whole batch against the group's routes as they will be
+        result = await self.session.execute(
+            select(Endpoint.id, Endpoint.path, Endpoint.method).where(Endpoint.group_id == group_id)
+        )
+        routes = {row.id: (row.path, row.method) for row in result.all()}
+        missing = [str(endpoint_id) for endpoint_id in ids if endpoint_id not in routes]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Endpoints not found in this group: {', '.join(missing)}")
+        for item in updates:
+            path, method = routes[item.id]
+            routes[item.id] = (item.path or path, item.method or method)
+        seen = set()
+        for path, method in routes.values():
+            key = (method, route_shape(path))
+            if key in seen:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"An endpoint with path '{path}' and method '{method}' already exists in this group"
+                )
+            seen.add(key)
+
+        columns = Endpoint.__table__.c
+        changes = {}
+        for item in updates:
+            data = item.model_dump(exclude_unset=True, exclude={"id"})
+            # An explicit null can only clear nullable columns
+            changes[item.id] = {
+                key: value for key, value in data.items()
+                if value is not None or (key in columns and columns[key].nullable)
+            }
+        endpoints = await self._write(changes)
+        await self.session.commit()
+        self._forget(group_id, ids)
+        order = {endpoint_id: index for index, endpoint_id in enumerate(ids)}
+        return sorted(endpoints, key=lambda endpoint: order[endpoint.id])
 
     async def delete(self, endpoint_id: UUID) -> bool:
-        endpoint = await self.get_by_id(endpoint_id)
-        if endpoint:
-            await self.session.delete(endpoint)
-            await self.session.commit()
-            return True
-        return False 
\ No newline at end of file
+        # Headers, URL parameters and scenarios are removed by ON DELETE CASCADE
+        result = await self.session.execute(
+            delete(Endpoint).where(Endpoint.id == endpoint_id).returning(Endpoint.group_id)
+        )
+        group_id = result.scalar_one_or_none()
+        if group_id is None:
+            return False
+        await self.session.commit()
+        self._forget(group_id, [endpoint_id])
+        return True
+
+    async def delete_many(self, group_id: UUID, endpoint_ids: List[UUID]) -> List[UUID]:
+        """Deletes the given endpoints of a group in one statement; returns the ids that existed."""
+        result = await self.session.execute(
+            delete(Endpoint)
+            .where(Endpoint.group_id == group_id, Endpoint.id.in_(endpoint_ids))
+            .returning(Endpoint.id)
+        )
+        deleted = list(result.scalars().all())
+        await self.session.commit()
+        self._forget(group_id, deleted)
+        return deleted
+
+    async def _write(self, changes: Dict[UUID, Dict[str, Any]]) -> List[Endpoint]:
+        """Updates columns and replaces children of several endpoints with set-based statements.
+
+        One UPDATE (RETURNING the row for a single endpoint), then per child table
+        one DELETE and one multi-row INSERT .. RETURNING for the endpoints whose
+        children were given. The returned endpoints have both collections set.
+        """
+        # Rule-only changes don't touch the endpoint's columns; bump updated_at so compiled matchers are rebuilt
+        now = datetime.utcnow()
+        await self._check_streams(changes)
+        await self._plan(changes)
+        replaced: Dict[str, Dict[UUID, List[Dict[str, Any]]]] = {field: {} for field, _ in CHILD_MODELS}
+        params = []
+        for endpoint_id, data in changes.items():
+            data = dict(data)
+            for field, _ in CHILD_MODELS:
+                children = data.pop(field, None)
+                if children is not None:
+                    replaced[field][endpoint_id] = children
+            params.append({**data, "id": endpoint_id, "updated_at": now})
+
+        if len(params) == 1:
+            values = dict(params[0])
+            endpoint_id = values.pop("id")
+            result = await self.session.scalars(
+                update(Endpoint).where(Endpoint.id == endpoint_id).values(**values).returning(Endpoint),
+                execution_options={"populate_existing": True},
+            )
+            endpoints = list(result.all())
+        else:
+            # ORM bulk UPDATE by primary key: one executemany, grouped by the set of changed columns
+            await self.session.execute(update(Endpoint), params)
+            result = await self.session.scalars(
+                select(Endpoint).where(Endpoint.id.in_(list(changes))).execution_options(populate_existing=True)
+            )
+            endpoints = list(result.all())
+
+        for field, model in CHILD_MODELS:
+            given = replaced[field]
+            rows: List[Any] = []
+            if given:
+                await self.session.execute(
+                    delete(model).where(model.endpoint_id.in_(list(given))).execution_options(synchronize_session=False)
+                )
+                rows = await self._insert_children(model, given)
+            untouched = [endpoint.id for endpoint in endpoints if endpoint.id not in given]
+            if untouched:
+                result = await self.session.scalars(select(model).where(model.endpoint_id.in_(untouched)))
+                rows += list(result.all())
+            by_endpoint: Dict[Any, List[Any]] = {endpoint.id: [] for endpoint in endpoints}
+            for row in rows:
+                by_endpoint[row.endpoint_id].append(row)
+            for endpoint in endpoints:
+                set_committed_value(endpoint, field, by_endpoint[endpoint.id])
+        return endpoints
+
+    async def _check_streams(self, changes: Dict[UUID, Dict[str, Any]]) -> None:
+        """Runs check_stream on each partially updated endpoint as it will be stored."""
+        checked = [endpoint_id for endpoint_id, data in changes.items() if not data.keys().isdisjoint(STREAM_FIELDS)]
+        if not checked:
+            return
+        result = await self.session.execute(
+            select(Endpoint.id, *(getattr(Endpoint, field) for field in STREAM_FIELDS)).where(Endpoint.id.in_(checked))
+        )
+        for endpoint_id, *values in result.all():
+            try:
+                check_stream(None, {**dict(zip(STREAM_FIELDS, values)), **changes[endpoint_id]})
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Endpoint {endpoint_id}: {e}")
+
+    async def _plan(self, changes: Dict[UUID, Dict[str, Any]]) -> None:
+        """Adds a new serving plan to every change that sets a field the plan is derived from."""
+        planned = [endpoint_id for endpoint_id, data in changes.items() if not data.keys().isdisjoint(PLAN_FIELDS)]
+        if not planned:
+            return
+        result = await self.session.execute(
+            select(Endpoint.id, *(getattr(Endpoint, field) for field in PLAN_FIELDS)).where(Endpoint.id.in_(planned))
+        )
+        for endpoint_id, *values in result.all():
+            data = changes[endpoint_id]
+            data["serving_plan"] = analyse({**dict(zip(PLAN_FIELDS, values)), **data})
+
+    async def _insert_children(self, model: Any, children: Dict[UUID, List[Dict[str, Any]]]) -> List[Any]:
+        rows = [
+            {**child, "endpoint_id": endpoint_id}
+            for endpoint_id, items in children.items()
+            for child in items
+        ]
+        if not rows:
+            return []
+        result = await self.session.scalars(insert(model).returning(model, sort_by_parameter_order=True), rows)
+        return list(result.all())
+
+    def _forget(self, group_id: Any, endpoint_ids: Iterable[Any]) -> None:
+        route_cache.invalidate(group_id)
+        for endpoint_id in endpoint_ids:
+            matcher_cache.discard(endpoint_id)
+            validator_cache.discard(endpoint_id)
+            template_cache.discard(endpoint_id)
+            plan_cache.discard(endpoint_id)
+            payload_cache.discard(endpoint_id)
@@ -0,0 +1,34 @@
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.endpoint_hit import EndpointHit
+
+
+class EndpointHitRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def summaries(self, group_id: UUID, endpoint_id: Optional[UUID] = None) -> List[Dict[str, Any]]:
+        """Hit totals per endpoint of a group, with status and chaos-effect breakdowns."""
+        query = select(EndpointHit).where(EndpointHit.group_id == group_id)
+        if endpoint_id:
+            query = query.where(EndpointHit.endpoint_id == endpoint_id)
+        summaries: Dict[Any, Dict[str, Any]] = {}
+        for row in (await self.session.execute(query)).scalars():
+            summary = summaries.get(row.endpoint_id)
+            if summary is None:
+                summary = summaries[row.endpoint_id] = {
+                    "endpoint_id": row.endpoint_id,
+                    "hits": 0,
+                    "by_status": {},
+                    "by_chaos_effect": {},
+                    "last_hit_at": row.last_hit_at,
+                }
+            summary["hits"] += row.hits
+            summary["by_status"][row.status_code] = summary["by_status"].get(row.status_code, 0) + row.hits
+            if row.chaos_effect:
+                summary["by_chaos_effect"][row.chaos_effect] = summary["by_chaos_effect"].get(row.chaos_effect, 0) + row.hits
+            summary["last_hit_at"] = max(summary["last_hit_at"], row.last_hit_at)
+        return sorted(summaries.values(), key=lambda summary: summary["hits"], reverse=True)
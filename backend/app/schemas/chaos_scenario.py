@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, validator
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "exponential")
+
+
+class Ramp(BaseModel):
+    start: float = Field(0, ge=0, description="Value at the start of the phase")
+    end: Optional[float] = Field(None, ge=0, description="Value at the end of the phase, reached linearly; defaults to start")
+
+
+class ScenarioPhase(BaseModel):
+    name: str = Field(..., description="Name reported in X-Chaos-Effect and the scenario status")
+    duration_seconds: float = Field(..., gt=0, description="How long the phase lasts")
+    latency_ms: Ramp = Field(default_factory=Ramp, description="Mean added latency, in milliseconds")
+    latency_distribution: str = Field("fixed", description="fixed, uniform (0 to twice the mean), normal or exponential")
+    error_rate: Ramp = Field(default_factory=Ramp, description="Share of requests failed with one of error_statuses, 0 to 1")
+    error_statuses: Dict[int, float] = Field(default_factory=lambda: {500: 1.0}, description="Status codes of injected errors and their weights")
+    max_requests_per_second: Optional[float] = Field(None, gt=0, description="Requests above this rate get 429, per worker")
+
+    @validator("latency_distribution")
+    def validate_distribution(cls, v: str) -> str:
+        if v not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+        return v
+
+    @validator("error_rate")
+    def validate_error_rate(cls, v: Ramp) -> Ramp:
+        if v.start > 1 or (v.end is not None and v.end > 1):
+            raise ValueError("error_rate must be between 0 and 1")
+        return v
+
+    @validator("error_statuses")
+    def validate_error_statuses(cls, v: Dict[int, float]) -> Dict[int, float]:
+        if not v:
+            raise ValueError("error_statuses must not be empty")
+        if any(not 400 <= code <= 599 for code in v):
+            raise ValueError("error_statuses must be 4xx or 5xx codes")
+        if any(weight < 0 for weight in v.values()) or sum(v.values()) <= 0:
+            raise ValueError("error_statuses weights must be positive")
+        return v
+
+
+class ChaosScenarioBase(BaseModel):
+    name: str = Field(..., description="Name of the scenario")
+    description: Optional[str] = Field(None, description="Description of the scenario")
+    endpoint_id: Optional[UUID] = Field(None, description="Limit the scenario to one endpoint of the group")
+    phases: List[ScenarioPhase] = Field(..., min_items=1, description="Timeline of phases, run in order")
+    repeat: bool = Field(False, description="Start over after the last phase instead of ending")
+
+
+class ChaosScenarioCreate(ChaosScenarioBase):
+    pass
+
+
+class ChaosScenarioUpdate(ChaosScenarioBase):
+    pass
+
+
+class ChaosScenarioResponse(ChaosScenarioBase):
+    id: UUID
+    group_id: UUID
+    created_by_id: UUID
+    started_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ChaosScenarioStatus(BaseModel):
+    running: bool
+    started_at: Optional[datetime] = None
+    elapsed_seconds: Optional[float] = None
+    finished: bool = False
+    phase: Optional[str] = None
+    latency_ms: Optional[float] = None
+    error_rate: Optional[float] = None
+    max_requests_per_second: Optional[float] = None
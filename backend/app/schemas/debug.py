@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfileStart(BaseModel):
+    requests: int = Field(100, ge=1, le=100000, description="Mock requests to profile")
+    group: Optional[str] = Field(None, description="Only requests to this group (name)")
+    path: Optional[str] = Field(None, description="Only requests whose endpoint path starts with this")
+
+
+class ProfiledFunction(BaseModel):
+    function: str
+    self_samples: int
+    total_samples: int
+
+
+class ProfileSummary(BaseModel):
+    running: bool
+    requests: int
+    group: Optional[str] = None
+    path: Optional[str] = None
+    matched: int
+    completed: int
+    samples: int
+    idle_samples: int
+    interval_ms: float
+    started_at: float
+    finished_at: Optional[float] = None
+    top_functions: List[ProfiledFunction]
+
+
+class MemoryReport(BaseModel):
+    rss_bytes: Optional[int] = None
+    gc_objects: int
+    structures: Optional[Dict[str, Dict[str, Any]]] = None
+    tracemalloc: Optional[Dict[str, Any]] = None
+
+
+class AdmissionClass(BaseModel):
+    lag_threshold_ms: float
+    max_in_flight: int
+    in_flight: int
+    admitted: int
+    shed: int
+
+
+class AdmissionReport(BaseModel):
+    enabled: bool
+    lag_ms: float
+    max_lag_ms: float
+    retry_after_seconds: int
+    classes: Dict[str, AdmissionClass]
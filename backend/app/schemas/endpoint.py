@@ -1,7 +1,43 @@
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field, Json
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, Json, root_validator, validator
 from uuid import UUID
 
+from app.schemas.fixture import check_fixture_name
+from app.utils.route_trie import normalize_path, split_path, PARAM_SEGMENT
+from app.utils.response_template import ResponseTemplate
+from app.utils.rule_matcher import compile_predicate
+
+
+def check_rule(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+    # Rejects rules that could not be compiled into a matcher (bad regex, empty enum, ...)
+    compile_predicate(values.get("match_type"), values.get("value"), values.get("minimum"), values.get("maximum"))
+    return values
+
+
+def check_path(cls, v: Optional[str]) -> Optional[str]:
+    # Paths may span several segments and use templates, e.g. "orders/{id}/items"
+    if v is None:
+        return v
+    normalized = normalize_path(v)
+    if not normalized:
+        raise ValueError("Path must not be empty")
+    names = []
+    for segment in split_path(normalized):
+        if not segment:
+            raise ValueError("Path must not contain empty segments")
+        if "{" in segment or "}" in segment:
+            match = PARAM_SEGMENT.match(segment)
+            if not match:
+                raise ValueError(f"Invalid path parameter segment '{segment}'")
+            names.append(match.group(1))
+    if len(names) != len(set(names)):
+        raise ValueError("Path parameter names must be unique")
+    if normalized == "chaos" or normalized.endswith("/chaos"):
+        raise ValueError("Path must not end with the reserved 'chaos' segment")
+    if normalized == "_batch":
+        raise ValueError("Path '_batch' is reserved for batch invocation")
+    return normalized
+
 
 class HeaderBase(BaseModel):
     name: str = Field(..., description="Name of the header")
@@ -9,6 +45,11 @@ class HeaderBase(BaseModel):
     required: bool = Field(False, description="Whether the header is required")
     default_response: Optional[Dict[str, Any]] = Field(None, description="Default response if header is missing")
     default_status_code: Optional[int] = Field(None, description="Default status code if header is missing")
+    match_type: str = Field("exact", description="How the value is checked: exact, regex, enum, integer, number, boolean or uuid")
+    minimum: Optional[float] = Field(None, description="Lower bound for integer and number rules")
+    maximum: Optional[float] = Field(None, description="Upper bound for integer and number rules")
+
+    _check_rule = root_validator(skip_on_failure=True, allow_reuse=True)(check_rule)
 
 
 class UrlParameterBase(BaseModel):
@@ -17,6 +58,50 @@ class UrlParameterBase(BaseModel):
     required: bool = Field(False, description="Whether the parameter is required")
     default_response: Optional[Dict[str, Any]] = Field(None, description="Default response if parameter is missing")
     default_status_code: Optional[int] = Field(None, description="Default status code if parameter is missing")
+    match_type: str = Field("exact", description="How the value is checked: exact, regex, enum, integer, number, boolean or uuid")
+    minimum: Optional[float] = Field(None, description="Lower bound for integer and number rules")
+    maximum: Optional[float] = Field(None, description="Upper bound for integer and number rules")
+
+    _check_rule = root_validator(skip_on_failure=True, allow_reuse=True)(check_rule)
+
+
+# The fields check_stream reads; partial updates setting any of them are checked against the stored row
+STREAM_FIELDS = ("method", "stream_type", "fixture_dataset")
+
+
+def check_stream(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+    # Both stream kinds are opened with a GET (the WebSocket handshake is one)
+    if values.get("stream_type") and values.get("method", "").upper() != "GET":
+        raise ValueError("Streaming endpoints must use the GET method")
+    if values.get("stream_type") and values.get("fixture_dataset"):
+        raise ValueError("An endpoint serves either a stream or a fixture dataset, not both")
+    return values
+
+
+def check_templates(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+    # Rejects unknown `{{ ... }}` expressions in the body or `x-template` properties
+    ResponseTemplate(values.get("response_body"), values.get("response_schema"))
+    return values
+
+
+class StreamBurst(BaseModel):
+    size: int = Field(..., ge=1, le=10000, description="Extra messages sent at once")
+    every_seconds: float = Field(..., gt=0, description="Seconds between bursts")
+
+
+class StreamChaos(BaseModel):
+    """Per-message odds for each subscriber of the /chaos variant."""
+    disconnect_rate: float = Field(0.01, ge=0, le=1, description="The connection is closed")
+    stall_rate: float = Field(0.02, ge=0, le=1, description="Nothing is sent for stall_seconds, then the stream resumes at the latest message")
+    stall_seconds: float = Field(2.0, ge=0, le=300)
+    malformed_rate: float = Field(0.02, ge=0, le=1, description="A truncated, unparseable frame is sent instead")
+
+
+class StreamConfig(BaseModel):
+    rate: float = Field(1.0, gt=0, le=1000, description="Messages per second")
+    jitter: float = Field(0.0, ge=0, le=1, description="Each interval varies randomly by up to this fraction")
+    burst: Optional[StreamBurst] = None
+    chaos: StreamChaos = Field(default_factory=StreamChaos, description="Applied on the /chaos variant")
 
 
 class EndpointBase(BaseModel):
@@ -30,9 +115,20 @@ class EndpointBase(BaseModel):
     response_status_code: Optional[int] = 200
     response_body: Optional[str] = None
     request_body_schema: Optional[Dict[str, Any]] = None
+    max_request_body_bytes: Optional[int] = Field(None, gt=0, description="Largest accepted request body; defaults to MOCK_MAX_REQUEST_BODY_BYTES")
+    stream_request_validation: Optional[bool] = Field(False, description="Validate array bodies item by item while they are received")
+    response_size_bytes: Optional[int] = Field(None, gt=0, le=2**31 - 1, description="Serve a JSON array of exactly this many bytes, repeating records generated from the response")
+    stream_type: Optional[Literal["sse", "websocket"]] = Field(None, description="Serve a stream of messages generated from the response instead of one response")
+    stream_config: Optional[StreamConfig] = Field(None, description="Rate, bursts and chaos of the stream; defaults apply when unset")
+    fixture_dataset: Optional[str] = Field(None, description="Serve records of this fixture dataset of the group instead of generating them")
     headers: List[HeaderBase] = Field(default_factory=list, description="Expected headers")
     url_parameters: List[UrlParameterBase] = Field(default_factory=list, description="Expected URL parameters")
 
+    _check_path = validator("path", allow_reuse=True)(check_path)
+    _check_fixture = validator("fixture_dataset", allow_reuse=True)(check_fixture_name)
+    _check_stream = root_validator(skip_on_failure=True, allow_reuse=True)(check_stream)
+    _check_templates = root_validator(skip_on_failure=True, allow_reuse=True)(check_templates)
+
 
 class EndpointCreate(EndpointBase):
     group_id: UUID
@@ -42,10 +138,54 @@ class EndpointUpdate(EndpointBase):
     pass
 
 
+class EndpointBatchUpdate(BaseModel):
+    """Partial update of one endpoint in a batch; only the fields that are set change."""
+    id: UUID
+    name: Optional[str] = None
+    description: Optional[str] = None
+    path: Optional[str] = None
+    method: Optional[str] = None
+    max_wait_time: Optional[int] = None
+    chaos_mode: Optional[bool] = None
+    response_schema: Optional[Dict[str, Any]] = None
+    response_status_code: Optional[int] = None
+    response_body: Optional[str] = None
+    request_body_schema: Optional[Dict[str, Any]] = None
+    max_request_body_bytes: Optional[int] = Field(None, gt=0)
+    stream_request_validation: Optional[bool] = None
+    response_size_bytes: Optional[int] = Field(None, gt=0, le=2**31 - 1)
+    stream_type: Optional[Literal["sse", "websocket"]] = None
+    stream_config: Optional[StreamConfig] = None
+    fixture_dataset: Optional[str] = None
+    headers: Optional[List[HeaderBase]] = Field(None, description="Replaces all headers when set")
+    url_parameters: Optional[List[UrlParameterBase]] = Field(None, description="Replaces all URL parameters when set")
+
+    _check_path = validator("path", allow_reuse=True)(check_path)
+    _check_fixture = validator("fixture_dataset", allow_reuse=True)(check_fixture_name)
+    _check_templates = root_validator(skip_on_failure=True, allow_reuse=True)(check_templates)
+
+
+class EndpointBatchDelete(BaseModel):
+    ids: List[UUID] = Field(..., min_items=1, description="Endpoints of the group to delete")
+
+
+class ServingPlan(BaseModel):
+    """How the mock path serves the endpoint, decided when it was saved."""
+    kind: Literal["stream", "fixture", "generated", "template", "constant", "empty", "invalid"]
+    media_type: str
+    estimated_cost: int = Field(..., description="Values generated per response; above GENERATION_OFFLOAD_THRESHOLD they are rendered in a worker process")
+    estimated_bytes: int = Field(..., description="Approximate size of one response")
+    offload: bool
+    streaming: bool = Field(..., description="Sent as a stream: sized responses, SSE and WebSocket")
+    warnings: List[str] = Field(default_factory=list, description="Schema keywords the generator ignores and other problems found on save")
+    error: Optional[str] = None
+
+
 class Endpoint(EndpointBase):
     id: UUID
     group_id: UUID
     created_by_id: UUID
+    serving_plan: Optional[ServingPlan] = None
 
     class Config:
         from_attributes = True
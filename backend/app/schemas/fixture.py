@@ -0,0 +1,52 @@
+import re
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, root_validator, validator
+
+# Dataset names and indexed fields become file names
+FIXTURE_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def check_fixture_name(cls, v: Optional[str]) -> Optional[str]:
+    if v is not None and not FIXTURE_NAME.match(v):
+        raise ValueError("Fixture dataset names are 1 to 64 letters, digits, '_' or '-'")
+    return v
+
+
+def check_indexes(cls, v: List[str]) -> List[str]:
+    for field in v:
+        if not FIXTURE_NAME.match(field):
+            raise ValueError(f"Cannot index '{field}': indexed fields are 1 to 64 letters, digits, '_' or '-'")
+    return list(dict.fromkeys(v))
+
+
+def check_source(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+    if (values.get("schema_") is None) == (values.get("endpoint_id") is None):
+        raise ValueError("Give either a record schema or the endpoint whose response schema describes the records")
+    return values
+
+
+class FixtureGenerate(BaseModel):
+    records: int = Field(..., ge=1, description="Records to generate; at most FIXTURE_MAX_RECORDS")
+    schema_: Optional[Dict[str, Any]] = Field(None, alias="schema", description="JSON Schema of one record")
+    endpoint_id: Optional[UUID] = Field(None, description="Use this endpoint's response schema (its items, for an array)")
+    id_field: str = "id"
+    indexes: List[str] = Field(default_factory=list, description="Fields to index for filtered listings")
+
+    _check_indexes = validator("indexes", allow_reuse=True)(check_indexes)
+    _check_source = root_validator(skip_on_failure=True, allow_reuse=True)(check_source)
+
+    class Config:
+        populate_by_name = True
+
+
+class FixtureInfo(BaseModel):
+    name: str
+    version: str
+    source: str
+    count: int
+    id_field: str
+    indexes: List[str]
+    records_bytes: int
+    created_at: float
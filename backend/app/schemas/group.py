@@ -1,12 +1,21 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 from uuid import UUID
 
 
+class GroupStateConfig(BaseModel):
+    enabled: bool = Field(False, description="Apply POST/PUT/PATCH/DELETE bodies to an in-memory collection and serve GETs from it")
+    id_field: str = Field("id", description="Field that identifies an item in a collection")
+    indexes: List[str] = Field(default_factory=list, description="Fields with a secondary index for equality filters")
+    max_items: int = Field(10000, ge=1, description="Per-collection size limit, least recently used items are evicted")
+    snapshot: bool = Field(False, description="Periodically write the collections to disk and restore them on restart")
+
+
 class GroupBase(BaseModel):
     name: str = Field(..., description="Name of the group")
     description: Optional[str] = Field(None, description="Description of the group")
+    state_config: Optional[GroupStateConfig] = Field(None, description="Stateful mock configuration")
 
 
 class GroupCreate(GroupBase):
@@ -16,6 +25,7 @@ class GroupCreate(GroupBase):
 class GroupUpdate(GroupBase):
     name: Optional[str] = None
     description: Optional[str] = None
+    state_config: Optional[GroupStateConfig] = None
 
 
 class GroupResponse(GroupBase):
@@ -0,0 +1,27 @@
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+
+class MockSubRequest(BaseModel):
+    method: Literal["GET", "POST", "PUT", "DELETE", "PATCH"] = "GET"
+    path: str = Field(..., description="Endpoint path within the group, e.g. 'orders/42' or 'orders/42/chaos'")
+    query: Dict[str, Union[str, List[str]]] = Field(default_factory=dict)
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Optional[Any] = Field(None, description="JSON document sent as the request body")
+
+
+class MockBatch(BaseModel):
+    requests: List[MockSubRequest] = Field(..., min_items=1)
+    concurrency: Optional[int] = Field(None, ge=1, description="Sub-requests run at once; defaults to MOCK_BATCH_CONCURRENCY")
+
+
+class MockSubResponse(BaseModel):
+    index: int = Field(..., description="Position of the sub-request in the batch")
+    status: int
+    headers: Dict[str, str]
+    body: Any = None
+
+
+class MockBatchResponse(BaseModel):
+    results: List[MockSubResponse]
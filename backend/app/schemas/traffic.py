@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class CapturedRequestResponse(BaseModel):
+    group_id: Optional[UUID] = None
+    endpoint_id: Optional[UUID] = None
+    method: str
+    path: str
+    query: Optional[str] = None
+    headers: Optional[Dict[str, Any]] = None
+    body_sha256: Optional[str] = None
+    body_size: int
+    chaos_effect: Optional[str] = None
+    status_code: int
+    duration_ms: float
+    received_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TrafficCaptureStats(BaseModel):
+    backend: str
+    queued: int
+    queue_size: int
+    captured: int
+    dropped: int
+    written: int
+    failed: int
+
+
+class EndpointHitSummary(BaseModel):
+    endpoint_id: UUID
+    hits: int
+    by_status: Dict[int, int]
+    by_chaos_effect: Dict[str, int]
+    last_hit_at: datetime
+
+
+class HitCounterStats(BaseModel):
+    enabled: bool
+    pending_rows: int
+    recorded: int
+    flushed: int
+    failed: int
@@ -0,0 +1,135 @@
+"""Prefork process manager for serving the API in production.
+
+The supervisor binds the listening socket once and starts N uvicorn workers that
+share it. Each worker runs the app's lifespan (which warms caches and the DB
+pool) before it starts accepting. Workers that exit after `max_requests` are
+replaced; SIGTERM/SIGINT stops them all with a bounded graceful drain.
+"""
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import time
+from multiprocessing.connection import wait
+from typing import Dict, Optional
+
+import uvicorn
+
+logger = logging.getLogger("uvicorn.error")
+
+# Give workers a moment beyond their own drain deadline before killing them
+KILL_GRACE_SECONDS = 5.0
+# A worker dying sooner than this after start is treated as a crash and restarted with a delay
+CRASH_WINDOW_SECONDS = 2.0
+
+
+def run_worker(config: uvicorn.Config, sockets: list) -> None:
+    config.configure_logging()
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+class Supervisor:
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+    ) -> None:
+        self.config = config
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.processes: Dict[int, multiprocessing.Process] = {}
+        self.started_at: Dict[int, float] = {}
+        self.should_exit = False
+        self._context = multiprocessing.get_context("spawn")
+        self._socket = None
+
+    def spawn(self) -> None:
+        # Jitter keeps recycled workers from all restarting at the same moment
+        if self.max_requests > 0:
+            self.config.limit_max_requests = self.max_requests + random.randint(0, self.max_requests_jitter)
+        process = self._context.Process(
+            target=run_worker,
+            kwargs={"config": self.config, "sockets": [self._socket]},
+        )
+        process.start()
+        self.processes[process.sentinel] = process
+        self.started_at[process.sentinel] = time.monotonic()
+
+    def handle_exit(self, sig: int, frame: Optional[object]) -> None:
+        self.should_exit = True
+
+    def run(self) -> int:
+        self._socket = self.config.bind_socket()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self.handle_exit)
+        logger.info("Started supervisor [%d] with %d workers", os.getpid(), self.workers)
+        for _ in range(self.workers):
+            self.spawn()
+
+        while not self.should_exit:
+            for sentinel in wait(list(self.processes), timeout=0.5):
+                process = self.processes.pop(sentinel)
+                lifetime = time.monotonic() - self.started_at.pop(sentinel)
+                process.join()
+                if self.should_exit:
+                    break
+                if process.exitcode == 0:
+                    logger.info("Worker [%d] exited after reaching its request limit, replacing it", process.pid)
+                else:
+                    logger.warning("Worker [%d] died with exit code %s, replacing it", process.pid, process.exitcode)
+                    if lifetime < CRASH_WINDOW_SECONDS:
+                        time.sleep(1.0)
+                self.spawn()
+
+        self.drain()
+        return 0
+
+    def drain(self) -> None:
+        """Asks every worker to shut down and kills those that outlive the deadline."""
+        # Nothing new should queue up in the backlog while workers drain
+        self._socket.close()
+        logger.info("Draining %d workers", len(self.processes))
+        for process in self.processes.values():
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+        deadline = time.monotonic() + (self.config.timeout_graceful_shutdown or 0) + KILL_GRACE_SECONDS
+        for process in self.processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning("Worker [%d] missed the drain deadline, killing it", process.pid)
+                process.kill()
+                process.join()
+        self.processes.clear()
+
+
+def serve(
+    host: str,
+    port: int,
+    workers: int,
+    max_requests: int = 0,
+    max_requests_jitter: int = 0,
+    graceful_timeout: int = 30,
+    backlog: int = 2048,
+    log_level: str = "info",
+    access_log: bool = False,
+) -> int:
+    config = uvicorn.Config(
+        "app.main:app",
+        host=host,
+        port=port,
+        backlog=backlog,
+        log_level=log_level,
+        access_log=access_log,
+        lifespan="on",
+        timeout_graceful_shutdown=graceful_timeout,
+        proxy_headers=True,
+    )
+    if workers <= 1 and max_requests <= 0:
+        # A single worker needs no supervisor; uvicorn handles the signals itself
+        uvicorn.Server(config).run()
+        return 0
+    return Supervisor(config, max(1, workers), max_requests, max_requests_jitter).run()
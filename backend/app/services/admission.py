@@ -0,0 +1,224 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+# Request classes, most important first: under load the last ones are shed first
+ADMIN = "admin"
+MOCK = "mock"
+CHAOS = "chaos"
+HEAVY = "heavy"
+CLASSES = (ADMIN, MOCK, CHAOS, HEAVY)
+# Lag drops back towards the current sample by this factor per sample, so a spike sheds for a moment, not one tick
+LAG_DECAY = 0.8
+
+
+class Overloaded(Exception):
+    def __init__(self, request_class: str, reason: str) -> None:
+        super().__init__(f"Server overloaded, shedding {request_class} requests: {reason}")
+        self.request_class = request_class
+
+
+class Ticket:
+    """One admitted request's slot in its class; released when the response is done."""
+
+    __slots__ = ("controller", "request_class", "released")
+
+    def __init__(self, controller: "AdmissionController", request_class: str) -> None:
+        self.controller = controller
+        self.request_class = request_class
+        self.released = False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.controller.in_flight[self.request_class] -= 1
+
+
+class AdmissionController:
+    """Sheds load by request class before the event loop falls behind everyone.
+
+    A background task measures event loop lag (how late a short sleep wakes
+    up). Each class has a lag threshold and an in-flight limit (0 disables
+    either); a request of a class over its threshold or limit is rejected with
+    503 and Retry-After before any routing or database work. Thresholds rise
+    with priority, so heavy generation is shed first, then chaos, then plain
+    mocks, and the admin API the UI needs keeps working.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        sample_interval: float,
+        lag_thresholds: Dict[str, float],
+        max_in_flight: Dict[str, int],
+        retry_after: int,
+    ) -> None:
+        self.enabled = enabled
+        self.sample_interval = sample_interval
+        self.lag_thresholds = {name: lag_thresholds.get(name, 0) / 1000 for name in CLASSES}
+        self.max_in_flight = {name: max_in_flight.get(name, 0) for name in CLASSES}
+        self.retry_after = retry_after
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.in_flight = dict.fromkeys(CLASSES, 0)
+        self.admitted = dict.fromkeys(CLASSES, 0)
+        self.shed = dict.fromkeys(CLASSES, 0)
+        self._task: Optional[asyncio.Task] = None
+
+    def check(self, request_class: str) -> None:
+        threshold = self.lag_thresholds[request_class]
+        if threshold and self.lag > threshold:
+            self.shed[request_class] += 1
+            raise Overloaded(request_class, f"event loop lag {self.lag * 1000:.0f} ms")
+        limit = self.max_in_flight[request_class]
+        if limit and self.in_flight[request_class] >= limit:
+            self.shed[request_class] += 1
+            raise Overloaded(request_class, f"{limit} requests in flight")
+
+    def admit(self, request_class: str) -> Ticket:
+        self.check(request_class)
+        self.in_flight[request_class] += 1
+        self.admitted[request_class] += 1
+        return Ticket(self, request_class)
+
+    def escalate(self, request: Request, request_class: str) -> None:
+        """Moves an admitted request to another class once the handler knows what it costs; 503s if that class is shed."""
+        ticket: Optional[Ticket] = getattr(request.state, "admission", None)
+        if ticket is None or ticket.released or ticket.request_class == request_class:
+            return
+        try:
+            self.check(request_class)
+        except Overloaded as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        ticket.release()
+        request.state.admission = self.admit(request_class)
+
+    def release(self, request: Request) -> None:
+        """Frees a request's slot early, e.g. for streams that stay open far longer than a response."""
+        ticket: Optional[Ticket] = getattr(request.state, "admission", None)
+        if ticket is not None:
+            ticket.release()
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._measure())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _measure(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self.sample_interval
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            lag = max(0.0, loop.time() - started - interval)
+            # Rises at once, falls off gradually
+            self.lag = lag if lag > self.lag else self.lag * LAG_DECAY + lag * (1 - LAG_DECAY)
+            self.max_lag = max(self.max_lag, lag)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "lag_ms": self.lag * 1000,
+            "max_lag_ms": self.max_lag * 1000,
+            "retry_after_seconds": self.retry_after,
+            "classes": {
+                name: {
+                    "lag_threshold_ms": self.lag_thresholds[name] * 1000,
+                    "max_in_flight": self.max_in_flight[name],
+                    "in_flight": self.in_flight[name],
+                    "admitted": self.admitted[name],
+                    "shed": self.shed[name],
+                }
+                for name in CLASSES
+            },
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that classes each HTTP request by its path and admits or sheds it.
+
+    Paths under the API prefix whose first segment is not one of the
+    management API's are mock requests (chaos when they end in /chaos);
+    everything else is admin. Mock handlers move expensive requests to the
+    heavy class with `AdmissionController.escalate`.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]], controller: AdmissionController, prefix: str, admin_segments: Iterable[str]) -> None:
+        self.app = app
+        self.controller = controller
+        self.prefix = prefix.rstrip("/") + "/"
+        self.admin_segments = frozenset(admin_segments)
+
+    def classify(self, path: str) -> str:
+        if not path.startswith(self.prefix):
+            return ADMIN
+        segment = path[len(self.prefix):].split("/", 1)[0]
+        if not segment or segment in self.admin_segments:
+            return ADMIN
+        return CHAOS if path.endswith("/chaos") else MOCK
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        controller = self.controller
+        if scope["type"] != "http" or not controller.enabled:
+            await self.app(scope, receive, send)
+            return
+        try:
+            ticket = controller.admit(self.classify(scope["path"]))
+        except Overloaded as e:
+            await self.reject(send, str(e))
+            return
+        # request.state.admission; escalate() may swap in a ticket of another class
+        state = scope.setdefault("state", {})
+        state["admission"] = ticket
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            state["admission"].release()
+
+    async def reject(self, send: Callable, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status.HTTP_503_SERVICE_UNAVAILABLE,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.controller.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def route_segments(routes: Iterable[Any]) -> set:
+    """First path segments of the given routes, except the mock routes' `{group_name}`."""
+    segments = set()
+    for route in routes:
+        segment = getattr(route, "path", "").lstrip("/").split("/", 1)[0]
+        if segment and not segment.startswith("{"):
+            segments.add(segment)
+    return segments
+
+
+admission_controller = AdmissionController(
+    enabled=settings.ADMISSION_CONTROL_ENABLED,
+    sample_interval=settings.ADMISSION_LAG_SAMPLE_INTERVAL_MS / 1000,
+    lag_thresholds=settings.ADMISSION_LAG_THRESHOLDS_MS,
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+)
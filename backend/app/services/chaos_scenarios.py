@@ -0,0 +1,225 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.chaos_scenario import ChaosScenario
+
+# Schedules longer than this many slots use a coarser resolution
+MAX_SLOTS = 10000
+
+
+class ScheduleSlot(NamedTuple):
+    phase: str
+    latency_ms: float
+    latency_distribution: str
+    error_rate: float
+    error_statuses: Tuple[int, ...]
+    error_weights: Tuple[float, ...]
+    max_requests_per_second: Optional[float]
+
+
+def ramp_value(ramp: Dict[str, Any], fraction: float) -> float:
+    start = ramp.get("start") or 0.0
+    end = ramp.get("end")
+    if end is None:
+        return start
+    return start + (end - start) * fraction
+
+
+def compile_schedule(phases: List[Dict[str, Any]], resolution: float) -> Tuple[List[ScheduleSlot], float]:
+    """Samples the phase timeline into fixed-width slots; returns them and the slot width.
+
+    Ramps are evaluated at the middle of each slot, so a request only has to
+    index the list. Phases shorter than a slot may not get a slot of their own.
+    """
+    total = sum(phase["duration_seconds"] for phase in phases)
+    resolution = max(resolution, total / MAX_SLOTS)
+    slots: List[ScheduleSlot] = []
+    count = max(1, int(total / resolution + 0.5))
+    phase_index, phase_start = 0, 0.0
+    for index in range(count):
+        at = (index + 0.5) * resolution
+        while phase_index < len(phases) - 1 and at >= phase_start + phases[phase_index]["duration_seconds"]:
+            phase_start += phases[phase_index]["duration_seconds"]
+            phase_index += 1
+        phase = phases[phase_index]
+        fraction = min(1.0, max(0.0, (at - phase_start) / phase["duration_seconds"]))
+        error_statuses = phase.get("error_statuses") or {500: 1.0}
+        slots.append(ScheduleSlot(
+            phase=phase["name"],
+            latency_ms=ramp_value(phase.get("latency_ms") or {}, fraction),
+            latency_distribution=phase.get("latency_distribution") or "fixed",
+            error_rate=ramp_value(phase.get("error_rate") or {}, fraction),
+            # JSON object keys come back from the database as strings
+            error_statuses=tuple(int(code) for code in error_statuses),
+            error_weights=tuple(float(weight) for weight in error_statuses.values()),
+            max_requests_per_second=phase.get("max_requests_per_second"),
+        ))
+    return slots, resolution
+
+
+def epoch_seconds(value: datetime) -> float:
+    # Timestamps are stored in UTC; some drivers hand them back naive
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def sample_latency(slot: ScheduleSlot) -> float:
+    """Added latency in seconds, drawn from the slot's distribution around its mean."""
+    mean = slot.latency_ms / 1000
+    if mean <= 0:
+        return 0.0
+    if slot.latency_distribution == "uniform":
+        return random.uniform(0, 2 * mean)
+    if slot.latency_distribution == "normal":
+        return max(0.0, random.gauss(mean, mean / 4))
+    if slot.latency_distribution == "exponential":
+        return random.expovariate(1 / mean)
+    return mean
+
+
+class CompiledScenario:
+    """A running scenario: its precomputed schedule and this worker's throughput window."""
+
+    def __init__(self, scenario: ChaosScenario, resolution: float) -> None:
+        self.id = scenario.id
+        self.name = scenario.name
+        self.endpoint_id = scenario.endpoint_id
+        self.repeat = scenario.repeat
+        self.updated_at = scenario.updated_at
+        self.started_at = epoch_seconds(scenario.started_at) if scenario.started_at else None
+        self.slots, self.resolution = compile_schedule(scenario.phases, resolution)
+        self._window = 0
+        self._window_count = 0
+
+    def slot_at(self, now: float) -> Optional[ScheduleSlot]:
+        """The slot in effect at wall-clock time `now`, or None before the start and after the end."""
+        if self.started_at is None or now < self.started_at:
+            return None
+        index = int((now - self.started_at) / self.resolution)
+        if index >= len(self.slots):
+            if not self.repeat:
+                return None
+            index %= len(self.slots)
+        return self.slots[index]
+
+    def admit(self, slot: ScheduleSlot, now: float) -> bool:
+        """Counts the request against the current one-second window; False once the cap is reached."""
+        if slot.max_requests_per_second is None:
+            return True
+        window = int(now)
+        if window != self._window:
+            self._window = window
+            self._window_count = 0
+        self._window_count += 1
+        return self._window_count <= slot.max_requests_per_second
+
+
+class ScenarioCache:
+    """Per-process cache of the running scenarios of each group.
+
+    Start and stop go through the database (started_at), so every worker picks
+    them up within `ttl_seconds`; the API invalidates this worker right away.
+    """
+
+    def __init__(self, ttl_seconds: float, resolution: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.resolution = resolution
+        self._groups: Dict[str, Tuple[float, List[CompiledScenario]]] = {}
+
+    async def running(self, db: AsyncSession, group_id: UUID) -> List[CompiledScenario]:
+        cached = self._groups.get(str(group_id))
+        if cached is not None and time.monotonic() - cached[0] < self.ttl_seconds:
+            return cached[1]
+        result = await db.execute(
+            select(ChaosScenario).where(ChaosScenario.group_id == group_id, ChaosScenario.started_at.isnot(None))
+        )
+        # Reuse compiled schedules (and their throughput windows) of unchanged scenarios
+        previous = {compiled.id: compiled for compiled in (cached[1] if cached else [])}
+        scenarios = []
+        for scenario in result.scalars():
+            compiled = previous.get(scenario.id)
+            if compiled is None or compiled.updated_at != scenario.updated_at:
+                compiled = CompiledScenario(scenario, self.resolution)
+            scenarios.append(compiled)
+        self._groups[str(group_id)] = (time.monotonic(), scenarios)
+        return scenarios
+
+    async def current(self, db: AsyncSession, group_id: UUID, endpoint_id: UUID) -> Optional[Tuple[CompiledScenario, ScheduleSlot]]:
+        """The scenario shaping a request to this endpoint; endpoint-scoped ones win over group-wide ones."""
+        scenarios = await self.running(db, group_id)
+        if not scenarios:
+            return None
+        now = time.time()
+        fallback = None
+        for scenario in scenarios:
+            if scenario.endpoint_id is not None and scenario.endpoint_id != endpoint_id:
+                continue
+            slot = scenario.slot_at(now)
+            if slot is None:
+                continue
+            if scenario.endpoint_id is not None:
+                return scenario, slot
+            fallback = fallback or (scenario, slot)
+        return fallback
+
+    def invalidate(self, group_id: Optional[UUID] = None) -> None:
+        if group_id is None:
+            self._groups.clear()
+        else:
+            self._groups.pop(str(group_id), None)
+
+
+async def apply_scenario(request: Request, scenario: CompiledScenario, slot: ScheduleSlot) -> None:
+    """Throttles, delays or fails the request as the scenario's current slot dictates."""
+    request.state.chaos_effect = f"scenario:{scenario.name}/{slot.phase}"
+    if not scenario.admit(slot, time.time()):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Chaos scenario '{scenario.name}': throughput cap of {slot.max_requests_per_second:g} requests per second",
+            headers={"Retry-After": "1"},
+        )
+    delay = sample_latency(slot)
+    if delay > 0:
+        await asyncio.sleep(delay)
+    if slot.error_rate > 0 and random.random() < slot.error_rate:
+        error_status = random.choices(slot.error_statuses, weights=slot.error_weights)[0]
+        raise HTTPException(status_code=error_status, detail=f"Chaos scenario '{scenario.name}': simulated error")
+
+
+def scenario_status(scenario: ChaosScenario) -> Dict[str, Any]:
+    """What the scenario is doing right now, for the status API."""
+    if scenario.started_at is None:
+        return {"running": False}
+    compiled = CompiledScenario(scenario, settings.CHAOS_SCENARIO_RESOLUTION_SECONDS)
+    now_ts = time.time()
+    slot = compiled.slot_at(now_ts)
+    info: Dict[str, Any] = {
+        "running": True,
+        "started_at": scenario.started_at,
+        "elapsed_seconds": max(0.0, now_ts - compiled.started_at),
+        "finished": slot is None and now_ts >= compiled.started_at,
+    }
+    if slot is not None:
+        info.update(
+            phase=slot.phase,
+            latency_ms=slot.latency_ms,
+            error_rate=slot.error_rate,
+            max_requests_per_second=slot.max_requests_per_second,
+        )
+    return info
+
+
+scenario_cache = ScenarioCache(
+    ttl_seconds=settings.MOCK_ROUTE_CACHE_TTL_SECONDS,
+    resolution=settings.CHAOS_SCENARIO_RESOLUTION_SECONDS,
+)
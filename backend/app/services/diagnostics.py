@@ -0,0 +1,294 @@
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.chaos_scenarios import scenario_cache
+from app.services.embedded_store import embedded_store
+from app.services.faker_pools import faker_pools
+from app.services.fixtures import fixture_store
+from app.services.hit_counters import hit_counters
+from app.services.mock_routes import matcher_cache, route_cache, validator_cache
+from app.services.mock_streams import stream_hub
+from app.services.resource_store import resource_store
+from app.services.serving_plan import plan_cache
+from app.services.sized_payload import payload_cache
+from app.services.traffic_capture import traffic_capture
+
+# Samples whose innermost frame is one of these are the event loop waiting for I/O
+IDLE_FRAMES = {("selectors.py", "select"), ("base_events.py", "_run_once")}
+# Objects visited per structure before deep_size gives up and reports a lower bound
+DEEP_SIZE_LIMIT = 1_000_000
+# Referents of these are shared with the rest of the process, not owned by a cache
+SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, types.CodeType, types.FrameType)
+SHARED_MODULES = ("sqlalchemy.", "asyncio.", "concurrent.", "logging", "threading")
+
+
+class ProfileSession:
+    """Samples the event loop thread while requests matching the filter are in flight."""
+
+    def __init__(self, requests: int, group: Optional[str], path: Optional[str], interval: float, max_seconds: float) -> None:
+        self.requests = requests
+        self.group = group.lower() if group else None
+        self.path = path.strip("/") if path else None
+        self.interval = interval
+        self.deadline = time.monotonic() + max_seconds
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.matched = 0
+        self.completed = 0
+        self.in_flight = 0
+        self.samples = 0
+        self.idle_samples = 0
+        # Stacks as tuples of (filename, function, first line), outermost first
+        self.stacks: Counter = Counter()
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def matches(self, group_name: str, endpoint_path: str) -> bool:
+        if self.group and group_name.lower() != self.group:
+            return False
+        return not self.path or endpoint_path.strip("/").startswith(self.path)
+
+    def folded(self) -> str:
+        """Brendan Gregg's folded format, one `frame;frame;frame count` line per stack."""
+        lines = []
+        for stack, count in self.stacks.most_common():
+            frames = ";".join(f"{name} ({os.path.basename(filename)}:{line})" for filename, name, line in stack)
+            lines.append(f"{frames} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def top_functions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Functions the loop was in when sampled (self), with the samples under them (total)."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for frame in set(stack):
+                total[frame] += count
+        return [
+            {
+                "function": f"{name} ({filename}:{line})",
+                "self_samples": samples,
+                "total_samples": total[(filename, name, line)],
+            }
+            for (filename, name, line), samples in own.most_common(limit)
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "running": not self.done,
+            "requests": self.requests,
+            "group": self.group,
+            "path": self.path,
+            "matched": self.matched,
+            "completed": self.completed,
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "interval_ms": self.interval * 1000,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "top_functions": self.top_functions(),
+        }
+
+
+class RequestProfiler:
+    """Sampling profiler for the next N matching mock requests.
+
+    While a session is armed, a daemon thread reads the event loop thread's
+    stack every `interval` seconds with sys._current_frames() whenever a
+    matching request is in flight. Requests run concurrently on one loop, so
+    samples show everything the loop did during those requests; filter by
+    group and path, or profile under a single load source, for a clean
+    picture. Work in the schema generation process pool is not sampled.
+    With no session armed the mock path pays one attribute check.
+    """
+
+    def __init__(self, interval: float, max_seconds: float) -> None:
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.session: Optional[ProfileSession] = None
+        self.last: Optional[ProfileSession] = None
+        self._thread_id: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def start(self, requests: int, group: Optional[str] = None, path: Optional[str] = None) -> ProfileSession:
+        self.stop()
+        session = ProfileSession(requests, group, path, self.interval, self.max_seconds)
+        self._thread_id = threading.get_ident()
+        self.session = self.last = session
+        threading.Thread(target=self._sample, args=(session,), name="request-profiler", daemon=True).start()
+        return session
+
+    def stop(self) -> Optional[ProfileSession]:
+        session, self.session = self.session, None
+        if session is not None and not session.done:
+            session.finished_at = time.time()
+        return session
+
+    def enter(self, group_name: str, endpoint_path: str) -> Optional[ProfileSession]:
+        session = self.session
+        if session is None or session.matched >= session.requests or not session.matches(group_name, endpoint_path):
+            return None
+        session.matched += 1
+        with self._lock:
+            session.in_flight += 1
+        return session
+
+    def exit(self, session: ProfileSession) -> None:
+        with self._lock:
+            session.in_flight -= 1
+        session.completed += 1
+        if session.completed >= session.requests and self.session is session:
+            self.stop()
+
+    def _sample(self, session: ProfileSession) -> None:
+        thread_id = self._thread_id
+        while not session.done:
+            time.sleep(session.interval)
+            if time.monotonic() > session.deadline:
+                if self.session is session:
+                    self.stop()
+                break
+            if not session.in_flight:
+                continue
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                session.idle_samples += 1
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+                frame = frame.f_back
+            stack.reverse()
+            session.stacks[tuple(stack)] += 1
+            session.samples += 1
+
+
+def deep_size(root: Any, limit: int = DEEP_SIZE_LIMIT) -> Tuple[int, bool]:
+    """Bytes reachable from `root` (sys.getsizeof over the gc referents), and whether the walk was cut short."""
+    seen = set()
+    stack = [root]
+    size = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if len(seen) > limit:
+            return size, True
+        if obj is not root and (isinstance(obj, SHARED_TYPES) or type(obj).__module__.startswith(SHARED_MODULES)):
+            continue
+        size += sys.getsizeof(obj, 0)
+        stack.extend(gc.get_referents(obj))
+    return size, False
+
+
+def tracked_structures() -> Dict[str, Any]:
+    return {
+        "route_cache": route_cache,
+        "matcher_cache": matcher_cache,
+        "validator_cache": validator_cache,
+        "plan_cache": plan_cache,
+        "payload_cache": payload_cache,
+        "scenario_cache": scenario_cache,
+        "faker_pools": faker_pools,
+        "resource_store": resource_store,
+        "traffic_capture_queue": traffic_capture.queue,
+        "hit_counters_pending": hit_counters._pending,
+        "embedded_store": embedded_store.snapshot,
+        "stream_channels": stream_hub.channels,
+        # The datasets' files are mapped, not counted here; see RSS and the page cache
+        "fixture_datasets": fixture_store._open,
+    }
+
+
+def rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class MemoryTracer:
+    """tracemalloc, switched on only on request; it slows allocation-heavy code while it runs."""
+
+    def __init__(self, frames: int) -> None:
+        self.frames = frames
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.baseline = self._snapshot()
+
+    def stop(self) -> None:
+        self.baseline = None
+        tracemalloc.stop()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        # The tracer's own bookkeeping is not what anyone is looking for
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+    def top(self, limit: int, key_type: str = "lineno") -> Dict[str, Any]:
+        """Largest allocation sites now, and the ones that grew most since tracing started."""
+        snapshot = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        report: Dict[str, Any] = {
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "top": [self._stat(stat) for stat in snapshot.statistics(key_type)[:limit]],
+        }
+        if self.baseline is not None:
+            report["growth"] = [
+                {**self._stat(stat), "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+                for stat in snapshot.compare_to(self.baseline, key_type)[:limit]
+            ]
+        return report
+
+    @staticmethod
+    def _stat(stat: Any) -> Dict[str, Any]:
+        return {
+            "site": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size": stat.size,
+            "count": stat.count,
+        }
+
+
+def memory_report(structures: bool = True, limit: int = 20) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"rss_bytes": rss_bytes(), "gc_objects": len(gc.get_objects())}
+    if structures:
+        sizes = {}
+        for name, structure in tracked_structures().items():
+            size, truncated = deep_size(structure)
+            sizes[name] = {"bytes": size, "truncated": truncated}
+        report["structures"] = sizes
+    report["tracemalloc"] = memory_tracer.top(limit) if memory_tracer.tracing else None
+    return report
+
+
+request_profiler = RequestProfiler(
+    interval=settings.PROFILER_SAMPLE_INTERVAL_MS / 1000,
+    max_seconds=settings.PROFILER_MAX_SECONDS,
+)
+memory_tracer = MemoryTracer(frames=settings.TRACEMALLOC_FRAMES)
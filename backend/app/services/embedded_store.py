@@ -0,0 +1,228 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+from pydantic import Field
+
+from app.core.config import settings
+from app.models.endpoint import Endpoint
+from app.models.group import Group
+from app.models.header import Header
+from app.models.url_parameter import UrlParameter
+from app.schemas.endpoint import EndpointBase
+from app.schemas.group import GroupBase
+from app.services.mock_routes import GroupRoutes
+from app.services.serving_plan import analyse, log_warnings
+from app.utils.route_trie import route_shape
+
+logger = logging.getLogger(__name__)
+
+CONFIG_EXTENSIONS = (".json", ".yaml", ".yml")
+# created_by_id of everything loaded from files; embedded mode has no users
+EMBEDDED_USER_ID = uuid5(NAMESPACE_URL, "estoca-mock-api:embedded")
+
+
+class EmbeddedGroup(GroupBase):
+    """One group per document: the group's fields plus its endpoints, shaped like EndpointCreate."""
+    endpoints: List[EndpointBase] = Field(default_factory=list)
+
+
+class EmbeddedConfigError(Exception):
+    pass
+
+
+class Snapshot:
+    """Everything the mock path needs, built in full before it replaces the previous one."""
+
+    def __init__(self, routes: Dict[str, GroupRoutes], endpoints: Dict[UUID, Endpoint], signature: Any) -> None:
+        self.routes = routes
+        self.endpoints = endpoints
+        self.signature = signature
+        self.loaded_at = datetime.utcnow()
+
+
+def read_documents(path: str) -> List[Dict[str, Any]]:
+    with open(path, "rb") as file:
+        raw = file.read()
+    if path.endswith(".json"):
+        data = json.loads(raw)
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise EmbeddedConfigError(f"{path}: YAML files need PyYAML installed")
+        data = yaml.safe_load(raw)
+    # A file holds one group or a list of groups
+    return data if isinstance(data, list) else [data]
+
+
+def config_files(directory: str) -> List[str]:
+    paths = []
+    for root, _, names in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in names if name.endswith(CONFIG_EXTENSIONS))
+    return sorted(paths)
+
+
+def directory_signature(directory: str) -> Tuple[Tuple[str, int, int], ...]:
+    signature = []
+    for path in config_files(directory):
+        stat = os.stat(path)
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def build_snapshot(directory: str) -> Snapshot:
+    """Parses and validates every file; raises on the first problem so a bad edit never goes live."""
+    signature = directory_signature(directory)
+    loaded_at = datetime.utcnow()
+    routes: Dict[str, GroupRoutes] = {}
+    endpoints: Dict[UUID, Endpoint] = {}
+    for path, _, _ in signature:
+        try:
+            documents = read_documents(path)
+            groups = [EmbeddedGroup.model_validate(document) for document in documents]
+        except EmbeddedConfigError:
+            raise
+        except Exception as e:
+            # Syntax errors (JSON or YAML) and validation errors alike
+            raise EmbeddedConfigError(f"{path}: {e}") from e
+        for group_in in groups:
+            key = group_in.name.lower()
+            if key in routes:
+                raise EmbeddedConfigError(f"{path}: group '{group_in.name}' is defined more than once")
+            # Stable ids, so captured traffic and logs line up across reloads and restarts
+            group = Group(
+                id=uuid5(NAMESPACE_URL, f"estoca-mock-api:group:{key}"),
+                name=group_in.name,
+                description=group_in.description,
+                state_config=group_in.state_config.model_dump() if group_in.state_config else None,
+                created_by_id=EMBEDDED_USER_ID,
+            )
+            entries = []
+            shapes = set()
+            for endpoint_in in group_in.endpoints:
+                shape = (endpoint_in.method.upper(), route_shape(endpoint_in.path))
+                if shape in shapes:
+                    raise EmbeddedConfigError(
+                        f"{path}: endpoint {endpoint_in.method} '{endpoint_in.path}' collides with another route in '{group.name}'"
+                    )
+                shapes.add(shape)
+                data = endpoint_in.model_dump()
+                headers = data.pop("headers")
+                url_parameters = data.pop("url_parameters")
+                endpoint = Endpoint(
+                    **data,
+                    serving_plan=analyse(data),
+                    id=uuid5(group.id, f"{endpoint_in.method.upper()} {endpoint_in.path}"),
+                    group_id=group.id,
+                    created_by_id=EMBEDDED_USER_ID,
+                    # Compiled matchers and validators are keyed by updated_at, so reloads rebuild them
+                    updated_at=loaded_at,
+                    headers=[Header(**header) for header in headers],
+                    url_parameters=[UrlParameter(**parameter) for parameter in url_parameters],
+                )
+                log_warnings(endpoint)
+                endpoints[endpoint.id] = endpoint
+                entries.append((endpoint.id, endpoint.path, endpoint.method))
+            group_routes = GroupRoutes(group, entries)
+            routes[key] = group_routes
+    return Snapshot(routes, endpoints, signature)
+
+
+class EmbeddedStore:
+    """Groups and endpoints served from a directory of JSON/YAML files instead of the database.
+
+    The directory is polled every `reload_interval` seconds; when a file is
+    added, changed or removed, the whole directory is parsed into a new
+    snapshot in a thread and swapped in with one assignment. A snapshot that
+    fails validation is logged and the previous one keeps serving.
+    """
+
+    def __init__(self, directory: Optional[str], reload_interval: float) -> None:
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.snapshot: Optional[Snapshot] = None
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def load(self) -> Snapshot:
+        self.snapshot = build_snapshot(self.directory)
+        return self.snapshot
+
+    def get_group(self, group_name: str) -> Optional[GroupRoutes]:
+        return self.snapshot.routes.get(group_name.lower()) if self.snapshot else None
+
+    def get_endpoint(self, endpoint_id: UUID) -> Optional[Endpoint]:
+        return self.snapshot.endpoints.get(endpoint_id) if self.snapshot else None
+
+    def endpoints(self) -> List[Endpoint]:
+        return list(self.snapshot.endpoints.values()) if self.snapshot else []
+
+    async def start(self) -> None:
+        if not self.enabled:
+            return
+        # Startup fails loudly on a broken directory; later reloads only log
+        self.load()
+        logger.info(
+            "Embedded mode: serving %d groups, %d endpoints from %s",
+            len(self.snapshot.routes), len(self.snapshot.endpoints), self.directory,
+        )
+        if self.reload_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                signature = await asyncio.to_thread(directory_signature, self.directory)
+                if signature == self.snapshot.signature:
+                    continue
+                snapshot = await asyncio.to_thread(build_snapshot, self.directory)
+            except Exception as e:
+                self.failed_reloads += 1
+                self.last_error = str(e)
+                logger.error("Embedded config not reloaded, still serving the previous version: %s", e)
+                # Remember the broken state so the same error isn't logged on every poll
+                if self.snapshot is not None:
+                    self.snapshot.signature = await asyncio.to_thread(directory_signature, self.directory)
+                continue
+            self.snapshot = snapshot
+            self.reloads += 1
+            self.last_error = None
+            logger.info("Embedded config reloaded: %d groups, %d endpoints", len(snapshot.routes), len(snapshot.endpoints))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "groups": len(self.snapshot.routes) if self.snapshot else 0,
+            "endpoints": len(self.snapshot.endpoints) if self.snapshot else 0,
+            "loaded_at": self.snapshot.loaded_at if self.snapshot else None,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "last_error": self.last_error,
+        }
+
+
+embedded_store = EmbeddedStore(
+    directory=settings.EMBEDDED_CONFIG_DIR,
+    reload_interval=settings.EMBEDDED_RELOAD_INTERVAL_SECONDS,
+)
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderPool:
+    """Pre-generated values of one Faker provider; sampling is a single random index."""
+
+    __slots__ = ("locale", "provider", "values", "built_at", "target_size")
+
+    def __init__(self, locale: str, provider: str, values: List[Any], target_size: int) -> None:
+        self.locale = locale
+        self.provider = provider
+        self.values = values
+        self.built_at = time.monotonic()
+        self.target_size = target_size
+
+    def sample(self) -> Any:
+        values = self.values
+        return values[int(random.random() * len(values))]
+
+    def replace(self, values: List[Any]) -> None:
+        # One reference swap, so a request never sees a half-built list
+        self.values = values
+        self.built_at = time.monotonic()
+
+    def approx_bytes(self) -> int:
+        if not self.values:
+            return 0
+        sample = self.values[: min(32, len(self.values))]
+        per_value = sum(sys.getsizeof(value) for value in sample) / len(sample)
+        return int(per_value * len(self.values) + sys.getsizeof(self.values))
+
+
+class PooledFaker:
+    """Stand-in for a Faker instance inside jsf's context.
+
+    jsf evaluates `$provider: faker.name` as `faker.name()`, so attribute lookups
+    here hand out the pool's sampler. Excluded providers (values that must stay
+    unique, such as uuid4) and anything past the pool limit go to a real Faker.
+    """
+
+    def __init__(self, pools: "FakerPools", locale: str) -> None:
+        self._pools = pools
+        self._locale = locale
+
+    def __getattr__(self, name: str) -> Callable[[], Any]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        sampler = self._pools.sampler(self._locale, name)
+        # Cache on the instance; the pool object stays the same across refreshes
+        setattr(self, name, sampler)
+        return sampler
+
+
+class FakerPools:
+    """Per-process pools of Faker values keyed by (locale, provider).
+
+    A pool is created on first use with `initial_size` values, so the first
+    request only pays for a few Faker calls; the background task then grows it
+    to `pool_size` and regenerates every pool each `refresh_interval` seconds
+    so long runs don't cycle through the same values. Generation for the
+    background task runs in a thread with its own Faker instances.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        pool_size: int,
+        initial_size: int,
+        max_pools: int,
+        refresh_interval: float,
+        exclude: Iterable[str],
+    ) -> None:
+        self.enabled = enabled
+        self.pool_size = pool_size
+        # A pool is sampled as soon as it exists, so it never starts empty
+        self.initial_size = max(1, min(initial_size, pool_size))
+        self.max_pools = max_pools
+        self.refresh_interval = refresh_interval
+        self.exclude = set(exclude)
+        self.pools: Dict[Tuple[str, str], ProviderPool] = {}
+        self._proxies: Dict[str, PooledFaker] = {}
+        self._request_fakers: Dict[str, Any] = {}
+        self._refresh_fakers: Dict[str, Any] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def faker(self, locale: str) -> Any:
+        """The Faker used on the request path (pool seeding and direct calls)."""
+        instance = self._request_fakers.get(locale)
+        if instance is None:
+            from faker import Faker
+
+            instance = self._request_fakers[locale] = Faker(locale)
+        return instance
+
+    def _refresh_faker(self, locale: str) -> Any:
+        # Only touched from the refresh thread; Faker instances are not shared across threads
+        instance = self._refresh_fakers.get(locale)
+        if instance is None:
+            from faker import Faker
+
+            instance = self._refresh_fakers[locale] = Faker(locale)
+        return instance
+
+    def proxy(self, locale: Optional[str] = None) -> Any:
+        """A Faker-compatible object for jsf's context; the plain Faker when pooling is off."""
+        locale = locale or settings.FAKER_LOCALE
+        if not self.enabled:
+            return self.faker(locale)
+        proxy = self._proxies.get(locale)
+        if proxy is None:
+            proxy = self._proxies[locale] = PooledFaker(self, locale)
+        return proxy
+
+    def sampler(self, locale: str, provider: str) -> Callable[[], Any]:
+        direct = getattr(self.faker(locale), provider)
+        if provider in self.exclude or provider.startswith("_") or not callable(direct):
+            return direct
+        key = (locale, provider)
+        pool = self.pools.get(key)
+        if pool is None:
+            if len(self.pools) >= self.max_pools:
+                return direct
+            pool = self.pools[key] = ProviderPool(
+                locale, provider, [direct() for _ in range(self.initial_size)], self.pool_size
+            )
+            if self._wake is not None:
+                self._wake.set()
+        return pool.sample
+
+    def sample(self, provider: str, locale: Optional[str] = None) -> Any:
+        """One pooled value, for code that calls Faker directly rather than through jsf."""
+        return getattr(self.proxy(locale), provider)()
+
+    async def prebuild(self, providers: Iterable[str], locale: Optional[str] = None) -> int:
+        """Builds full pools ahead of traffic, e.g. for the providers found in stored schemas."""
+        if not self.enabled:
+            return 0
+        locale = locale or settings.FAKER_LOCALE
+        built = 0
+        for provider in set(providers):
+            if (locale, provider) in self.pools or len(self.pools) >= self.max_pools:
+                continue
+            if provider in self.exclude or not callable(getattr(self.faker(locale), provider, None)):
+                continue
+            values = await asyncio.to_thread(self._generate, locale, provider, self.pool_size)
+            self.pools[(locale, provider)] = ProviderPool(locale, provider, values, self.pool_size)
+            built += 1
+        return built
+
+    def _generate(self, locale: str, provider: str, size: int) -> List[Any]:
+        method = getattr(self._refresh_faker(locale), provider)
+        return [method() for _ in range(size)]
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wake = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                timeout = self.refresh_interval if self.refresh_interval > 0 else None
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            now = time.monotonic()
+            for pool in list(self.pools.values()):
+                stale = self.refresh_interval > 0 and now - pool.built_at >= self.refresh_interval
+                if len(pool.values) < pool.target_size or stale:
+                    try:
+                        values = await asyncio.to_thread(self._generate, pool.locale, pool.provider, pool.target_size)
+                    except Exception:
+                        logger.exception("Failed to refresh Faker pool %s/%s", pool.locale, pool.provider)
+                        continue
+                    pool.replace(values)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "pools": len(self.pools),
+            "max_pools": self.max_pools,
+            "pool_size": self.pool_size,
+            "approx_bytes": sum(pool.approx_bytes() for pool in self.pools.values()),
+        }
+
+
+def find_providers(schema: Any) -> List[str]:
+    """Names of the `faker.*` providers referenced by `$provider` anywhere in a schema."""
+    found: List[str] = []
+    stack = [schema]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            provider = node.get("$provider")
+            if isinstance(provider, str) and provider.startswith("faker."):
+                found.append(provider[len("faker."):])
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return found
+
+
+faker_pools = FakerPools(
+    enabled=settings.FAKER_POOLS_ENABLED,
+    pool_size=settings.FAKER_POOL_SIZE,
+    initial_size=settings.FAKER_POOL_INITIAL_SIZE,
+    max_pools=settings.FAKER_POOL_MAX_POOLS,
+    refresh_interval=settings.FAKER_POOL_REFRESH_SECONDS,
+    exclude=settings.FAKER_POOL_EXCLUDE,
+)
@@ -0,0 +1,249 @@
+import asyncio
+import fcntl
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse, Response
+
+from app.core.config import settings
+from app.models.endpoint import Endpoint
+from app.utils.fixture_dataset import META_FILE, Dataset, DatasetError, write_dataset
+from app.utils.route_trie import PARAM_SEGMENT, split_path
+
+logger = logging.getLogger(__name__)
+
+# Names the file of the version a dataset serves; replaced atomically on every build
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+# Query parameters that page a listing; every other one filters it
+PAGE_PARAMS = ("limit", "offset")
+
+
+def generated_records(schema: Dict[str, Any], count: int, id_field: str) -> Iterator[Dict[str, Any]]:
+    from app.services.schema_generation import render_response
+
+    # Generated ids would collide; records are numbered instead, typed as the schema says
+    id_type = (schema.get("properties") or {}).get(id_field, {}).get("type")
+    for number in range(count):
+        record = render_response(schema, {})
+        if not isinstance(record, dict):
+            raise DatasetError("The record schema must describe an object")
+        record[id_field] = number + 1 if id_type == "integer" else str(number + 1)
+        yield record
+
+
+def uploaded_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Records of an uploaded file: a JSON array, or one JSON object per line."""
+    with open(path, "rb") as file:
+        head = file.read(64).lstrip()
+        file.seek(0)
+        if head.startswith(b"["):
+            yield from json.load(file)
+            return
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def build_version(directory: str, source: Dict[str, Any]) -> Dict[str, Any]:
+    """Writes a new version of a dataset and makes it current; runs in a separate process.
+
+    Builds of the same dataset may run at once (workers, hosts sharing the
+    directory), so each holds an exclusive lock on the dataset directory.
+    """
+    with open(os.path.join(directory, LOCK_FILE), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return write_version(directory, source)
+
+
+def write_version(directory: str, source: Dict[str, Any]) -> Dict[str, Any]:
+    version = f"{int(time.time())}-{uuid4().hex[:8]}"
+    target = os.path.join(directory, version)
+    os.makedirs(target)
+    try:
+        if source["kind"] == "generated":
+            records = generated_records(source["schema"], source["records"], source["id_field"])
+        else:
+            records = uploaded_records(source["path"])
+        meta = write_dataset(target, records, source["id_field"], source["indexes"])
+    except Exception as e:
+        shutil.rmtree(target, ignore_errors=True)
+        # Exceptions of jsf and friends may not survive the trip back to the parent process
+        raise DatasetError(str(e)) from None
+    meta.update(name=os.path.basename(directory), version=version, source=source["kind"], created_at=time.time())
+    with open(os.path.join(target, META_FILE), "w") as out:
+        json.dump(meta, out)
+
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as file:
+            previous = file.read().strip()
+    except FileNotFoundError:
+        previous = ""
+    pending = os.path.join(directory, f"{CURRENT_FILE}.{version}")
+    with open(pending, "w") as out:
+        out.write(version)
+    os.replace(pending, os.path.join(directory, CURRENT_FILE))
+    # Workers serve the previous version until they notice the switch; anything older
+    # (or left by a build that died) can go
+    kept = {version, previous}
+    for entry in os.listdir(directory):
+        if entry not in kept and os.path.isdir(os.path.join(directory, entry)):
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+    return meta
+
+def id_parameter(endpoint_path: str) -> Optional[str]:
+    """The path parameter naming a record: the last segment, when it is a parameter."""
+    segments = split_path(endpoint_path)
+    match = PARAM_SEGMENT.match(segments[-1]) if segments else None
+    return match.group(1) if match else None
+
+
+def page_param(query_params: Mapping[str, str], name: str, default: int, maximum: int) -> int:
+    raw = query_params.get(name)
+    if raw is None:
+        return default
+    if not raw.isdigit():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"'{name}' must be a non-negative integer")
+    return min(int(raw), maximum)
+
+
+class FixtureStore:
+    """Fixture datasets on disk, per group and name, and this worker's mappings of them.
+
+    A dataset lives in FIXTURE_DIR/<group id>/<name>/<version>/; CURRENT in
+    the dataset directory names the version to serve. Builds write a new
+    version in a separate process and switch CURRENT with one rename, so all
+    workers (and hosts sharing the directory) pick it up within
+    `reload_interval` without a restart. Workers map the files read-only and
+    never load a dataset into memory.
+    """
+
+    def __init__(self, root: str, reload_interval: float, default_page_size: int, max_page_size: int) -> None:
+        self.root = root
+        self.reload_interval = reload_interval
+        self.default_page_size = default_page_size
+        self.max_page_size = max_page_size
+        # (group id, name) -> (checked at, version, mapped dataset)
+        self._open: Dict[Tuple[str, str], Tuple[float, Optional[str], Optional[Dataset]]] = {}
+        self.lookups = 0
+        self.listings = 0
+
+    def directory(self, group_id: Any, name: str) -> str:
+        return os.path.join(self.root, str(group_id), name)
+
+    def current_version(self, group_id: Any, name: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.directory(group_id, name), CURRENT_FILE)) as file:
+                return file.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def get(self, group_id: Any, name: str) -> Optional[Dataset]:
+        """The mapped current version, checked for a newer one at most every `reload_interval`."""
+        key = (str(group_id), name)
+        now = time.monotonic()
+        entry = self._open.get(key)
+        if entry is not None and now - entry[0] < self.reload_interval:
+            return entry[2]
+        version = self.current_version(group_id, name)
+        if entry is not None and entry[1] == version:
+            dataset = entry[2]
+        elif version is None:
+            dataset = None
+        else:
+            try:
+                dataset = Dataset(os.path.join(self.directory(group_id, name), version))
+            except FileNotFoundError:
+                # CURRENT names a version that is gone (deleted by hand or mid-delete): not built
+                logger.warning("Fixture dataset %s/%s: version %s is missing", group_id, name, version)
+                dataset = None
+        self._open[key] = (now, version, dataset)
+        return dataset
+
+    def info(self, group_id: Any, name: str) -> Optional[Dict[str, Any]]:
+        version = self.current_version(group_id, name)
+        if version is None:
+            return None
+        try:
+            with open(os.path.join(self.directory(group_id, name), version, META_FILE)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def list(self, group_id: Any) -> List[Dict[str, Any]]:
+        directory = os.path.join(self.root, str(group_id))
+        names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+        return [meta for meta in (self.info(group_id, name) for name in names) if meta is not None]
+
+    async def build(self, group_id: Any, name: str, source: Dict[str, Any]) -> Dict[str, Any]:
+        """Builds a version in a one-off process, so generating millions of records never blocks the loop."""
+        directory = self.directory(group_id, name)
+        os.makedirs(directory, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        # spawn, not fork: the serving process has an event loop and threads that must not be cloned
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            meta = await loop.run_in_executor(executor, build_version, directory, source)
+        # This worker serves the new version right away; the others within reload_interval
+        self._open.pop((str(group_id), name), None)
+        return meta
+
+    def delete(self, group_id: Any, name: str) -> bool:
+        directory = self.directory(group_id, name)
+        if not os.path.isdir(directory):
+            return False
+        shutil.rmtree(directory)
+        self._open.pop((str(group_id), name), None)
+        return True
+
+    def respond(self, endpoint: Endpoint, group_id: Any, path_params: Dict[str, str], query_params: Mapping[str, str], status_code: int) -> Response:
+        """A record by id when the endpoint path ends in a parameter, otherwise a filtered page of records.
+
+        Listings filter on every query parameter but `limit`, `offset` and the
+        endpoint's URL parameter rules, and on the path parameters (e.g.
+        customers/{customer_id}/orders).
+        """
+        dataset = self.get(group_id, endpoint.fixture_dataset)
+        if dataset is None:
+            raise HTTPException(status_code=500, detail=f"Fixture dataset '{endpoint.fixture_dataset}' has not been built")
+        id_param = id_parameter(endpoint.path)
+        if id_param is not None:
+            self.lookups += 1
+            record_id = path_params[id_param]
+            record = dataset.get(record_id)
+            if record is None:
+                return JSONResponse(content={"detail": f"No record with {dataset.id_field} '{record_id}'"}, status_code=404)
+            return Response(content=record, status_code=status_code, media_type="application/json")
+
+        self.listings += 1
+        limit = page_param(query_params, "limit", self.default_page_size, self.max_page_size)
+        offset = page_param(query_params, "offset", 0, dataset.count)
+        rule_params = {param.name for param in endpoint.url_parameters or []}
+        filters = {name: value for name, value in query_params.items() if name not in PAGE_PARAMS and name not in rule_params}
+        filters.update(path_params)
+        page, total = dataset.query(filters, offset, limit)
+        headers = {"X-Total-Count": str(total)} if total is not None else None
+        return Response(content=b"[" + b",".join(page) + b"]", status_code=status_code, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "root": self.root,
+            "mapped": sum(1 for _, _, dataset in self._open.values() if dataset is not None),
+            "lookups": self.lookups,
+            "listings": self.listings,
+        }
+
+
+fixture_store = FixtureStore(
+    root=settings.FIXTURE_DIR,
+    reload_interval=settings.FIXTURE_RELOAD_INTERVAL_SECONDS,
+    default_page_size=settings.FIXTURE_DEFAULT_PAGE_SIZE,
+    max_page_size=settings.FIXTURE_MAX_PAGE_SIZE,
+)
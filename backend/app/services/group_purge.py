@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.group import Group
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_deleted_groups(retention_seconds: float) -> int:
+    """Removes groups soft-deleted longer ago than the retention, children included by ON DELETE CASCADE."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=retention_seconds)
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            delete(Group).where(Group.deleted_at.isnot(None), Group.deleted_at < cutoff).returning(Group.id)
+        )
+        purged = len(result.all())
+        await session.commit()
+    return purged
+
+
+class GroupPurger:
+    """Background job that hard-deletes soft-deleted groups once their retention has passed.
+
+    Each worker runs it; the DELETE is idempotent, so overlapping runs are harmless.
+    """
+
+    def __init__(self, enabled: bool, retention_seconds: float, interval: float) -> None:
+        self.enabled = enabled
+        self.retention_seconds = retention_seconds
+        self.interval = interval
+        self.purged = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self.enabled and self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                purged = await purge_deleted_groups(self.retention_seconds)
+            except Exception:
+                logger.exception("Failed to purge deleted groups")
+                continue
+            if purged:
+                self.purged += purged
+                logger.info("Purged %d deleted groups", purged)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "purged": self.purged}
+
+
+group_purger = GroupPurger(
+    enabled=settings.GROUP_SOFT_DELETE,
+    retention_seconds=settings.GROUP_PURGE_AFTER_SECONDS,
+    interval=settings.GROUP_PURGE_INTERVAL_SECONDS,
+)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.endpoint_hit import EndpointHit
+
+logger = logging.getLogger(__name__)
+
+
+def upsert_hits(dialect_name: str, rows: List[Dict[str, Any]]) -> Any:
+    """One INSERT .. ON CONFLICT that adds the deltas to the existing rollup rows."""
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+
+    table = EndpointHit.__table__
+    statement = insert(table).values(rows)
+    excluded = statement.excluded
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.endpoint_id, table.c.status_code, table.c.chaos_effect],
+        set_={
+            "hits": table.c.hits + excluded.hits,
+            "last_hit_at": case(
+                (excluded.last_hit_at > table.c.last_hit_at, excluded.last_hit_at),
+                else_=table.c.last_hit_at,
+            ),
+            "updated_at": excluded.updated_at,
+        },
+    )
+
+
+class HitCounters:
+    """Per-endpoint request counters, kept in memory and flushed as deltas.
+
+    `record()` is a dict update on the request path. Every `flush_interval`
+    seconds the background task swaps the pending deltas out and adds them to
+    the endpoint_hits rollup with a single upsert. Because the upsert adds
+    rather than overwrites, every worker flushes its own deltas and the rows
+    hold the totals across workers.
+    """
+
+    def __init__(self, enabled: bool, flush_interval: float) -> None:
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        # (endpoint_id, status_code, chaos_effect) -> [group_id, hits, last_hit_at]
+        self._pending: Dict[Tuple[Any, int, str], List[Any]] = {}
+        self.recorded = 0
+        self.flushed = 0
+        self.failed = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, group_id: Any, endpoint_id: Any, status_code: int, chaos_effect: Optional[str]) -> None:
+        key = (endpoint_id, status_code, chaos_effect or "")
+        entry = self._pending.get(key)
+        if entry is None:
+            self._pending[key] = [group_id, 1, datetime.now(timezone.utc)]
+        else:
+            entry[1] += 1
+            entry[2] = datetime.now(timezone.utc)
+        self.recorded += 1
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the flusher and writes the deltas counted since the last flush."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "endpoint_id": endpoint_id,
+                "group_id": group_id,
+                "status_code": status_code,
+                "chaos_effect": effect,
+                "hits": hits,
+                "last_hit_at": last_hit_at,
+                "updated_at": now,
+            }
+            for (endpoint_id, status_code, effect), (group_id, hits, last_hit_at) in pending.items()
+        ]
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(upsert_hits(session.bind.dialect.name, rows))
+                await session.commit()
+            self.flushed += sum(row["hits"] for row in rows)
+        except Exception:
+            # Counting is best effort; the deltas of a failed flush are dropped, not retried forever
+            self.failed += sum(row["hits"] for row in rows)
+            logger.exception("Failed to flush hit counters for %d endpoint rows", len(rows))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "pending_rows": len(self._pending),
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "failed": self.failed,
+        }
+
+
+hit_counters = HitCounters(
+    enabled=settings.HIT_COUNTERS_ENABLED,
+    flush_interval=settings.HIT_COUNTERS_FLUSH_INTERVAL_SECONDS,
+)
@@ -0,0 +1,451 @@
+import asyncio
+import json
+import math
+import random
+import ssl
+import string
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote, unquote, urlencode, urlsplit
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.models.endpoint import Endpoint
+from app.models.group import Group
+from app.utils.json_schema import generate_data_from_schema
+from app.utils.route_trie import PARAM_SEGMENT, split_path
+from app.utils.rule_matcher import sample_value
+
+BODY_METHODS = ("POST", "PUT", "PATCH")
+
+
+class PlannedRequest(NamedTuple):
+    endpoint_key: str
+    method: str
+    target: str
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+class Response(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body_size: int
+
+
+class RequestTemplate:
+    """Builds valid requests for one endpoint from its stored contract.
+
+    Headers and URL parameters are sent with a value their rule accepts,
+    path parameters get fresh values on every request and request bodies are
+    generated from `request_body_schema` ahead of time, so schema generation
+    never runs inside the measured send loop. Rules no value can be derived
+    for (regex patterns) are left out and listed in `warnings`.
+    """
+
+    def __init__(self, endpoint: Endpoint, group_name: str, body_pool_size: int = 20) -> None:
+        self.key = f"{endpoint.method} {endpoint.path}"
+        self.method = endpoint.method.upper()
+        self.chaos_mode = bool(endpoint.chaos_mode)
+        self.prefix = f"{settings.API_V1_STR}/{quote(group_name)}"
+        self.segments = split_path(endpoint.path)
+        self.warnings: List[str] = []
+        self.headers = list(self._rule_values(endpoint.headers, "header").items())
+        self.fixed_params = self._rule_values(endpoint.url_parameters, "parameter")
+        path_names = {m.group(1) for m in map(PARAM_SEGMENT.match, self.segments) if m}
+        self.query = urlencode(
+            {name: value for name, value in self.fixed_params.items() if name not in path_names}
+        )
+        self.bodies: List[bytes] = [b""]
+        if self.method in BODY_METHODS and endpoint.request_body_schema:
+            self.bodies = [
+                json.dumps(generate_data_from_schema(endpoint.request_body_schema)).encode()
+                for _ in range(body_pool_size)
+            ]
+            self.headers.append(("content-type", "application/json"))
+
+    def _rule_values(self, rules: Any, kind: str) -> Dict[str, str]:
+        values = {}
+        for rule in rules or []:
+            match_type = getattr(rule, "match_type", None) or "exact"
+            value = sample_value(match_type, rule.value, getattr(rule, "minimum", None), getattr(rule, "maximum", None))
+            if value is None:
+                if rule.required:
+                    self.warnings.append(
+                        f"{self.key}: no value matches the {match_type} rule of {kind} '{rule.name}'; it is not sent, expect 400s"
+                    )
+                continue
+            values[rule.name] = value
+        return values
+
+    def _path_value(self, name: str) -> str:
+        if name in self.fixed_params:
+            return self.fixed_params[name]
+        if name.lower().endswith("id"):
+            return str(random.randint(1, 100000))
+        return "".join(random.choices(string.ascii_lowercase, k=8))
+
+    def build(self, chaos: bool) -> PlannedRequest:
+        parts = []
+        for segment in self.segments:
+            match = PARAM_SEGMENT.match(segment)
+            parts.append(quote(self._path_value(match.group(1))) if match else segment)
+        target = f"{self.prefix}/{'/'.join(parts)}"
+        if chaos:
+            target += "/chaos"
+        if self.query:
+            target += f"?{self.query}"
+        return PlannedRequest(self.key, self.method, target, self.headers, random.choice(self.bodies))
+
+
+class HTTPTransport:
+    """Minimal keep-alive HTTP/1.1 client on asyncio streams.
+
+    Only what the load generator needs: it counts body bytes instead of keeping
+    them and opens a new connection whenever no idle one is available, so an
+    open-loop schedule is never throttled by a connection pool.
+    """
+
+    def __init__(self, base_url: str) -> None:
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "localhost"
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.base_path = parts.path.rstrip("/")
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def __aenter__(self) -> "HTTPTransport":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    async def send(self, request: PlannedRequest) -> Response:
+        if self._idle:
+            reader, writer = self._idle.pop()
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        try:
+            lines = [f"{request.method} {self.base_path}{request.target} HTTP/1.1", f"Host: {self.host}"]
+            lines += [f"{name}: {value}" for name, value in request.headers]
+            lines.append(f"Content-Length: {len(request.body)}")
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + request.body)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("Connection closed before a response was received")
+            status = int(status_line.split()[1])
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            body_size = 0
+            if request.method == "HEAD" or status in (204, 304):
+                pass
+            elif headers.get("transfer-encoding", "").lower() == "chunked":
+                while True:
+                    size = int((await reader.readline()).split(b";")[0], 16)
+                    if size:
+                        body_size += len(await reader.readexactly(size))
+                    await reader.readline()
+                    if not size:
+                        break
+            elif "content-length" in headers:
+                body_size = len(await reader.readexactly(int(headers["content-length"])))
+            else:
+                body_size = len(await reader.read())
+                headers["connection"] = "close"
+        except BaseException:
+            writer.close()
+            raise
+        if headers.get("connection", "").lower() == "close":
+            writer.close()
+        else:
+            self._idle.append((reader, writer))
+        return Response(status, headers, body_size)
+
+
+class ASGITransport:
+    """Calls an ASGI app in-process, including its lifespan, without any sockets."""
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+        self._lifespan = None
+
+    async def __aenter__(self) -> "ASGITransport":
+        router = getattr(self.app, "router", None)
+        if router is not None:
+            self._lifespan = router.lifespan_context(self.app)
+            await self._lifespan.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._lifespan is not None:
+            await self._lifespan.__aexit__(None, None, None)
+
+    async def send(self, request: PlannedRequest) -> Response:
+        path, _, query = request.target.partition("?")
+        headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in request.headers]
+        headers += [(b"host", b"loadgen"), (b"content-length", str(len(request.body)).encode())]
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": "http",
+            "path": unquote(path),
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("loadgen", 80),
+        }
+        done = asyncio.Event()
+        body_sent = False
+        result: Dict[str, Any] = {"status": 500, "headers": {}, "body_size": 0}
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": request.body, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                result["status"] = message["status"]
+                result["headers"] = {
+                    name.decode("latin-1").lower(): value.decode("latin-1")
+                    for name, value in message.get("headers", [])
+                }
+            elif message["type"] == "http.response.body":
+                result["body_size"] += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            done.set()
+        return Response(result["status"], result["headers"], result["body_size"])
+
+
+class Bucket:
+    __slots__ = ("latencies", "statuses", "errors")
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.statuses: Dict[int, int] = {}
+        self.errors = 0
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class LoadReport:
+    """Latency and error samples keyed by (endpoint, chaos effect)."""
+
+    def __init__(self) -> None:
+        self.buckets: Dict[Tuple[str, str], Bucket] = {}
+        self.unsent = 0
+        self.warnings: List[str] = []
+        self.elapsed = 0.0
+
+    def add(self, endpoint_key: str, chaos_effect: str, latency_ms: float, status: Optional[int]) -> None:
+        bucket = self.buckets.get((endpoint_key, chaos_effect))
+        if bucket is None:
+            bucket = self.buckets[(endpoint_key, chaos_effect)] = Bucket()
+        bucket.latencies.append(latency_ms)
+        if status is None:
+            bucket.errors += 1
+        else:
+            bucket.statuses[status] = bucket.statuses.get(status, 0) + 1
+            if status >= 400:
+                bucket.errors += 1
+
+    def summary(self) -> List[Dict[str, Any]]:
+        rows = []
+        for (endpoint_key, chaos_effect), bucket in sorted(self.buckets.items()):
+            latencies = sorted(bucket.latencies)
+            count = len(latencies)
+            rows.append({
+                "endpoint": endpoint_key,
+                "chaos_effect": chaos_effect,
+                "requests": count,
+                "error_rate": round(bucket.errors / count, 4) if count else 0.0,
+                "p50_ms": round(percentile(latencies, 0.50), 2),
+                "p90_ms": round(percentile(latencies, 0.90), 2),
+                "p99_ms": round(percentile(latencies, 0.99), 2),
+                "p999_ms": round(percentile(latencies, 0.999), 2),
+                "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+                "statuses": {str(code): n for code, n in sorted(bucket.statuses.items())},
+            })
+        return rows
+
+    def render(self) -> str:
+        rows = self.summary()
+        total = sum(row["requests"] for row in rows)
+        header = f"{'endpoint':<40} {'chaos':<20} {'reqs':>7} {'err%':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'p99.9':>9} {'max':>9}"
+        lines = [header, "-" * len(header)]
+        for row in rows:
+            lines.append(
+                f"{row['endpoint'][:40]:<40} {row['chaos_effect'][:20]:<20} {row['requests']:>7} "
+                f"{row['error_rate'] * 100:>6.2f}% {row['p50_ms']:>9.2f} {row['p90_ms']:>9.2f} "
+                f"{row['p99_ms']:>9.2f} {row['p999_ms']:>9.2f} {row['max_ms']:>9.2f}"
+            )
+        rate = total / self.elapsed if self.elapsed else 0.0
+        lines.append(f"\n{total} requests in {self.elapsed:.2f}s ({rate:.1f} req/s), {self.unsent} not sent (in-flight limit)")
+        lines.append("Latencies in ms, measured from each request's scheduled start time.")
+        lines.extend(f"Warning: {warning}" for warning in self.warnings)
+        return "\n".join(lines)
+
+
+class LoadGenerator:
+    def __init__(
+        self,
+        transport: Any,
+        templates: List[RequestTemplate],
+        chaos_ratio: float = 0.0,
+        max_in_flight: int = 10000,
+    ) -> None:
+        if not templates:
+            raise ValueError("No endpoints to drive")
+        self.transport = transport
+        self.templates = templates
+        self.chaos_templates = [t for t in templates if t.chaos_mode]
+        self.chaos_ratio = chaos_ratio
+        self.max_in_flight = max_in_flight
+        self.report = LoadReport()
+
+    def _next_request(self) -> PlannedRequest:
+        if self.chaos_templates and random.random() < self.chaos_ratio:
+            return random.choice(self.chaos_templates).build(chaos=True)
+        return random.choice(self.templates).build(chaos=False)
+
+    async def _fire(self, request: PlannedRequest, scheduled_at: float) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            response = await self.transport.send(request)
+            status, chaos_effect = response.status, response.headers.get("x-chaos-effect", "-")
+        except Exception:
+            status, chaos_effect = None, "-"
+        self.report.add(request.endpoint_key, chaos_effect, (loop.time() - scheduled_at) * 1000, status)
+
+    async def run_open_loop(self, rate: float, duration: float) -> LoadReport:
+        """Sends requests on a fixed schedule regardless of how fast responses come back.
+
+        Latency is measured from the time a request *should* have been sent, so a
+        stalled server shows up as queueing delay in every request scheduled behind
+        it instead of silently lowering the offered load (coordinated omission).
+        """
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / rate
+        total = int(rate * duration)
+        started = loop.time()
+        in_flight: set = set()
+        sent = 0
+        while sent < total:
+            now = loop.time()
+            # Fire everything that is due; sleeping once per request would cap the rate at timer resolution
+            while sent < total and started + sent * interval <= now:
+                scheduled_at = started + sent * interval
+                sent += 1
+                if len(in_flight) >= self.max_in_flight:
+                    self.report.unsent += 1
+                    continue
+                task = asyncio.create_task(self._fire(self._next_request(), scheduled_at))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            if sent < total:
+                await asyncio.sleep(max(0.0, started + sent * interval - loop.time()))
+        if in_flight:
+            await asyncio.wait(in_flight)
+        self.report.elapsed = loop.time() - started
+        return self.report
+
+    async def run_closed_loop(self, concurrency: int, duration: float) -> LoadReport:
+        """Keeps `concurrency` requests outstanding for `duration` seconds.
+
+        Useful to find peak throughput; latencies are subject to coordinated
+        omission, use the open-loop mode to measure them.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + duration
+
+        async def worker() -> None:
+            while loop.time() < deadline:
+                await self._fire(self._next_request(), loop.time())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        self.report.elapsed = loop.time() - started
+        return self.report
+
+
+async def load_templates(group_name: str) -> Tuple[List[RequestTemplate], List[str]]:
+    """The group's request templates and what the run leaves out.
+
+    Stream endpoints are skipped: an SSE response never ends, so a request
+    to one would never complete.
+    """
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Group).filter(func.lower(Group.name) == group_name.lower()))
+        group = result.scalar_one_or_none()
+        if not group:
+            raise ValueError(f"Group '{group_name}' not found")
+        result = await session.execute(
+            select(Endpoint)
+            .options(selectinload(Endpoint.headers), selectinload(Endpoint.url_parameters))
+            .where(Endpoint.group_id == group.id)
+        )
+        templates: List[RequestTemplate] = []
+        warnings: List[str] = []
+        for endpoint in result.scalars().all():
+            if endpoint.stream_type:
+                warnings.append(f"{endpoint.method} {endpoint.path}: {endpoint.stream_type} stream endpoint, not driven")
+                continue
+            template = RequestTemplate(endpoint, group.name)
+            templates.append(template)
+            warnings.extend(template.warnings)
+        return templates, warnings
+
+
+async def run_load_test(
+    group_name: str,
+    url: Optional[str] = None,
+    rate: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    duration: float = 10.0,
+    chaos_ratio: float = 0.0,
+    max_in_flight: int = 10000,
+) -> LoadReport:
+    """Drives the group's endpoints against `url`, or against the app in-process when no URL is given."""
+    templates, warnings = await load_templates(group_name)
+    if url:
+        transport = HTTPTransport(url)
+    else:
+        from app.main import app
+        transport = ASGITransport(app)
+    async with transport:
+        generator = LoadGenerator(transport, templates, chaos_ratio=chaos_ratio, max_in_flight=max_in_flight)
+        generator.report.warnings = warnings
+        if concurrency:
+            return await generator.run_closed_loop(concurrency, duration)
+        return await generator.run_open_loop(rate or 100.0, duration)
@@ -0,0 +1,242 @@
+"""Set-based and streaming endpoint maintenance behind `manage.py dedupe|list|export|update`.
+
+Nothing here loads a whole table into Python: duplicates are found as the
+endpoints stream past and removed with one DELETE, listings and exports are read through server-side cursors and written
+as they arrive, and bulk updates are a single UPDATE.
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, TextIO
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.endpoint import Endpoint
+from app.models.endpoint_hit import EndpointHit
+from app.models.group import Group
+from app.schemas.endpoint import STREAM_FIELDS, EndpointBase, EndpointBatchUpdate, check_stream
+from app.services.serving_plan import PLAN_FIELDS
+from app.utils.route_trie import normalize_path, route_shape
+
+# Rows fetched per round trip by the server-side cursors
+STREAM_BATCH_SIZE = 500
+# Routes are renamed through the API, which checks every change for collisions
+NOT_SETTABLE = {"id", "path", "method", "headers", "url_parameters"}
+SETTABLE_FIELDS = sorted(set(EndpointBatchUpdate.model_fields) - NOT_SETTABLE)
+DUPLICATE_COLUMNS = (Endpoint.id, Endpoint.group_id, Endpoint.path, Endpoint.method, Endpoint.name)
+
+
+class EndpointFilter:
+    """The endpoints a command applies to; every given criterion must match."""
+
+    def __init__(
+        self,
+        group: Optional[str] = None,
+        path: Optional[str] = None,
+        method: Optional[str] = None,
+        name: Optional[str] = None,
+        ids: Optional[List[UUID]] = None,
+    ) -> None:
+        self.group = group
+        self.path = path
+        self.method = method
+        self.name = name
+        self.ids = ids or []
+
+    @property
+    def empty(self) -> bool:
+        return not (self.group or self.path or self.method or self.name or self.ids)
+
+    def apply(self, query: Any) -> Any:
+        # Works for SELECT, UPDATE and DELETE alike; the group is matched by a subquery, not a join
+        if self.group:
+            group_ids = select(Group.id).where(func.lower(Group.name) == self.group.lower(), Group.deleted_at.is_(None))
+            query = query.where(Endpoint.group_id.in_(group_ids))
+        else:
+            live_groups = select(Group.id).where(Group.deleted_at.is_(None))
+            query = query.where(Endpoint.group_id.in_(live_groups))
+        if self.path:
+            query = query.where(Endpoint.path == normalize_path(self.path))
+        if self.method:
+            query = query.where(func.upper(Endpoint.method) == self.method.upper())
+        if self.name:
+            query = query.where(Endpoint.name == self.name)
+        if self.ids:
+            query = query.where(Endpoint.id.in_(self.ids))
+        return query
+
+
+async def duplicate_endpoints(session: AsyncSession) -> List[Any]:
+    """Every endpoint but the oldest one per group, method and route shape.
+
+    Shapes are what the API checks for collisions, so "orders/{id}" and
+    "orders/{order_id}" are duplicates. They are computed with route_shape as
+    the endpoints stream past, oldest first within each group; only the
+    duplicates are kept.
+    """
+    rows = await session.stream(
+        select(*DUPLICATE_COLUMNS, Endpoint.created_at)
+        .order_by(Endpoint.group_id, Endpoint.created_at, Endpoint.id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    duplicates = []
+    group_id = None
+    seen = set()
+    async for row in rows:
+        if row.group_id != group_id:
+            group_id = row.group_id
+            seen = set()
+        key = (row.method, route_shape(row.path))
+        if key in seen:
+            duplicates.append(row[:len(DUPLICATE_COLUMNS)])
+        else:
+            seen.add(key)
+    return duplicates
+
+
+async def dedupe_endpoints(session: AsyncSession, out: TextIO, dry_run: bool = False) -> int:
+    """Deletes duplicate endpoints in one statement; their headers and parameters go with them."""
+    duplicates = await duplicate_endpoints(session)
+    if dry_run or not duplicates:
+        for row in duplicates:
+            out.write("Would delete {3} '/{2}' in group {1}: endpoint {0} ({4})".format(*row) + "\n")
+        return len(duplicates)
+    result = await session.execute(
+        delete(Endpoint)
+        .where(Endpoint.id.in_([row[0] for row in duplicates]))
+        .returning(*DUPLICATE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    count = write_returned(result, out, "Deleted {3} '/{2}' in group {1}: endpoint {0} ({4})")
+    await session.commit()
+    return count
+
+
+async def write_stream(rows: Any, out: TextIO, line: str) -> int:
+    """Formats and writes each row of a streamed result as it is fetched."""
+    count = 0
+    async for row in rows:
+        count += 1
+        out.write(line.format(*row) + "\n")
+    return count
+
+
+def write_returned(result: Any, out: TextIO, line: str) -> int:
+    rows = result.all()
+    for row in rows:
+        out.write(line.format(*row) + "\n")
+    return len(rows)
+
+
+def hit_totals() -> Any:
+    return (
+        select(
+            EndpointHit.endpoint_id,
+            func.sum(EndpointHit.hits).label("hits"),
+            func.max(EndpointHit.last_hit_at).label("last_hit_at"),
+        )
+        .group_by(EndpointHit.endpoint_id)
+        .subquery()
+    )
+
+
+async def list_endpoints(session: AsyncSession, selection: EndpointFilter, out: TextIO) -> int:
+    """Prints one line per endpoint with its hit totals, as rows arrive."""
+    hits = hit_totals()
+    query = selection.apply(
+        select(Group.name, Endpoint.id, Endpoint.name, Endpoint.method, Endpoint.path, hits.c.hits, hits.c.last_hit_at)
+        .join(Group, Group.id == Endpoint.group_id)
+        .outerjoin(hits, hits.c.endpoint_id == Endpoint.id)
+        .order_by(func.lower(Group.name), Endpoint.path, Endpoint.method)
+    )
+    count = 0
+    rows = await session.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for group_name, endpoint_id, name, method, path, total, last_hit_at in rows:
+        count += 1
+        usage = f"hits={total}, last_hit={last_hit_at:%Y-%m-%d %H:%M:%S}" if total else "hits=0"
+        out.write(f"{group_name}\t{method}\t/{path}\t{name}\t{endpoint_id}\t{usage}\n")
+    return count
+
+
+async def export_endpoints(session: AsyncSession, selection: EndpointFilter, out: TextIO) -> int:
+    """Writes one JSON object per line: the group name and the endpoint as EndpointCreate takes it."""
+    query = selection.apply(
+        select(Endpoint, Group.name)
+        .join(Group, Group.id == Endpoint.group_id)
+        .options(selectinload(Endpoint.headers), selectinload(Endpoint.url_parameters))
+        .order_by(func.lower(Group.name), Endpoint.path, Endpoint.method)
+    )
+    count = 0
+    rows = await session.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for endpoint, group_name in rows:
+        count += 1
+        document = EndpointBase.model_validate(endpoint, from_attributes=True).model_dump(mode="json")
+        out.write(json.dumps({"group": group_name, **document}) + "\n")
+    return count
+
+
+def parse_assignments(assignments: List[str]) -> Dict[str, Any]:
+    """`field=value` pairs; non-text values are read as JSON when they parse."""
+    values: Dict[str, Any] = {}
+    for assignment in assignments:
+        field, sep, raw = assignment.partition("=")
+        if not sep:
+            raise ValueError(f"Expected field=value, got '{assignment}'")
+        if field not in SETTABLE_FIELDS:
+            raise ValueError(f"'{field}' cannot be set in bulk; settable fields: {', '.join(SETTABLE_FIELDS)}")
+        if EndpointBatchUpdate.model_fields[field].annotation == Optional[str]:
+            # Text fields such as response_body take the value verbatim, even when it is JSON
+            values[field] = raw
+            continue
+        try:
+            values[field] = json.loads(raw)
+        except ValueError:
+            values[field] = raw
+    # Same rules as the batch update API
+    checked = EndpointBatchUpdate.model_validate({"id": UUID(int=0), **values})
+    return checked.model_dump(include=set(values))
+
+
+async def update_endpoints(
+    session: AsyncSession,
+    selection: EndpointFilter,
+    values: Dict[str, Any],
+    out: TextIO,
+    dry_run: bool = False,
+) -> int:
+    """Sets the same fields on every selected endpoint with one UPDATE.
+
+    Raises ValueError when the values would break an endpoint's stream rules
+    (see check_stream), before anything is written.
+    """
+    columns = (Endpoint.id, Endpoint.method, Endpoint.path, Endpoint.name)
+    if not values.keys().isdisjoint(STREAM_FIELDS):
+        rows = await session.stream(
+            selection.apply(select(Endpoint.id, *(getattr(Endpoint, field) for field in STREAM_FIELDS)))
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        async for endpoint_id, *stored in rows:
+            try:
+                check_stream(None, {**dict(zip(STREAM_FIELDS, stored)), **values})
+            except ValueError as e:
+                raise ValueError(f"Endpoint {endpoint_id}: {e}")
+    if dry_run:
+        rows = await session.stream(
+            selection.apply(select(*columns)).execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        return await write_stream(rows, out, "Would update {1} '/{2}' ({3}) {0}")
+    # updated_at moves, so workers rebuild their compiled matchers and validators
+    if not values.keys().isdisjoint(PLAN_FIELDS):
+        # Each endpoint's plan depends on its other fields too; the mock path re-analyses cleared ones
+        values = {**values, "serving_plan": None}
+    result = await session.execute(
+        selection.apply(update(Endpoint))
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(*columns)
+        .execution_options(synchronize_session=False)
+    )
+    count = write_returned(result, out, "Updated {1} '/{2}' ({3}) {0}")
+    await session.commit()
+    return count
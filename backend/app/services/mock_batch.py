@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.schemas.mock_batch import MockBatch, MockSubRequest
+from app.services.admission import CHAOS, MOCK, Overloaded, admission_controller
+from app.services.embedded_store import embedded_store
+
+logger = logging.getLogger(__name__)
+
+# The mock handler: (request, group name, endpoint path, session) -> response
+Serve = Callable[[Request, str, str, Optional[AsyncSession]], Awaitable[Response]]
+# Response headers that describe the batch's transfer, not the sub-response
+HOP_HEADERS = ("content-length", "transfer-encoding")
+
+
+def build_request(parent: Request, group_name: str, item: MockSubRequest) -> Request:
+    """A request for one sub-request, as the mock routes would have received it."""
+    path = f"{settings.API_V1_STR}/{group_name}/{item.path.strip('/')}"
+    body = b"" if item.body is None else json.dumps(item.body).encode()
+    headers = {name.lower(): value for name, value in item.headers.items()}
+    if body:
+        headers.setdefault("content-type", "application/json")
+        headers["content-length"] = str(len(body))
+    scope = parent.scope
+    sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(
+        {
+            "type": "http",
+            "asgi": scope.get("asgi", {}),
+            "http_version": scope.get("http_version", "1.1"),
+            "method": item.method,
+            "scheme": scope.get("scheme", "http"),
+            "server": scope.get("server"),
+            "client": scope.get("client"),
+            "root_path": scope.get("root_path", ""),
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(item.query, doseq=True).encode(),
+            "headers": [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()],
+            "app": scope.get("app"),
+            "state": {},
+        },
+        receive,
+    )
+
+
+async def read_response(response: Response, limit: int) -> bytes:
+    if not isinstance(response, StreamingResponse):
+        return response.body
+    if response.media_type == "text/event-stream":
+        # Never ends; the generator has not started, so nothing is subscribed yet
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Streams cannot be batched; connect to the endpoint directly")
+    chunks: List[bytes] = []
+    size = 0
+    iterator = response.body_iterator
+    try:
+        async for chunk in iterator:
+            chunk = chunk if isinstance(chunk, bytes) else chunk.encode()
+            size += len(chunk)
+            if size > limit:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Response exceeds the batch limit of {limit} bytes; request it on its own",
+                )
+            chunks.append(chunk)
+    finally:
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+    return b"".join(chunks)
+
+
+def result(index: int, status_code: int, headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
+    content: Any = None
+    if body:
+        try:
+            content = json.loads(body) if headers.get("content-type", "").startswith("application/json") else body.decode("utf-8", "replace")
+        except ValueError:
+            content = body.decode("utf-8", "replace")
+    return {"index": index, "status": status_code, "headers": headers, "body": content}
+
+
+def error_result(index: int, exc: HTTPException) -> Dict[str, Any]:
+    headers = {name.lower(): value for name, value in (exc.headers or {}).items()}
+    headers["content-type"] = "application/json"
+    return {"index": index, "status": exc.status_code, "headers": headers, "body": {"detail": exc.detail}}
+
+
+async def invoke(parent: Request, group_name: str, index: int, item: MockSubRequest, serve: Serve) -> Dict[str, Any]:
+    """Runs one sub-request through the mock handler; every outcome, errors included, becomes a result."""
+    chaos = item.path.rstrip("/").endswith("/chaos")
+    endpoint_path = item.path.strip("/")
+    if chaos:
+        endpoint_path = endpoint_path[: -len("/chaos")]
+    request = build_request(parent, group_name, item)
+    if admission_controller.enabled:
+        # Admitted one by one, so a batch is shed like the requests it stands for
+        try:
+            request.state.admission = admission_controller.admit(CHAOS if chaos else MOCK)
+        except Overloaded as e:
+            return error_result(index, HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": str(admission_controller.retry_after)},
+            ))
+    try:
+        if embedded_store.enabled:
+            response = await serve(request, group_name, endpoint_path, None)
+            body = await read_response(response, settings.MOCK_BATCH_MAX_RESPONSE_BYTES)
+        else:
+            # A session per sub-request: one AsyncSession must not be used by concurrent tasks
+            async with AsyncSessionLocal() as db:
+                response = await serve(request, group_name, endpoint_path, db)
+                body = await read_response(response, settings.MOCK_BATCH_MAX_RESPONSE_BYTES)
+    except HTTPException as exc:
+        return error_result(index, exc)
+    except Exception:
+        logger.exception("Batch sub-request %d to %s %s failed", index, item.method, item.path)
+        return error_result(index, HTTPException(status_code=500, detail="Internal Server Error"))
+    finally:
+        ticket = getattr(request.state, "admission", None)
+        if ticket is not None:
+            ticket.release()
+    headers = {name: value for name, value in response.headers.items() if name not in HOP_HEADERS}
+    return result(index, response.status_code, headers, body)
+
+
+async def run_batch(parent: Request, group_name: str, batch: MockBatch, serve: Serve) -> AsyncIterator[Dict[str, Any]]:
+    """Yields the results in completion order, with at most `concurrency` sub-requests running."""
+    concurrency = min(batch.concurrency or settings.MOCK_BATCH_CONCURRENCY, settings.MOCK_BATCH_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(index: int, item: MockSubRequest) -> Dict[str, Any]:
+        async with semaphore:
+            return await invoke(parent, group_name, index, item, serve)
+
+    tasks = [asyncio.create_task(bounded(index, item)) for index, item in enumerate(batch.requests)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The client went away mid-stream; the rest would only be thrown away
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,135 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.endpoint import Endpoint
+from app.models.group import Group
+from app.utils.route_trie import RouteTrie
+from app.utils.response_template import ResponseTemplate
+from app.utils.rule_matcher import RequestMatcher
+
+
+class GroupRoutes:
+    """Compiled routing table of one group: one trie per HTTP method."""
+
+    def __init__(self, group: Group, endpoints: List[Tuple[UUID, str, str]]) -> None:
+        self.group_id = group.id
+        self.group_name = group.name
+        self.state_config = group.state_config if (group.state_config or {}).get("enabled") else None
+        self.built_at = time.monotonic()
+        self.tries: Dict[str, RouteTrie] = {}
+        for endpoint_id, path, method in endpoints:
+            self.tries.setdefault(method.upper(), RouteTrie()).insert(path, endpoint_id)
+
+    def match(self, method: str, path: str) -> Optional[Tuple[UUID, Dict[str, str]]]:
+        trie = self.tries.get(method.upper())
+        if trie is None:
+            return None
+        return trie.match(path)
+
+
+class RouteCache:
+    """Per-process cache of GroupRoutes keyed by lower-cased group name.
+
+    Writes made through this process invalidate the affected group right away;
+    the TTL bounds how long a change made by another worker can go unnoticed.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._groups: Dict[str, GroupRoutes] = {}
+
+    async def get_group(self, db: AsyncSession, group_name: str) -> Optional[GroupRoutes]:
+        key = group_name.lower()
+        routes = self._groups.get(key)
+        if routes is not None and time.monotonic() - routes.built_at < self.ttl_seconds:
+            return routes
+        routes = await self._build(db, key)
+        if routes is None:
+            self._groups.pop(key, None)
+        else:
+            self._groups[key] = routes
+        return routes
+
+    async def warm(self, db: AsyncSession) -> int:
+        """Builds the tables of every group in two queries; returns how many were built."""
+        groups = (await db.execute(select(Group).where(Group.deleted_at.is_(None)))).scalars().all()
+        result = await db.execute(select(Endpoint.group_id, Endpoint.id, Endpoint.path, Endpoint.method))
+        endpoints: Dict[Any, List[Tuple[UUID, str, str]]] = {}
+        for group_id, endpoint_id, path, method in result.all():
+            endpoints.setdefault(group_id, []).append((endpoint_id, path, method))
+        for group in groups:
+            self._groups[group.name.lower()] = GroupRoutes(group, endpoints.get(group.id, []))
+        return len(groups)
+
+    async def _build(self, db: AsyncSession, key: str) -> Optional[GroupRoutes]:
+        result = await db.execute(
+            select(Group).filter(func.lower(Group.name) == key, Group.deleted_at.is_(None))
+        )
+        group = result.scalar_one_or_none()
+        if not group:
+            return None
+        result = await db.execute(
+            select(Endpoint.id, Endpoint.path, Endpoint.method).where(Endpoint.group_id == group.id)
+        )
+        return GroupRoutes(group, [tuple(row) for row in result.all()])
+
+    def invalidate(self, group_id: Optional[UUID] = None) -> None:
+        """Drops the cached table of one group, or of every group when no id is given."""
+        if group_id is None:
+            self._groups.clear()
+            return
+        for key, routes in list(self._groups.items()):
+            if str(routes.group_id) == str(group_id):
+                del self._groups[key]
+
+
+class CompiledCache:
+    """Per-endpoint compiled artifacts (matchers, validators), built on first use.
+
+    An entry is rebuilt when the endpoint's updated_at moves, which the
+    repository bumps on every write, including rule-only changes.
+    """
+
+    def __init__(self, build: Callable[[Endpoint], Any]) -> None:
+        self.build = build
+        self._entries: Dict[Any, Tuple[Any, Any]] = {}
+
+    def get(self, endpoint: Endpoint) -> Any:
+        cached = self._entries.get(endpoint.id)
+        if cached is not None and cached[0] == endpoint.updated_at:
+            return cached[1]
+        compiled = self.build(endpoint)
+        self._entries[endpoint.id] = (endpoint.updated_at, compiled)
+        return compiled
+
+    def discard(self, endpoint_id: Any) -> None:
+        self._entries.pop(endpoint_id, None)
+
+
+def build_matcher(endpoint: Endpoint) -> RequestMatcher:
+    return RequestMatcher(endpoint.headers or [], endpoint.url_parameters or [])
+
+
+def build_template(endpoint: Endpoint) -> ResponseTemplate:
+    return ResponseTemplate(endpoint.response_body, endpoint.response_schema)
+
+
+def build_body_validator(endpoint: Endpoint) -> Any:
+    """Schema-checked once per endpoint version; `jsonschema.validate` re-checks it on every call."""
+    from jsonschema.validators import validator_for
+
+    schema = endpoint.request_body_schema
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+route_cache = RouteCache(ttl_seconds=settings.MOCK_ROUTE_CACHE_TTL_SECONDS)
+matcher_cache = CompiledCache(build_matcher)
+validator_cache = CompiledCache(build_body_validator)
+template_cache = CompiledCache(build_template)
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import WebSocket
+from fastapi.responses import StreamingResponse
+
+from app.models.endpoint import Endpoint
+from app.schemas.endpoint import StreamConfig
+from app.services.schema_generation import schema_generator
+from app.services.serving_plan import plan_cache
+
+logger = logging.getLogger(__name__)
+
+# A subscriber this many messages behind skips ahead to the newest one instead of
+# pinning every message in between in memory
+MAX_LAG_MESSAGES = 1000
+
+
+class Tick:
+    """One broadcast: the frames of this tick and the future the next tick resolves."""
+
+    __slots__ = ("seq", "frames", "next")
+
+    def __init__(self, seq: int, frames: List[Any], next: asyncio.Future) -> None:
+        self.seq = seq
+        self.frames = frames
+        self.next = next
+
+
+def render_frame(kind: str, seq: int, text: str) -> Any:
+    if kind == "sse":
+        return f"id: {seq}\nevent: message\ndata: {text}\n\n".encode()
+    return text
+
+
+def malformed_frame(kind: str, frame: Any) -> Any:
+    # Cut the JSON in half: still a frame, no longer a document
+    if kind == "sse":
+        data = frame.split(b"data: ", 1)[1]
+        return b"data: " + data[: max(1, len(data) // 2)] + b"\n\n"
+    return frame[: max(1, len(frame) // 2)]
+
+
+class StreamChannel:
+    """Messages of one stream endpoint, generated once per tick and shared by every subscriber.
+
+    A single task sleeps from tick to tick (rate, jitter, bursts), renders the
+    tick's messages, encodes them once and resolves the future all subscribers
+    are awaiting; the result carries the next future, so subscribers walk a
+    chain of ticks. The task only runs while someone is subscribed.
+    """
+
+    def __init__(self, key: Tuple[Any, ...], endpoint: Endpoint, path_params: Dict[str, str]) -> None:
+        self.key = key
+        self.endpoint = endpoint
+        self.path_params = path_params
+        self.kind = endpoint.stream_type
+        self.config = StreamConfig.model_validate(endpoint.stream_config or {})
+        self.subscribers = 0
+        self.seq = 0
+        self.head: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def render(self) -> str:
+        endpoint = self.endpoint
+        plan = plan_cache.get(endpoint)
+        if plan.schema:
+            content = await schema_generator.render(plan.schema, self.path_params, plan.offload)
+            return json.dumps(content)
+        if endpoint.response_body:
+            return endpoint.response_body
+        return json.dumps({"seq": self.seq})
+
+    async def _run(self) -> None:
+        config = self.config
+        interval = 1.0 / config.rate
+        burst = config.burst
+        next_burst = time.monotonic() + burst.every_seconds if burst else None
+        while True:
+            await asyncio.sleep(interval * (1 + config.jitter * (2 * random.random() - 1)))
+            count = 1
+            if next_burst is not None and time.monotonic() >= next_burst:
+                count += burst.size
+                next_burst += burst.every_seconds
+            try:
+                texts = [await self.render() for _ in range(count)]
+            except Exception:
+                # A broken schema must not kill the tick; subscribers just see a gap
+                logger.exception("Failed to render stream message for endpoint %s", self.endpoint.id)
+                continue
+            frames = []
+            for text in texts:
+                self.seq += 1
+                frames.append(render_frame(self.kind, self.seq, text))
+            head, self.head = self.head, asyncio.get_running_loop().create_future()
+            head.set_result(Tick(self.seq, frames, self.head))
+
+
+class Subscription:
+    """One subscriber's walk along a channel's ticks, with the /chaos effects applied per message."""
+
+    def __init__(self, channel: StreamChannel, chaos: bool) -> None:
+        self.channel = channel
+        self.chaos = channel.config.chaos if chaos else None
+        self.link = channel.head
+
+    async def frames(self) -> AsyncIterator[Any]:
+        channel = self.channel
+        chaos = self.chaos
+        while True:
+            tick: Tick = await self.link
+            if channel.seq - tick.seq > MAX_LAG_MESSAGES:
+                self.link = channel.head
+                continue
+            self.link = tick.next
+            for frame in tick.frames:
+                if chaos is None:
+                    yield frame
+                    continue
+                roll = random.random()
+                if roll < chaos.disconnect_rate:
+                    return
+                roll -= chaos.disconnect_rate
+                if roll < chaos.stall_rate:
+                    await asyncio.sleep(chaos.stall_seconds)
+                    # Resume with what is sent next, as a real feed would after a hiccup
+                    self.link = channel.head
+                    break
+                roll -= chaos.stall_rate
+                if roll < chaos.malformed_rate:
+                    yield malformed_frame(channel.kind, frame)
+                else:
+                    yield frame
+
+
+class StreamHub:
+    """Per-worker registry of stream channels, keyed by endpoint version and path parameters."""
+
+    def __init__(self) -> None:
+        self.channels: Dict[Tuple[Any, ...], StreamChannel] = {}
+        self.connected = 0
+
+    def subscribe(self, endpoint: Endpoint, path_params: Dict[str, str], chaos: bool) -> Subscription:
+        key = (endpoint.id, endpoint.updated_at, tuple(sorted(path_params.items())))
+        channel = self.channels.get(key)
+        if channel is None:
+            channel = self.channels[key] = StreamChannel(key, endpoint, path_params)
+        channel.subscribers += 1
+        self.connected += 1
+        channel.start()
+        return Subscription(channel, chaos)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        channel = subscription.channel
+        channel.subscribers -= 1
+        self.connected -= 1
+        if channel.subscribers == 0:
+            channel.stop()
+            self.channels.pop(channel.key, None)
+
+    def sse(self, endpoint: Endpoint, path_params: Dict[str, str], chaos: bool) -> StreamingResponse:
+        async def body() -> AsyncIterator[bytes]:
+            # Subscribed once the body is sent, so a response that never starts holds nothing
+            subscription = self.subscribe(endpoint, path_params, chaos)
+            try:
+                async for frame in subscription.frames():
+                    yield frame
+            finally:
+                self.unsubscribe(subscription)
+
+        return StreamingResponse(
+            body(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def websocket(self, websocket: WebSocket, endpoint: Endpoint, path_params: Dict[str, str], chaos: bool) -> None:
+        await websocket.accept()
+        subscription = self.subscribe(endpoint, path_params, chaos)
+        try:
+            async for frame in subscription.frames():
+                await websocket.send_text(frame)
+            # Only chaos ends a stream from this side
+            await websocket.close(code=1011, reason="Chaos Mode: disconnect")
+        except Exception:
+            # The client went away; sends on a closed socket raise, whatever the server
+            pass
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "channels": len(self.channels),
+            "subscribers": self.connected,
+        }
+
+
+stream_hub = StreamHub()
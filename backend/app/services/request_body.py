@@ -0,0 +1,153 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from starlette.requests import ClientDisconnect
+
+from app.utils.json_stream import ArrayItemSplitter, JSONStreamError
+
+# Array keywords that need the whole array at once; such schemas are validated buffered
+WHOLE_ARRAY_KEYWORDS = ("uniqueItems", "contains", "prefixItems", "additionalItems", "unevaluatedItems")
+
+
+def too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body exceeds the limit of {limit} bytes for this endpoint",
+    )
+
+
+def check_declared_length(request: Request, limit: int) -> None:
+    """Rejects before reading anything when Content-Length already exceeds the limit."""
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise too_large(limit)
+
+
+def record_digest(request: Request, hasher: Any, size: int) -> None:
+    # Traffic capture reads these instead of the (already consumed) body.
+    # A rejected body is recorded with the bytes read so far and no digest.
+    request.state.body_sha256 = hasher.hexdigest() if hasher is not None and size else None
+    request.state.body_size = size
+
+
+async def read_body(request: Request, limit: int) -> bytes:
+    """Reads the whole body, failing with 413 as soon as it grows past `limit` bytes."""
+    hasher = hashlib.sha256()
+    size = 0
+    chunks = []
+    try:
+        check_declared_length(request, limit)
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > limit:
+                raise too_large(limit)
+            hasher.update(chunk)
+            chunks.append(chunk)
+    except (HTTPException, ClientDisconnect):
+        record_digest(request, None, size)
+        raise
+    record_digest(request, hasher, size)
+    return b"".join(chunks)
+
+
+async def read_json_body(request: Request, limit: int) -> Any:
+    body = await read_body(request, limit)
+    try:
+        return json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid JSON received in request body: {e}",
+        )
+
+
+def supports_streaming(schema: Dict[str, Any]) -> bool:
+    """True when the schema is an array whose elements can be checked one at a time."""
+    if not isinstance(schema, dict) or schema.get("type") != "array":
+        return False
+    if not isinstance(schema.get("items"), dict):
+        return False
+    return not any(keyword in schema for keyword in WHOLE_ARRAY_KEYWORDS)
+
+
+async def validate_array_stream(request: Request, limit: int, validator: Any) -> int:
+    """Validates a JSON array body element by element while it is being received.
+
+    Each element is parsed and checked against `schema["items"]` as soon as its
+    closing byte arrives and is then dropped, so a bad element fails the request
+    without waiting for (or holding) the rest of the document. Returns the number
+    of elements. `validator` is the compiled validator of the whole array schema.
+    """
+    schema = validator.schema
+    item_validator = validator.evolve(schema=schema["items"])
+    max_items: Optional[int] = schema.get("maxItems")
+    min_items: int = schema.get("minItems", 0)
+    splitter = ArrayItemSplitter()
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        check_declared_length(request, limit)
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > limit:
+                raise too_large(limit)
+            hasher.update(chunk)
+            for raw in splitter.feed(chunk):
+                index = splitter.count - 1
+                if max_items is not None and splitter.count > max_items:
+                    raise invalid_body(f"array has more than {max_items} items")
+                try:
+                    item = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    raise invalid_body(f"invalid JSON in item {index}: {e}")
+                error = next(item_validator.iter_errors(item), None)
+                if error is not None:
+                    raise invalid_body(f"{error.message} on path '{[index] + list(error.path)}'")
+        splitter.close()
+        if splitter.count < min_items:
+            raise invalid_body(f"array has fewer than {min_items} items")
+    except (HTTPException, ClientDisconnect):
+        record_digest(request, None, size)
+        raise
+    except JSONStreamError as e:
+        record_digest(request, None, size)
+        raise invalid_body(str(e))
+    record_digest(request, hasher, size)
+    return splitter.count
+
+
+def first_error(validator: Any, instance: Any) -> Optional[Any]:
+    """The error `jsonschema.validate` would raise, without re-checking the schema."""
+    from jsonschema.exceptions import best_match
+
+    return best_match(validator.iter_errors(instance))
+
+
+def invalid_body(message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Request body validation failed: {message}",
+    )
+
+
+async def body_digest(request: Request) -> Tuple[Optional[str], int]:
+    """SHA-256 and size of the request body for traffic capture.
+
+    Uses the digest recorded while the handler read the body; otherwise hashes the
+    stream chunk by chunk without buffering it.
+    """
+    if hasattr(request.state, "body_size"):
+        return request.state.body_sha256, request.state.body_size
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            hasher.update(chunk)
+    except (RuntimeError, ClientDisconnect):
+        # Stream already consumed by request.json() or the client went away
+        body = getattr(request, "_body", b"")
+        return (hashlib.sha256(body).hexdigest() if body else None), len(body)
+    return (hasher.hexdigest() if size else None), size
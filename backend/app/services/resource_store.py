@@ -0,0 +1,329 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from app.core.config import settings
+from app.utils.route_trie import PARAM_SEGMENT, split_path
+
+logger = logging.getLogger(__name__)
+
+# Query parameters used for paging, never treated as filters
+PAGING_PARAMS = ("limit", "offset")
+DEFAULT_PAGE_SIZE = 50
+
+
+def index_key(value: Any) -> str:
+    """Normalizes a field value so it compares equal to its query-string spelling."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return str(value)
+
+
+class Collection:
+    """In-memory collection of JSON objects keyed by their id field.
+
+    Items keep their insertion order for listings, while a separate recency list
+    drives LRU eviction once `max_items` is exceeded. Indexed fields map each
+    normalized value to the set of ids holding it, so equality filters on them
+    do not scan the collection.
+    """
+
+    def __init__(self, id_field: str, indexes: List[str], max_items: int) -> None:
+        self.id_field = id_field
+        self.max_items = max_items
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.recency: "OrderedDict[str, None]" = OrderedDict()
+        self.sequence: Dict[str, int] = {}
+        self.indexes: Dict[str, Dict[str, Set[str]]] = {field: {} for field in indexes}
+        self.evicted = 0
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        item = self.items.get(item_id)
+        if item is not None:
+            self.recency.move_to_end(item_id)
+        return item
+
+    def put(self, item_id: str, item: Dict[str, Any]) -> None:
+        previous = self.items.get(item_id)
+        if previous is not None:
+            self._unindex(item_id, previous)
+        else:
+            self.sequence[item_id] = next(self._counter)
+        self.items[item_id] = item
+        self.recency[item_id] = None
+        self.recency.move_to_end(item_id)
+        self._index(item_id, item)
+        while len(self.items) > self.max_items:
+            oldest, _ = self.recency.popitem(last=False)
+            self._remove(oldest)
+            self.evicted += 1
+
+    def delete(self, item_id: str) -> Optional[Dict[str, Any]]:
+        if item_id not in self.items:
+            return None
+        self.recency.pop(item_id, None)
+        return self._remove(item_id)
+
+    def list(self, filters: Dict[str, str], limit: int, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        if not filters:
+            page = list(itertools.islice(self.items.values(), offset, offset + limit))
+            return page, len(self.items)
+
+        indexed = [field for field in filters if field in self.indexes]
+        if indexed:
+            candidate_sets = sorted(
+                (self.indexes[field].get(filters[field], set()) for field in indexed), key=len
+            )
+            ids = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+            ids = sorted(ids, key=self.sequence.__getitem__)
+        else:
+            ids = self.items.keys()
+
+        scanned = {field: value for field, value in filters.items() if field not in self.indexes}
+        matches = [
+            item
+            for item in (self.items[item_id] for item_id in ids)
+            if all(index_key(item.get(field)) == value for field, value in scanned.items())
+        ]
+        return matches[offset:offset + limit], len(matches)
+
+    def _index(self, item_id: str, item: Dict[str, Any]) -> None:
+        for field, values in self.indexes.items():
+            if field in item:
+                values.setdefault(index_key(item[field]), set()).add(item_id)
+
+    def _unindex(self, item_id: str, item: Dict[str, Any]) -> None:
+        for field, values in self.indexes.items():
+            if field in item:
+                key = index_key(item[field])
+                ids = values.get(key)
+                if ids is not None:
+                    ids.discard(item_id)
+                    if not ids:
+                        del values[key]
+
+    def _remove(self, item_id: str) -> Dict[str, Any]:
+        item = self.items.pop(item_id)
+        self.sequence.pop(item_id, None)
+        self._unindex(item_id, item)
+        return item
+
+
+class ResourceStore:
+    """Per-process store behind stateful mock groups.
+
+    Collections are created on first use from the group's `state_config`. Each
+    worker process has its own store, so stateful groups are meant for a single
+    worker or for clients that tolerate per-worker state. Groups with snapshots
+    enabled are written to disk periodically and re-loaded on first access.
+    """
+
+    def __init__(self, snapshot_dir: str, snapshot_interval: float) -> None:
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_interval = snapshot_interval
+        self.groups: Dict[str, Dict[str, Collection]] = {}
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def collection(self, group_id: Any, name: str, config: Dict[str, Any]) -> Collection:
+        group_key = str(group_id)
+        collections = self.groups.get(group_key)
+        if collections is None:
+            collections = self.groups[group_key] = {}
+            self._configs[group_key] = config
+            if config.get("snapshot"):
+                self._load_snapshot(group_key, config)
+        collection = collections.get(name)
+        if collection is None:
+            collection = collections[name] = self._new_collection(config)
+        return collection
+
+    def drop_group(self, group_id: Any) -> None:
+        group_key = str(group_id)
+        self.groups.pop(group_key, None)
+        self._configs.pop(group_key, None)
+        self._dirty.discard(group_key)
+
+    def mark_dirty(self, group_id: Any) -> None:
+        self._dirty.add(str(group_id))
+
+    def _new_collection(self, config: Dict[str, Any]) -> Collection:
+        return Collection(
+            id_field=config.get("id_field") or "id",
+            indexes=list(config.get("indexes") or []),
+            max_items=config.get("max_items") or settings.STATE_DEFAULT_MAX_ITEMS,
+        )
+
+    def _snapshot_path(self, group_key: str) -> str:
+        return os.path.join(self.snapshot_dir, f"{group_key}.json")
+
+    def _load_snapshot(self, group_key: str, config: Dict[str, Any]) -> None:
+        path = self._snapshot_path(group_key)
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            logger.exception("Ignoring unreadable state snapshot %s", path)
+            return
+        for name, items in data.items():
+            collection = self.groups[group_key][name] = self._new_collection(config)
+            for item_id, item in items:
+                collection.put(item_id, item)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.snapshot()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            await self.snapshot()
+
+    async def snapshot(self) -> None:
+        """Writes the dirty groups that have snapshots enabled."""
+        dirty, self._dirty = self._dirty, set()
+        for group_key in dirty:
+            if not self._configs.get(group_key, {}).get("snapshot"):
+                continue
+            # Serialize on the loop so no request mutates the collections mid-dump
+            payload = json.dumps({
+                name: list(collection.items.items())
+                for name, collection in self.groups.get(group_key, {}).items()
+            })
+            try:
+                await asyncio.to_thread(self._write, self._snapshot_path(group_key), payload)
+            except OSError:
+                self._dirty.add(group_key)
+                logger.exception("Failed to write state snapshot for group %s", group_key)
+
+    @staticmethod
+    def _write(path: str, payload: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            group_key: {name: len(collection) for name, collection in collections.items()}
+            for group_key, collections in self.groups.items()
+        }
+
+
+def resolve_collection(path_template: str, path_params: Dict[str, str]) -> Tuple[str, Optional[str]]:
+    """Maps an endpoint path to (collection name, item id).
+
+    A trailing parameter is the item id ("orders/{id}" -> ("orders", "42")), any
+    other parameter scopes the collection ("users/{uid}/orders" -> "users/7/orders").
+    """
+    segments = split_path(path_template)
+    item_id = None
+    if segments:
+        last = PARAM_SEGMENT.match(segments[-1])
+        if last:
+            item_id = path_params.get(last.group(1))
+            segments = segments[:-1]
+    parts = []
+    for segment in segments:
+        match = PARAM_SEGMENT.match(segment)
+        parts.append(path_params.get(match.group(1), "") if match else segment)
+    return "/".join(parts), item_id
+
+
+def apply_operation(
+    collection: Collection,
+    method: str,
+    item_id: Optional[str],
+    body: Any,
+    query: Dict[str, str],
+    rule_params: Optional[Set[str]] = None,
+) -> Tuple[int, Any]:
+    """Applies one CRUD request to a collection and returns (status_code, content).
+
+    A 2xx status means "use the endpoint's configured status code". Listings
+    filter on every query parameter except `limit`, `offset` and the
+    endpoint's URL parameter rules (`rule_params`, e.g. a required api_key).
+    A body whose id differs from the one in the path is rejected with 400.
+    """
+    if method == "GET":
+        if item_id is not None:
+            item = collection.get(item_id)
+            return (200, item) if item is not None else (404, {"detail": f"Item '{item_id}' not found"})
+        try:
+            limit = int(query.get("limit", DEFAULT_PAGE_SIZE))
+            offset = int(query.get("offset", 0))
+        except ValueError:
+            return 400, {"detail": "limit and offset must be integers"}
+        filters = {key: value for key, value in query.items() if key not in PAGING_PARAMS and key not in (rule_params or ())}
+        items, total = collection.list(filters, max(0, limit), max(0, offset))
+        return 200, {"items": items, "total": total, "limit": limit, "offset": offset}
+
+    if method == "DELETE":
+        if item_id is None:
+            return 400, {"detail": "DELETE needs an item id in the path"}
+        item = collection.delete(item_id)
+        return (200, item) if item is not None else (404, {"detail": f"Item '{item_id}' not found"})
+
+    if not isinstance(body, dict):
+        return 400, {"detail": "Stateful endpoints expect a JSON object body"}
+
+    id_field = collection.id_field
+    body_id = body.get(id_field)
+    if item_id is None and body_id is not None:
+        item_id = str(body_id)
+    # An item is stored under its id; a body naming another one would be listed under the wrong key
+    if body_id is not None and str(body_id) != item_id:
+        return 400, {"detail": f"The body's '{id_field}' does not match the item id '{item_id}' in the path"}
+
+    if method == "POST":
+        if item_id is None:
+            item_id = str(uuid4())
+        elif item_id in collection.items:
+            return 409, {"detail": f"Item '{item_id}' already exists"}
+        item = {**body, id_field: item_id if body_id is None else body_id}
+    elif method == "PUT":
+        if item_id is None:
+            return 400, {"detail": f"PUT needs an item id in the path or the '{id_field}' field"}
+        item = {**body, id_field: item_id if body_id is None else body_id}
+    else:  # PATCH
+        if item_id is None:
+            return 400, {"detail": f"PATCH needs an item id in the path or the '{id_field}' field"}
+        existing = collection.get(item_id)
+        if existing is None:
+            return 404, {"detail": f"Item '{item_id}' not found"}
+        item = {**existing, **body, id_field: existing.get(id_field, item_id)}
+    collection.put(item_id, item)
+    return 200, item
+
+
+resource_store = ResourceStore(
+    snapshot_dir=settings.STATE_SNAPSHOT_DIR,
+    snapshot_interval=settings.STATE_SNAPSHOT_INTERVAL_SECONDS,
+)
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Set
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.services.faker_pools import faker_pools
+from app.utils.json_schema import apply_path_params, generate_data_from_schema, post_process_data
+
+logger = logging.getLogger(__name__)
+
+# jsf's defaults when an array does not bound its size
+DEFAULT_MAX_ITEMS = 5
+MAX_REF_DEPTH = 10
+
+
+def estimate_cost(schema: Any, root: Optional[Dict[str, Any]] = None, seen: Optional[Set[str]] = None, depth: int = 0) -> int:
+    """Rough upper bound of the number of values jsf generates for a schema.
+
+    Arrays multiply their item cost by maxItems (or $fixed), objects add up their
+    properties, unions take their most expensive branch. Only relative size
+    matters: it decides whether generation can stay on the event loop.
+    """
+    if not isinstance(schema, dict) or depth > MAX_REF_DEPTH:
+        return 1
+    root = schema if root is None else root
+    seen = seen or set()
+
+    ref = schema.get("$ref")
+    if isinstance(ref, str) and ref.startswith("#/"):
+        if ref in seen:
+            return 1
+        target: Any = root
+        for part in ref[2:].split("/"):
+            target = target.get(part, {}) if isinstance(target, dict) else {}
+        return estimate_cost(target, root, seen | {ref}, depth + 1)
+
+    for keyword in ("anyOf", "oneOf"):
+        if isinstance(schema.get(keyword), list) and schema[keyword]:
+            return 1 + max(estimate_cost(option, root, seen, depth + 1) for option in schema[keyword])
+    cost = 1
+    if isinstance(schema.get("allOf"), list):
+        cost += sum(estimate_cost(part, root, seen, depth + 1) for part in schema["allOf"])
+
+    properties = schema.get("properties")
+    if isinstance(properties, dict):
+        cost += sum(estimate_cost(value, root, seen, depth + 1) for value in properties.values())
+
+    items = schema.get("items")
+    if isinstance(items, (dict, list)):
+        fixed = schema.get("$fixed")
+        count = fixed if isinstance(fixed, int) else schema.get("maxItems", DEFAULT_MAX_ITEMS)
+        item_schemas = items if isinstance(items, list) else [items]
+        cost += max(0, int(count)) * max(estimate_cost(item, root, seen, depth + 1) for item in item_schemas)
+    return cost
+
+
+def render_response(schema: Dict[str, Any], path_params: Dict[str, str], faker: Any = None) -> Any:
+    """Generated body for a response schema: jsf output, post-processed, with path params echoed."""
+    content = generate_data_from_schema(schema, faker=faker)
+    content = post_process_data(content, schema, precision=2)
+    return apply_path_params(content, schema, path_params)
+
+
+class CPUBudgetExceeded(BaseException):
+    # BaseException, so generate_data_from_schema's catch-all does not swallow it
+    pass
+
+
+def _on_cpu_budget(signum: int, frame: Any) -> None:
+    raise CPUBudgetExceeded()
+
+
+def _init_worker() -> None:
+    signal.signal(signal.SIGPROF, _on_cpu_budget)
+    # Workers have no refresh task, so build full pools on first use
+    faker_pools.initial_size = faker_pools.pool_size
+
+
+def _render_in_worker(schema: Dict[str, Any], path_params: Dict[str, str], cpu_budget: float) -> Any:
+    # ITIMER_PROF counts this process's CPU time, so it bounds the work itself, not time spent queued
+    signal.setitimer(signal.ITIMER_PROF, cpu_budget)
+    try:
+        return render_response(schema, path_params, faker=faker_pools.proxy())
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+
+
+def _warm_worker() -> None:
+    render_response({"type": "object", "properties": {"id": {"type": "integer"}}}, {})
+
+
+class SchemaGenerator:
+    """Runs response generation inline or in a process pool, as the serving plan decided.
+
+    Small schemas stay on the event loop, where a process hop would cost more
+    than the work. Schemas whose serving plan says to offload (estimated cost
+    at or above `threshold` when the endpoint was saved) are rendered in a worker process
+    under a CPU budget (enforced in the worker with a profiling timer) and a
+    wall-clock budget (enforced here), so one heavy endpoint cannot stall the
+    loop for every other request.
+    """
+
+    def __init__(self, threshold: int, workers: int, cpu_budget: float, time_budget: float) -> None:
+        self.threshold = threshold
+        self.workers = workers
+        self.cpu_budget = cpu_budget
+        self.time_budget = time_budget
+        self.inline = 0
+        self.offloaded = 0
+        self.over_budget = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._warming: Optional[asyncio.Future] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0 and self.threshold > 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the serving process has an event loop and threads that must not be cloned
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    async def render(self, schema: Dict[str, Any], path_params: Dict[str, str], offload: bool) -> Any:
+        if not (offload and self.enabled):
+            self.inline += 1
+            return render_response(schema, path_params, faker=faker_pools.proxy())
+
+        self.offloaded += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._pool(), _render_in_worker, schema, path_params, self.cpu_budget)
+            return await asyncio.wait_for(future, timeout=self.time_budget)
+        except CPUBudgetExceeded:
+            self.over_budget += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Response generation exceeded its CPU budget of {self.cpu_budget}s; reduce the schema's size (e.g. maxItems)",
+            )
+        except asyncio.TimeoutError:
+            # The worker keeps going until its CPU timer fires, then takes the next job
+            self.over_budget += 1
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Response generation did not finish within {self.time_budget}s",
+            )
+        except BrokenProcessPool:
+            logger.exception("Schema generation pool broke, starting a new one")
+            self._executor = None
+            raise HTTPException(status_code=500, detail="Schema generation worker crashed")
+
+    async def start(self) -> None:
+        """Spawns and warms the workers in the background, so the first heavy request doesn't pay for it."""
+        if self.enabled and self._warming is None:
+            loop = asyncio.get_running_loop()
+            pool = self._pool()
+            self._warming = asyncio.gather(
+                *(loop.run_in_executor(pool, _warm_worker) for _ in range(self.workers)),
+                return_exceptions=True,
+            )
+
+    async def stop(self) -> None:
+        if self._warming is not None:
+            self._warming.cancel()
+            self._warming = None
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "threshold": self.threshold,
+            "workers": self.workers,
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "over_budget": self.over_budget,
+        }
+
+
+schema_generator = SchemaGenerator(
+    threshold=settings.GENERATION_OFFLOAD_THRESHOLD,
+    workers=settings.GENERATION_POOL_WORKERS,
+    cpu_budget=settings.GENERATION_CPU_BUDGET_SECONDS,
+    time_budget=settings.GENERATION_TIME_BUDGET_SECONDS,
+)
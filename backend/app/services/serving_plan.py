@@ -0,0 +1,185 @@
+"""How an endpoint's response is produced, decided when the endpoint is saved.
+
+EndpointRepository analyses the response fields on every write and stores
+the result with the endpoint (`serving_plan`): what kind of output it is,
+what generating it costs, how large it gets and which schema keywords the
+generator will ignore. The mock path compiles the stored plan once per
+endpoint version and dispatches on it instead of re-inspecting the fields
+on every request.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from app.models.endpoint import Endpoint
+from app.services.mock_routes import CompiledCache
+from app.services.schema_generation import estimate_cost, render_response, schema_generator
+from app.utils.response_template import ResponseTemplate, TemplateError
+
+logger = logging.getLogger(__name__)
+
+# The fields a plan is derived from; a write that sets none of them keeps the stored plan
+PLAN_FIELDS = ("response_schema", "response_body", "response_size_bytes", "stream_type", "fixture_dataset")
+
+# Plan kinds
+STREAM = "stream"          # SSE or WebSocket messages, see mock_streams
+FIXTURE = "fixture"        # records of a fixture dataset, see fixtures
+GENERATED = "generated"    # rendered from response_schema on every request
+TEMPLATE = "template"      # response_body with placeholders, rendered per request
+CONSTANT = "constant"      # response_body as is, encoded once
+EMPTY = "empty"            # neither schema nor body: `{}`
+INVALID = "invalid"        # a stored schema that cannot be served
+
+# Keywords jsf does not implement: their constraints are silently not applied
+UNSUPPORTED_KEYWORDS = (
+    "not", "if", "then", "else", "patternProperties", "propertyNames", "dependencies",
+    "dependentSchemas", "dependentRequired", "contains", "minContains", "maxContains",
+    "unevaluatedProperties", "unevaluatedItems", "$dynamicRef",
+)
+# Keywords whose value is a subschema, a list of them, or a map of them
+SUBSCHEMA = ("items", "additionalProperties", "additionalItems")
+SUBSCHEMA_LISTS = ("anyOf", "oneOf", "allOf", "prefixItems", "items")
+SUBSCHEMA_MAPS = ("properties", "definitions", "$defs")
+# Schemas up to this estimated cost are rendered once at save time to measure their output
+SAMPLE_COST_LIMIT = 200
+# Bytes per generated value, for schemas too expensive to sample
+BYTES_PER_VALUE = 16
+JSON_SEPARATORS = (",", ":")
+
+
+def unsupported_keywords(schema: Any) -> List[str]:
+    """Warnings for every keyword the generator ignores, with its JSON pointer."""
+    warnings: List[str] = []
+
+    def walk(node: Any, pointer: str) -> None:
+        if not isinstance(node, dict):
+            return
+        for keyword in UNSUPPORTED_KEYWORDS:
+            if keyword in node:
+                warnings.append(f"'{keyword}' at '{pointer or '/'}' is not supported by the generator and is ignored")
+        ref = node.get("$ref")
+        if isinstance(ref, str) and not ref.startswith("#"):
+            warnings.append(f"'$ref' to '{ref}' at '{pointer or '/'}' is not resolved; only local references are")
+        for keyword in SUBSCHEMA:
+            walk(node.get(keyword), f"{pointer}/{keyword}")
+        for keyword in SUBSCHEMA_LISTS:
+            if isinstance(node.get(keyword), list):
+                for index, child in enumerate(node[keyword]):
+                    walk(child, f"{pointer}/{keyword}/{index}")
+        for keyword in SUBSCHEMA_MAPS:
+            if isinstance(node.get(keyword), dict):
+                for name, child in node[keyword].items():
+                    walk(child, f"{pointer}/{keyword}/{name}")
+
+    walk(schema, "")
+    return warnings
+
+
+def parse_schema(schema: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """(schema, error): rows written before schemas were validated may hold JSON text."""
+    if isinstance(schema, str):
+        try:
+            schema = json.loads(schema)
+        except json.JSONDecodeError:
+            return None, "Invalid JSON schema definition stored."
+    if not isinstance(schema, dict):
+        return None, "Response schema is not a valid dictionary."
+    return schema, None
+
+
+def encode_json(content: Any) -> bytes:
+    # Byte for byte what JSONResponse would send
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=JSON_SEPARATORS).encode("utf-8")
+
+
+def analyse(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """The serving plan of an endpoint with these response fields, as stored in `Endpoint.serving_plan`."""
+    schema = values.get("response_schema")
+    body = values.get("response_body")
+    size = values.get("response_size_bytes")
+    plan: Dict[str, Any] = {
+        "kind": EMPTY,
+        "media_type": "application/json",
+        "estimated_cost": 0,
+        "estimated_bytes": 2,
+        "offload": False,
+        "streaming": bool(size or values.get("stream_type")),
+        "warnings": [],
+    }
+    if schema:
+        schema, error = parse_schema(schema)
+        if error:
+            plan.update(kind=INVALID, error=error)
+            plan["warnings"].append(error)
+            return plan
+        cost = estimate_cost(schema)
+        plan.update(
+            kind=GENERATED,
+            estimated_cost=cost,
+            offload=schema_generator.enabled and cost >= schema_generator.threshold,
+            estimated_bytes=cost * BYTES_PER_VALUE,
+        )
+        plan["warnings"].extend(unsupported_keywords(schema))
+        if cost <= SAMPLE_COST_LIMIT:
+            try:
+                plan["estimated_bytes"] = len(encode_json(render_response(schema, {})))
+            except Exception as e:
+                plan["warnings"].append(f"Generating a sample response failed: {e}")
+    elif body:
+        plan["estimated_bytes"] = len(body.encode("utf-8"))
+        try:
+            json.loads(body)
+        except json.JSONDecodeError:
+            plan["media_type"] = "text/plain"
+        try:
+            templated = ResponseTemplate(body, None).body is not None
+        except TemplateError as e:
+            # Schema validation rejects these; only older rows get here, and the mock path 500s on them
+            plan["warnings"].append(f"Invalid response template: {e}")
+            templated = True
+        plan["kind"] = TEMPLATE if templated else CONSTANT
+    if size:
+        plan["estimated_bytes"] = size
+    if values.get("stream_type"):
+        plan["kind"] = STREAM
+    elif values.get("fixture_dataset"):
+        # Records are read from the dataset as stored, whatever the schema or body say
+        plan.update(kind=FIXTURE, media_type="application/json", estimated_cost=0, offload=False, streaming=False)
+    return plan
+
+
+class CompiledPlan:
+    """A stored plan, with what it serves decoded once: the parsed schema or the encoded body."""
+
+    __slots__ = ("kind", "schema", "content", "media_type", "offload", "error")
+
+    def __init__(self, plan: Mapping[str, Any], endpoint: Endpoint) -> None:
+        self.kind: str = plan["kind"]
+        self.media_type: str = plan["media_type"]
+        self.offload: bool = plan["offload"]
+        self.error: Optional[str] = plan.get("error")
+        self.schema: Optional[Dict[str, Any]] = None
+        self.content = b""
+        if endpoint.response_schema:
+            self.schema, _ = parse_schema(endpoint.response_schema)
+        if self.kind == CONSTANT:
+            body = endpoint.response_body
+            self.content = encode_json(json.loads(body)) if self.media_type == "application/json" else body.encode("utf-8")
+        elif self.kind == EMPTY:
+            self.content = b"{}"
+
+
+def build_plan(endpoint: Endpoint) -> CompiledPlan:
+    plan = endpoint.serving_plan
+    if plan is None:
+        # Saved before plans existed, or changed in bulk from manage.py
+        plan = analyse({field: getattr(endpoint, field) for field in PLAN_FIELDS})
+    return CompiledPlan(plan, endpoint)
+
+
+def log_warnings(endpoint: Endpoint) -> None:
+    for warning in (endpoint.serving_plan or {}).get("warnings", []):
+        logger.warning("Endpoint %s '/%s': %s", endpoint.method, endpoint.path, warning)
+
+
+plan_cache = CompiledCache(build_plan)
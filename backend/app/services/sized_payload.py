@@ -0,0 +1,150 @@
+import json
+import random
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.models.endpoint import Endpoint
+from app.services.schema_generation import schema_generator
+from app.services.serving_plan import CompiledPlan
+
+# Distinct records generated per endpoint version; copies are drawn from these
+TEMPLATE_RECORDS = 16
+# Bytes per streamed chunk: large enough that per-chunk overhead is negligible
+CHUNK_BYTES = 64 * 1024
+# Chunks are prebuilt in a few record orders so the body isn't one block repeated
+CHUNK_VARIANTS = 4
+
+
+class SizedPayload:
+    """A JSON array of exactly `size` bytes built from a handful of encoded records.
+
+    Chunks of comma-terminated records are encoded once; a response streams
+    references to them, then a few single records, then space padding before
+    the closing bracket to land on the exact size. Memory stays at a few
+    chunks however large the response is.
+    """
+
+    def __init__(self, records: List[bytes], chunk_bytes: int = CHUNK_BYTES, variants: int = CHUNK_VARIANTS) -> None:
+        self.records = records
+        self.longest = max(len(record) for record in records)
+        self.chunks: List[bytes] = []
+        for variant in range(min(variants, len(records))):
+            ordered = records[variant:] + records[:variant]
+            parts: List[bytes] = []
+            length = 0
+            while length < chunk_bytes:
+                record = ordered[len(parts) % len(ordered)]
+                parts.append(record)
+                length += len(record) + 1
+            self.chunks.append(b",".join(parts) + b",")
+
+    def stream(self, size: int) -> AsyncIterator[bytes]:
+        return self._stream(max(2, size))
+
+    async def _stream(self, size: int) -> AsyncIterator[bytes]:
+        yield b"["
+        remaining = size - 2
+        # Every chunk and record is followed by a comma, so keep room for a final bare record
+        chunks = self.chunks
+        chunk_len = len(chunks[0])
+        index = 0
+        while remaining - chunk_len >= self.longest:
+            chunk = chunks[index % len(chunks)]
+            index += 1
+            yield chunk
+            remaining -= len(chunk)
+            chunk_len = len(chunks[index % len(chunks)])
+        tail: List[bytes] = []
+        for record in self._cycle():
+            if remaining - len(record) - 1 < self.longest:
+                break
+            tail.append(record)
+            tail.append(b",")
+            remaining -= len(record) + 1
+        if remaining >= self.longest:
+            record = random.choice(self.records)
+            tail.append(record)
+            remaining -= len(record)
+        tail.append(b" " * remaining)
+        tail.append(b"]")
+        yield b"".join(tail)
+
+    def _cycle(self):
+        while True:
+            yield from self.records
+
+
+def template_records(content: Any) -> List[Any]:
+    """Records to repeat: the elements of an array response, otherwise the response itself."""
+    if isinstance(content, list):
+        return [item for item in content if item is not None] or [{}]
+    return [content]
+
+
+async def build_payload(endpoint: Endpoint, plan: CompiledPlan) -> SizedPayload:
+    records: List[Any] = []
+    if plan.schema:
+        # A schema may yield a single object per render; a few renders give enough variety
+        for _ in range(TEMPLATE_RECORDS):
+            records.extend(template_records(await schema_generator.render(plan.schema, {}, plan.offload)))
+            if len(records) >= TEMPLATE_RECORDS:
+                break
+    elif endpoint.response_body:
+        try:
+            records = template_records(json.loads(endpoint.response_body))
+        except json.JSONDecodeError:
+            records = [endpoint.response_body]
+    else:
+        records = [{}]
+    encoded = [json.dumps(record, separators=(",", ":"), default=str).encode() for record in records[:TEMPLATE_RECORDS]]
+    return SizedPayload(encoded)
+
+
+class SizedPayloadCache:
+    """Per-endpoint SizedPayloads, rebuilt when the endpoint's updated_at moves.
+
+    One payload per endpoint, shared by all its path values, so sized
+    responses do not echo path parameters into their records.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Any, Tuple[Any, SizedPayload]] = {}
+
+    async def get(self, endpoint: Endpoint, plan: CompiledPlan) -> SizedPayload:
+        cached = self._entries.get(endpoint.id)
+        if cached is not None and cached[0] == endpoint.updated_at:
+            return cached[1]
+        payload = await build_payload(endpoint, plan)
+        self._entries[endpoint.id] = (endpoint.updated_at, payload)
+        return payload
+
+    def discard(self, endpoint_id: Any) -> None:
+        self._entries.pop(endpoint_id, None)
+
+
+def response_size(endpoint: Endpoint, chaos_effect: Optional[str]) -> Optional[int]:
+    """Target body size for this request, if it should be a synthesized payload."""
+    if chaos_effect == "large_body":
+        return endpoint.response_size_bytes or settings.MOCK_CHAOS_LARGE_BODY_BYTES
+    return endpoint.response_size_bytes
+
+
+async def sized_response(
+    endpoint: Endpoint,
+    plan: CompiledPlan,
+    size: int,
+    status_code: int,
+) -> StreamingResponse:
+    payload = await payload_cache.get(endpoint, plan)
+    size = max(2, size)
+    return StreamingResponse(
+        payload.stream(size),
+        status_code=status_code,
+        media_type="application/json",
+        headers={"Content-Length": str(size)},
+    )
+
+
+payload_cache = SizedPayloadCache()
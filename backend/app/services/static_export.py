@@ -0,0 +1,320 @@
+"""Static mock endpoints compiled into files nginx serves without calling the backend.
+
+An endpoint qualifies when every GET to its URL gets the same bytes: a
+constant (or empty) response, no header or URL parameter rules, no request
+body schema, no configured wait, no chaos scenario that could cover it, no
+stateful group, and a path without parameters. Its `/chaos` URL and every
+other method still go to the backend.
+
+The export directory holds one version directory of response files (with a
+`.gz` variant for `gzip_static`) per export and `mock-static.conf`, an nginx
+include with one exact-match `location` per endpoint. The include is
+replaced atomically; the previous version is kept so nginx keeps serving
+until it reloads.
+"""
+import asyncio
+import fcntl
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.chaos_scenario import ChaosScenario
+from app.models.endpoint import Endpoint
+from app.models.group import Group
+from app.models.header import Header
+from app.models.url_parameter import UrlParameter
+from app.services.serving_plan import CONSTANT, EMPTY, build_plan
+from app.utils.route_trie import split_path
+
+logger = logging.getLogger(__name__)
+
+CONF_FILE = "mock-static.conf"
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = ".lock"
+# URI prefix of the internal location the endpoint locations redirect to
+INTERNAL_PREFIX = "/_mock_static/"
+# Named location in docker/nginx.conf that proxies to the backend
+BACKEND_LOCATION = "@mock_backend"
+EXTENSIONS = {"application/json": "json", "text/plain": "txt"}
+# Smaller bodies are not worth a compressed variant
+GZIP_MIN_BYTES = 256
+# Characters that need no quoting or escaping in an nginx location
+SAFE_URI = re.compile(r"^[A-Za-z0-9._~/-]+$")
+# Last path segments the mock routes treat specially
+RESERVED_SEGMENTS = ("chaos", "_batch")
+
+
+def static_candidates() -> Any:
+    """Endpoints whose configuration cannot make a response depend on the request.
+
+    JSON columns hold a JSON null when cleared, so state_config and
+    request_body_schema are checked by static_entry instead.
+    """
+    rules = [
+        select(Header.id).where(Header.endpoint_id == Endpoint.id).exists(),
+        select(UrlParameter.id).where(UrlParameter.endpoint_id == Endpoint.id).exists(),
+        # Stopped scenarios count too: starting one then needs no new export
+        select(ChaosScenario.id).where(
+            ChaosScenario.group_id == Endpoint.group_id,
+            or_(ChaosScenario.endpoint_id.is_(None), ChaosScenario.endpoint_id == Endpoint.id),
+        ).exists(),
+    ]
+    return (
+        select(Endpoint, Group.name, Group.state_config)
+        .join(Group, Group.id == Endpoint.group_id)
+        .where(
+            Group.deleted_at.is_(None),
+            Endpoint.method == "GET",
+            Endpoint.max_wait_time == 0,
+            Endpoint.response_size_bytes.is_(None),
+            Endpoint.stream_type.is_(None),
+            Endpoint.fixture_dataset.is_(None),
+            *[~rule for rule in rules],
+        )
+        .order_by(Group.name, Endpoint.path)
+    )
+
+
+def static_entry(endpoint: Endpoint, group_name: str, state_config: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """(entry, None) for an endpoint nginx can serve, or (None, the reason it cannot)."""
+    from app.api.v1.router import RESERVED_GROUP_NAMES
+
+    # Groups created before names were checked: an exact-match location would shadow the admin route
+    if group_name.lower() in RESERVED_GROUP_NAMES:
+        return None, "group name is reserved by the management API"
+    if state_config:
+        return None, "stateful group"
+    if endpoint.request_body_schema:
+        return None, "request body schema"
+    segments = split_path(endpoint.path)
+    if not segments or segments[-1] in RESERVED_SEGMENTS:
+        return None, "reserved path"
+    uri = f"{settings.API_V1_STR}/{group_name}/{'/'.join(segments)}"
+    if not SAFE_URI.match(uri):
+        return None, "path has parameters or characters that need escaping"
+    status_code = endpoint.response_status_code
+    if not (200 <= status_code < 300 or 400 <= status_code < 600):
+        return None, f"status {status_code}"
+    plan = build_plan(endpoint)
+    if plan.kind not in (CONSTANT, EMPTY):
+        return None, f"{plan.kind} response"
+    return {
+        "endpoint_id": str(endpoint.id),
+        "uri": uri,
+        "status_code": status_code,
+        "media_type": plan.media_type,
+        "content": b"" if status_code == 204 else plan.content,
+    }, None
+
+
+async def collect_entries(db: AsyncSession) -> Tuple[List[Dict[str, Any]], int]:
+    """The servable entries and the number of candidates left to the backend."""
+    entries: List[Dict[str, Any]] = []
+    skipped = 0
+    uris = set()
+    for endpoint, group_name, state_config in (await db.execute(static_candidates())).all():
+        entry, reason = static_entry(endpoint, group_name, state_config)
+        if entry is None or entry["uri"] in uris:
+            logger.debug("Not exporting %s %s/%s: %s", endpoint.method, group_name, endpoint.path, reason or "duplicate")
+            skipped += 1
+            continue
+        uris.add(entry["uri"])
+        entries.append(entry)
+    return entries, skipped
+
+
+def export_digest(entries: List[Dict[str, Any]]) -> str:
+    digest = hashlib.sha256()
+    for entry in entries:
+        digest.update(f"{entry['uri']}\0{entry['status_code']}\0{entry['media_type']}\0".encode())
+        digest.update(hashlib.sha256(entry["content"]).digest())
+    return digest.hexdigest()
+
+
+def file_name(entry: Dict[str, Any]) -> str:
+    return f"{entry['endpoint_id']}.{EXTENSIONS.get(entry['media_type'], 'json')}"
+
+
+def location(entry: Dict[str, Any], version: str) -> str:
+    if entry["status_code"] == 204:
+        respond = ["return 204;"]
+    else:
+        # error_page is the one way to serve a file with a status other than 200
+        respond = [
+            f"error_page 419 ={entry['status_code']} {INTERNAL_PREFIX}{version}/{file_name(entry)};",
+            "return 419;",
+        ]
+    return "\n".join([
+        f"# {entry['endpoint_id']}",
+        f"location = {entry['uri']} {{",
+        f"    error_page 418 = {BACKEND_LOCATION};",
+        "    if ($request_method !~ ^(GET|HEAD)$ ) { return 418; }",
+        *(f"    {line}" for line in respond),
+        "}",
+    ])
+
+
+def render_conf(entries: List[Dict[str, Any]], version: str, nginx_dir: str) -> str:
+    return "\n\n".join([
+        f"# Generated static mock endpoints, version {version}; rewritten on every export, do not edit",
+        "\n".join([
+            f"location ^~ {INTERNAL_PREFIX} {{",
+            "    internal;",
+            f"    alias {nginx_dir.rstrip('/')}/;",
+            "    types { application/json json; text/plain txt; }",
+            "    charset utf-8;",
+            "    gzip_static on;",
+            "    gzip_vary on;",
+            "}",
+        ]),
+        *(location(entry, version) for entry in entries),
+    ]) + "\n"
+
+
+def write_export(directory: str, entries: List[Dict[str, Any]], nginx_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Writes a new version and include unless the current one serves the same; returns the new manifest.
+
+    Workers and the CLI may export at the same time, so the whole write holds
+    an exclusive lock on the directory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    digest = export_digest(entries)
+    with open(os.path.join(directory, LOCK_FILE), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest_path = os.path.join(directory, MANIFEST_FILE)
+        try:
+            with open(manifest_path) as file:
+                current = json.load(file)
+        except (FileNotFoundError, ValueError):
+            current = {}
+        if current.get("digest") == digest and os.path.exists(os.path.join(directory, CONF_FILE)):
+            return None
+
+        version = f"{int(time.time())}-{uuid4().hex[:8]}"
+        target = os.path.join(directory, version)
+        os.makedirs(target)
+        for entry in entries:
+            if entry["status_code"] == 204:
+                continue
+            path = os.path.join(target, file_name(entry))
+            with open(path, "wb") as out:
+                out.write(entry["content"])
+            if len(entry["content"]) >= GZIP_MIN_BYTES:
+                # mtime=0 keeps the variant byte-identical across exports
+                compressed = gzip.compress(entry["content"], compresslevel=9, mtime=0)
+                if len(compressed) < len(entry["content"]):
+                    with open(f"{path}.gz", "wb") as out:
+                        out.write(compressed)
+
+        pending = os.path.join(directory, f"{CONF_FILE}.{version}")
+        with open(pending, "w") as out:
+            out.write(render_conf(entries, version, nginx_dir or os.path.abspath(directory)))
+        os.replace(pending, os.path.join(directory, CONF_FILE))
+        manifest = {
+            "version": version,
+            "digest": digest,
+            "endpoints": len(entries),
+            "created_at": time.time(),
+        }
+        pending = os.path.join(directory, f"{MANIFEST_FILE}.{version}")
+        with open(pending, "w") as out:
+            json.dump(manifest, out)
+        os.replace(pending, manifest_path)
+
+        # nginx serves the previous version until it reloads; anything older can go
+        kept = {version, current.get("version")}
+        for entry in os.listdir(directory):
+            if entry not in kept and os.path.isdir(os.path.join(directory, entry)):
+                shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+    return manifest
+
+
+async def export_static(db: AsyncSession, directory: str, nginx_dir: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], int, int]:
+    """(new manifest or None when unchanged, endpoints exported, candidates skipped)."""
+    entries, skipped = await collect_entries(db)
+    manifest = await asyncio.to_thread(write_export, directory, entries, nginx_dir)
+    return manifest, len(entries), skipped
+
+
+async def config_fingerprint(db: AsyncSession) -> Tuple[Any, ...]:
+    """Changes whenever an export could: any write to the tables the selection reads."""
+    fingerprint: List[Any] = []
+    for model in (Group, Endpoint, Header, UrlParameter, ChaosScenario):
+        row = (await db.execute(select(func.count(model.id), func.max(model.updated_at)))).one()
+        fingerprint.extend(row)
+    return tuple(fingerprint)
+
+
+class StaticExporter:
+    """Background job that re-exports the static endpoints after a configuration change.
+
+    Each worker polls a cheap fingerprint of the configuration tables and
+    only collects the endpoints when it changed; the digest in the manifest
+    keeps unchanged exports from being rewritten, so overlapping workers are
+    harmless.
+    """
+
+    def __init__(self, directory: Optional[str], nginx_dir: Optional[str], interval: float) -> None:
+        self.directory = directory
+        self.nginx_dir = nginx_dir
+        self.interval = interval
+        self.enabled = bool(directory)
+        self.exports = 0
+        self.exported = 0
+        self._fingerprint: Optional[Tuple[Any, ...]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self.enabled and self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self) -> None:
+        async with AsyncSessionLocal() as db:
+            fingerprint = await config_fingerprint(db)
+            if fingerprint == self._fingerprint:
+                return
+            manifest, exported, _ = await export_static(db, self.directory, self.nginx_dir)
+        self._fingerprint = fingerprint
+        self.exported = exported
+        if manifest is not None:
+            self.exports += 1
+            logger.info("Exported %d static mock endpoints (version %s)", exported, manifest["version"])
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Failed to export static mock endpoints")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "directory": self.directory, "exported": self.exported, "exports": self.exports}
+
+
+static_exporter = StaticExporter(
+    directory=settings.STATIC_EXPORT_DIR,
+    nginx_dir=settings.STATIC_EXPORT_NGINX_DIR,
+    interval=settings.STATIC_EXPORT_INTERVAL_SECONDS,
+)
@@ -0,0 +1,251 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.captured_request import CapturedRequest
+
+logger = logging.getLogger(__name__)
+
+# Order of the fields in a queued record. Records stay tuples until they are flushed
+# so the mock path only pays for one small allocation per request.
+RECORD_FIELDS = (
+    "group_id",
+    "endpoint_id",
+    "method",
+    "path",
+    "query",
+    "headers",
+    "body_sha256",
+    "body_size",
+    "chaos_effect",
+    "status_code",
+    "duration_ms",
+    "received_at",
+)
+
+
+class TrafficCapture:
+    """Bounded, non-blocking capture pipeline for mock traffic.
+
+    `record()` is called on the request path and never waits: when the queue is
+    full the record is dropped and counted. A single background task drains the
+    queue in batches and writes them with one multi-row INSERT ("db") or appends
+    them as JSON lines to a size-rotated file ("file").
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        file_path: str,
+        file_max_bytes: int,
+        file_backups: int,
+        redact_headers: List[str],
+    ) -> None:
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.file_path = file_path
+        self.file_max_bytes = file_max_bytes
+        self.file_backups = file_backups
+        self.redact_headers = {name.lower() for name in redact_headers}
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend in ("db", "file")
+
+    def record(self, record: Tuple[Any, ...]) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self.captured += 1
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def build_record(
+        self,
+        request: Any,
+        body_sha256: Optional[str],
+        body_size: int,
+        status_code: int,
+        duration_ms: float,
+    ) -> Tuple[Any, ...]:
+        state = request.state
+        headers = {
+            name: ("[redacted]" if name in self.redact_headers else value)
+            for name, value in request.headers.items()
+        }
+        return (
+            getattr(state, "mock_group_id", None),
+            getattr(state, "mock_endpoint_id", None),
+            request.method,
+            request.url.path,
+            request.url.query or None,
+            headers,
+            body_sha256,
+            body_size,
+            getattr(state, "chaos_effect", None),
+            status_code,
+            round(duration_ms, 3),
+            datetime.utcnow(),
+        )
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the flusher and writes whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self.queue.empty():
+            await self._flush(self._drain())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                first = await asyncio.wait_for(self.queue.get(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                continue
+            batch = [first] + self._drain(self.batch_size - 1)
+            await self._flush(batch)
+
+    def _drain(self, limit: Optional[int] = None) -> List[Tuple[Any, ...]]:
+        limit = self.batch_size if limit is None else limit
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _flush(self, batch: List[Tuple[Any, ...]]) -> None:
+        if not batch:
+            return
+        rows = [dict(zip(RECORD_FIELDS, record)) for record in batch]
+        try:
+            if self.backend == "db":
+                async with AsyncSessionLocal() as session:
+                    await session.execute(insert(CapturedRequest), rows)
+                    await session.commit()
+            else:
+                await asyncio.to_thread(self._append_to_file, rows)
+            self.written += len(rows)
+        except Exception:
+            # Capture is best effort, it must never take the mock server down
+            self.failed += len(rows)
+            logger.exception("Failed to flush %d captured requests", len(rows))
+
+    def _append_to_file(self, rows: List[Dict[str, Any]]) -> None:
+        payload = "".join(json.dumps(row, default=str) + "\n" for row in rows).encode()
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            size = os.path.getsize(self.file_path)
+        except OSError:
+            size = 0
+        if size and size + len(payload) > self.file_max_bytes:
+            self._rotate()
+        with open(self.file_path, "ab") as f:
+            f.write(payload)
+
+    def _rotate(self) -> None:
+        # capture.jsonl -> capture.jsonl.1 -> ... -> capture.jsonl.N (oldest, dropped)
+        for index in range(self.file_backups - 1, 0, -1):
+            source = f"{self.file_path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.file_path}.{index + 1}")
+        if self.file_backups > 0:
+            os.replace(self.file_path, f"{self.file_path}.1")
+        else:
+            os.remove(self.file_path)
+
+    def file_paths(self) -> List[str]:
+        """Capture files from newest to oldest."""
+        paths = [self.file_path] + [f"{self.file_path}.{i}" for i in range(1, self.file_backups + 1)]
+        return [path for path in paths if os.path.exists(path)]
+
+    def query_file(
+        self,
+        filters: Dict[str, Any],
+        limit: int,
+        offset: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Scans the capture files newest first and returns matching rows.
+
+        Each file is read line by line, so memory stays bounded by one file's
+        matches rather than the whole capture history.
+        """
+        matches: List[Dict[str, Any]] = []
+        wanted = offset + limit
+        for path in self.file_paths():
+            file_matches = []
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if not all(
+                        value is None or str(row.get(key)) == str(value)
+                        for key, value in filters.items()
+                    ):
+                        continue
+                    if since or until:
+                        received_at = datetime.fromisoformat(row["received_at"])
+                        if since and received_at < since.replace(tzinfo=None):
+                            continue
+                        if until and received_at > until.replace(tzinfo=None):
+                            continue
+                    file_matches.append(row)
+            # Lines are appended in arrival order, newest results come last
+            matches.extend(reversed(file_matches))
+            if len(matches) >= wanted:
+                break
+        return matches[offset:wanted]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "captured": self.captured,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+
+traffic_capture = TrafficCapture(
+    backend=settings.TRAFFIC_CAPTURE_BACKEND,
+    queue_size=settings.TRAFFIC_CAPTURE_QUEUE_SIZE,
+    batch_size=settings.TRAFFIC_CAPTURE_BATCH_SIZE,
+    flush_interval=settings.TRAFFIC_CAPTURE_FLUSH_INTERVAL_SECONDS,
+    file_path=settings.TRAFFIC_CAPTURE_FILE,
+    file_max_bytes=settings.TRAFFIC_CAPTURE_FILE_MAX_BYTES,
+    file_backups=settings.TRAFFIC_CAPTURE_FILE_BACKUPS,
+    redact_headers=settings.TRAFFIC_CAPTURE_REDACT_HEADERS,
+)
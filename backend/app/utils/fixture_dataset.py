@@ -0,0 +1,214 @@
+"""On-disk fixture datasets: records, an id index and secondary indexes, memory-mapped read-only.
+
+A dataset version is a directory of flat files, written once and never
+modified, so every worker can map it and the page cache holds one copy:
+
+    records.bin   the records as compact JSON, back to back
+    offsets.bin   uint64 start of every record, plus the end of the last
+    ids.bin       open-addressing hash table of (hash of id, record + 1) slots
+    index-<field>.bin
+                  (hash of value, record) pairs sorted by hash, one per indexed field
+    meta.json     count, id field, indexed fields, byte order
+
+Ids and values are compared as text (`key`), the way they arrive in URLs.
+"""
+import hashlib
+import json
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+RECORDS_FILE = "records.bin"
+OFFSETS_FILE = "offsets.bin"
+IDS_FILE = "ids.bin"
+META_FILE = "meta.json"
+INDEX_FILE = "index-{}.bin"
+FORMAT_VERSION = 1
+
+
+class DatasetError(ValueError):
+    pass
+
+
+def key(value: Any) -> str:
+    """A value as it would appear in a path or query string."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"), sort_keys=True)
+    return str(value)
+
+
+def key_hash(text: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def index_path(directory: str, field: str) -> str:
+    return os.path.join(directory, INDEX_FILE.format(field))
+
+
+def write_dataset(directory: str, records: Iterable[Dict[str, Any]], id_field: str, indexes: Sequence[str]) -> Dict[str, Any]:
+    """Writes a dataset version into an empty directory; raises DatasetError on a missing or repeated id."""
+    offsets = array("Q", [0])
+    id_hashes = array("Q")
+    index_hashes: Dict[str, array] = {field: array("Q") for field in indexes}
+    size = 0
+    with open(os.path.join(directory, RECORDS_FILE), "wb") as out:
+        for record in records:
+            if not isinstance(record, dict) or record.get(id_field) is None:
+                raise DatasetError(f"Record {len(id_hashes)} has no '{id_field}'")
+            data = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            out.write(data)
+            size += len(data)
+            offsets.append(size)
+            id_hashes.append(key_hash(key(record[id_field])))
+            for field, hashes in index_hashes.items():
+                hashes.append(key_hash(key(record.get(field))))
+    count = len(id_hashes)
+
+    # Linear probing at a load factor of at most 1/2
+    capacity = 8
+    while capacity < 2 * count:
+        capacity *= 2
+    mask = capacity - 1
+    table = array("Q", bytes(16 * capacity))
+    for record_number, hashed in enumerate(id_hashes):
+        slot = hashed & mask
+        while table[2 * slot + 1]:
+            if table[2 * slot] == hashed:
+                raise DatasetError(f"Record {record_number} repeats the '{id_field}' of record {table[2 * slot + 1] - 1}")
+            slot = (slot + 1) & mask
+        table[2 * slot] = hashed
+        table[2 * slot + 1] = record_number + 1
+    with open(os.path.join(directory, IDS_FILE), "wb") as out:
+        table.tofile(out)
+    with open(os.path.join(directory, OFFSETS_FILE), "wb") as out:
+        offsets.tofile(out)
+
+    for field, hashes in index_hashes.items():
+        # Sorted by value hash, then by record, so postings come out in dataset order
+        order = sorted(range(count), key=hashes.__getitem__)
+        pairs = array("Q")
+        for record_number in order:
+            pairs.append(hashes[record_number])
+            pairs.append(record_number)
+        with open(index_path(directory, field), "wb") as out:
+            pairs.tofile(out)
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "count": count,
+        "id_field": id_field,
+        "indexes": list(indexes),
+        "records_bytes": size,
+        "byteorder": sys.byteorder,
+    }
+    with open(os.path.join(directory, META_FILE), "w") as out:
+        json.dump(meta, out)
+    return meta
+
+
+def map_file(path: str) -> Any:
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        # The mapping outlives the descriptor
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class SortedPairs:
+    """Read-only view of a (hash, record) pair file as a sequence of hashes, for bisect."""
+
+    def __init__(self, words: Any) -> None:
+        self.words = words
+
+    def __len__(self) -> int:
+        return len(self.words) // 2
+
+    def __getitem__(self, position: int) -> int:
+        return self.words[2 * position]
+
+    def postings(self, hashed: int) -> List[int]:
+        words = self.words
+        position = bisect_left(self, hashed)
+        found = []
+        while position < len(self) and words[2 * position] == hashed:
+            found.append(words[2 * position + 1])
+            position += 1
+        return found
+
+
+class Dataset:
+    """One memory-mapped dataset version. Lookups touch only the pages they need."""
+
+    def __init__(self, directory: str) -> None:
+        with open(os.path.join(directory, META_FILE)) as file:
+            self.meta = json.load(file)
+        if self.meta.get("format") != FORMAT_VERSION or self.meta.get("byteorder") != sys.byteorder:
+            raise DatasetError(f"{directory}: written by an incompatible version or machine")
+        self.directory = directory
+        self.count: int = self.meta["count"]
+        self.id_field: str = self.meta["id_field"]
+        self.records = map_file(os.path.join(directory, RECORDS_FILE))
+        self.offsets = memoryview(map_file(os.path.join(directory, OFFSETS_FILE))).cast("Q")
+        self.ids = memoryview(map_file(os.path.join(directory, IDS_FILE))).cast("Q")
+        self.mask = len(self.ids) // 2 - 1
+        self.indexes = {
+            field: SortedPairs(memoryview(map_file(index_path(directory, field))).cast("Q"))
+            for field in self.meta["indexes"]
+        }
+
+    def record(self, record_number: int) -> bytes:
+        return self.records[self.offsets[record_number]:self.offsets[record_number + 1]]
+
+    def get(self, record_id: str) -> Optional[bytes]:
+        """The encoded record with this id, in O(1)."""
+        hashed = key_hash(record_id)
+        ids = self.ids
+        slot = hashed & self.mask
+        while ids[2 * slot + 1]:
+            if ids[2 * slot] == hashed:
+                data = self.record(ids[2 * slot + 1] - 1)
+                # 64-bit hashes practically never collide; the check makes it certain
+                return data if key(json.loads(data).get(self.id_field)) == record_id else None
+            slot = (slot + 1) & self.mask
+        return None
+
+    def query(self, filters: Dict[str, str], offset: int, limit: int) -> Tuple[List[bytes], Optional[int]]:
+        """A page of records matching every filter, and the number of matches when it is known without a scan.
+
+        Indexed filters narrow the candidates through their postings; other
+        filters are checked on the candidates in dataset order until the page
+        is full.
+        """
+        candidates: Optional[List[int]] = None
+        for field, value in filters.items():
+            if field in self.indexes:
+                postings = self.indexes[field].postings(key_hash(value))
+                candidates = postings if candidates is None else sorted(set(candidates).intersection(postings))
+        scanned = [(field, value) for field, value in filters.items() if field not in self.indexes]
+        if not scanned:
+            if candidates is None:
+                return [self.record(number) for number in range(offset, min(offset + limit, self.count))], self.count
+            return [self.record(number) for number in candidates[offset:offset + limit]], len(candidates)
+
+        page: List[bytes] = []
+        skipped = 0
+        for number in range(self.count) if candidates is None else candidates:
+            data = self.record(number)
+            document = json.loads(data)
+            if any(key(document.get(field)) != value for field, value in scanned):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            page.append(data)
+            if len(page) >= limit:
+                break
+        return page, None
@@ -1,14 +1,14 @@
-from typing import Any, Dict
+import random
+from typing import Any, Dict, Optional
 
-from jsf import JSF
 
-
-def generate_data_from_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+def generate_data_from_schema(schema: Dict[str, Any], faker: Optional[Any] = None) -> Dict[str, Any]:
     """
     Generates a dictionary of fake data based on the provided JSON schema.
 
     Args:
         schema: The JSON schema as a Python dictionary.
+        faker: Object answering `$provider: faker.*` lookups; defaults to jsf's own Faker.
 
     Returns:
         A dictionary containing the generated fake data.
@@ -16,16 +16,137 @@ def generate_data_from_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
     Raises:
         Exception: If data generation fails.
     """
+    # jsf builds its own Faker at import time, so it is only imported on first use
+    from jsf import JSF
+
     try:
         # TODO: Consider adding more robust error handling or logging
-        faker = JSF(schema)
-        fake_data = faker.generate()
+        if faker is None:
+            generator = JSF(schema)
+        else:
+            generator = JSF(schema, context=jsf_context(faker))
+        fake_data = generator.generate()
         return fake_data
     except Exception as e:
         # TODO: Log the specific error for better debugging
         # logger.error(f"Failed to generate data from schema: {e}", exc_info=True)
         raise Exception(f"Failed to generate data from schema: {e}")
 
+def jsf_context(faker: Any) -> Dict[str, Any]:
+    """jsf's default evaluation context with a different faker."""
+    import datetime
+    import random
+    from typing import List, Tuple, Union
+
+    return {
+        "faker": faker,
+        "random": random,
+        "datetime": datetime,
+        "__internal__": {"List": List, "Union": Union, "Tuple": Tuple},
+    }
+
+# --- Start: Modify post-processing helper for re-generation, rounding, and empty object filtering ---
+def post_process_data(data: Any, schema: Dict[str, Any], precision: int = 2) -> Any:
+    """Recursively processes generated data based on schema:
+       - Re-generates numbers if they fall outside min/max defined in schema.
+       - Rounds floats.
+       - Removes empty objects from arrays.
+    """
+    schema_type = schema.get("type")
+
+    if schema_type == "number" and isinstance(data, (int, float)):
+        min_val = schema.get("minimum", schema.get("min_value"))
+        max_val = schema.get("maximum", schema.get("max_value"))
+
+        processed_data = data
+        # --- Re-generation if out of bounds ---
+        is_out_of_bounds = False
+        if min_val is not None and processed_data < min_val:
+            is_out_of_bounds = True
+        if max_val is not None and processed_data > max_val:
+            is_out_of_bounds = True
+        
+        # Ensure both min and max are valid for uniform generation if needed
+        if is_out_of_bounds and min_val is not None and max_val is not None and min_val <= max_val:
+            processed_data = random.uniform(min_val, max_val)
+        # If bounds are invalid or missing, we keep the original (potentially out-of-bounds) data
+
+        # --- Rounding (only if it was originally float or re-generation resulted in float) ---
+        if isinstance(processed_data, float):
+             return round(processed_data, precision)
+        else:
+            return processed_data
+
+    elif schema_type == "integer" and isinstance(data, (int, float)):
+        min_val = schema.get("minimum", schema.get("min_value"))
+        max_val = schema.get("maximum", schema.get("max_value"))
+
+        # Ensure data is integer first (jsf might produce float for integer schema)
+        processed_data = int(round(data))
+
+        # --- Re-generation if out of bounds ---
+        is_out_of_bounds = False
+        if min_val is not None and processed_data < min_val:
+            is_out_of_bounds = True
+        if max_val is not None and processed_data > max_val:
+            is_out_of_bounds = True
+            
+        # Ensure both min and max are valid for randint generation if needed
+        if is_out_of_bounds and min_val is not None and max_val is not None and min_val <= max_val:
+            processed_data = random.randint(min_val, max_val)
+        # If bounds are invalid or missing, we keep the original (potentially out-of-bounds) int data
+
+        return processed_data
+
+    elif schema_type == "object" and isinstance(data, dict) and "properties" in schema:
+        properties = schema.get("properties", {})
+        # Process properties recursively
+        processed_obj = {
+            k: post_process_data(v, properties.get(k, {}), precision)
+            for k, v in data.items()
+            if k in properties
+        }
+        # Return the processed object, or None if it became empty (optional, decide if needed)
+        # For now, return even if empty, filtering happens at array level
+        return processed_obj
+
+    elif schema_type == "array" and isinstance(data, list) and "items" in schema:
+        item_schema = schema.get("items", {})
+        # Recursively process each item first
+        processed_items = [post_process_data(item, item_schema, precision) for item in data]
+        # --- Start: Filter out empty objects --- 
+        filtered_items = [item for item in processed_items if item != {}]
+        # --- End: Filter out empty objects --- 
+        return filtered_items
+
+    elif isinstance(data, float): # Fallback rounding
+        return round(data, precision)
+    else:
+        return data
+# --- End: Modify post-processing helper ---
+
+def apply_path_params(data: Any, schema: Dict[str, Any], path_params: Dict[str, str]) -> Any:
+    """Echoes captured path parameters into top-level properties of the same name,
+       so GET /orders/42 answers with {"id": 42, ...} instead of a random id.
+    """
+    if not path_params or not isinstance(data, dict):
+        return data
+    properties = schema.get("properties", {}) if isinstance(schema, dict) else {}
+    for name, raw_value in path_params.items():
+        if name not in data and name not in properties:
+            continue
+        prop_type = properties.get(name, {}).get("type")
+        value: Any = raw_value
+        try:
+            if prop_type == "integer":
+                value = int(raw_value)
+            elif prop_type == "number":
+                value = float(raw_value)
+        except ValueError:
+            pass  # Keep the raw string, the client asked for it
+        data[name] = value
+    return data
+
 # Example usage (optional, for testing)
 # if __name__ == "__main__":
 #     test_schema = {
@@ -0,0 +1,114 @@
+import re
+from typing import List
+
+# Bytes that matter outside and inside JSON strings. Everything else is skipped in C by the regex engine.
+_STRUCTURAL = re.compile(rb'["\[\]{},]')
+_IN_STRING = re.compile(rb'["\\]')
+_WHITESPACE = b" \t\r\n"
+
+
+class JSONStreamError(ValueError):
+    pass
+
+
+class ArrayItemSplitter:
+    """Incrementally splits a top-level JSON array into the raw bytes of its elements.
+
+    Feed it chunks as they arrive; every call returns the elements completed by
+    that chunk. Only the element currently being read is buffered, so memory is
+    bounded by the largest element rather than by the document. The splitter only
+    tracks nesting and string boundaries; each returned element still has to be
+    parsed with `json.loads`, which reports any syntax error inside it.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0  # 0 before "[", 1 between elements, >1 inside a nested element
+        self.in_string = False
+        self.escaped = False
+        self.finished = False
+        self.count = 0
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        items: List[bytes] = []
+        position = 0
+        # Bytes of the current element in this chunk are copied once, when the
+        # element ends or the chunk runs out, not token by token.
+        pending = 0
+        length = len(chunk)
+        structural = _STRUCTURAL.search
+        in_string = _IN_STRING.search
+        while position < length:
+            if self.finished:
+                if chunk[position:].strip(_WHITESPACE):
+                    raise JSONStreamError("Unexpected data after the end of the array")
+                return items
+
+            if self.depth == 0:
+                stripped = chunk[position:].lstrip(_WHITESPACE)
+                if not stripped:
+                    return items
+                if stripped[0:1] != b"[":
+                    raise JSONStreamError("Request body is not a JSON array")
+                position = pending = length - len(stripped) + 1
+                self.depth = 1
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                    position += 1
+                    continue
+                match = in_string(chunk, position)
+                if match is None:
+                    break
+                position = match.end()
+                if match.group() == b"\\":
+                    self.escaped = True
+                else:
+                    self.in_string = False
+                continue
+
+            match = structural(chunk, position)
+            if match is None:
+                break
+            token = match.group()
+            position = match.end()
+            if token == b'"':
+                self.in_string = True
+            elif token in (b"[", b"{"):
+                self.depth += 1
+            elif self.depth > 1:
+                if token != b",":
+                    self.depth -= 1
+            elif token == b"}":
+                raise JSONStreamError("Unbalanced '}' in JSON array")
+            else:
+                # "," or "]" at depth 1 ends the current element
+                self._end_element(items, chunk[pending:position - 1], closing=token == b"]")
+                pending = position
+                if token == b"]":
+                    self.finished = True
+        if not self.finished:
+            self._buffer += chunk[pending:]
+        return items
+
+    def _end_element(self, items: List[bytes], tail: bytes, closing: bool) -> None:
+        if self._buffer:
+            self._buffer += tail
+            raw = bytes(self._buffer).strip(_WHITESPACE)
+            self._buffer.clear()
+        else:
+            raw = tail.strip(_WHITESPACE)
+        if not raw:
+            # "[]" is fine, "[1,]" and "[,1]" are not
+            if closing and self.count == 0:
+                return
+            raise JSONStreamError("Empty element in JSON array")
+        self.count += 1
+        items.append(raw)
+
+    def close(self) -> None:
+        """Raises unless a complete array was read."""
+        if not self.finished:
+            raise JSONStreamError("Request body ended before the JSON array was closed")
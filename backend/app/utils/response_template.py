@@ -0,0 +1,247 @@
+import json
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Mapping, Optional, Tuple
+from uuid import uuid4
+
+# `{{ expression }}` or `{{ expression | default }}`. Expressions:
+#   request.method, request.path (the URL path), request.path.<param>,
+#   request.query.<name>, request.headers.<name>, request.body.<key>.<index>...
+#   faker.<provider>, uuid, now (ISO 8601, UTC), timestamp (epoch seconds)
+PLACEHOLDER = re.compile(r"\{\{\s*(.*?)\s*\}\}")
+# Schema keyword whose template replaces the generated value of that property
+SCHEMA_KEYWORD = "x-template"
+# Path step that applies a schema template to every item of an array
+EACH_ITEM = object()
+
+Renderer = Callable[["TemplateContext"], Any]
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class TemplateContext:
+    """What a template can read: the request, its path parameters, its parsed body and a Faker source."""
+
+    __slots__ = ("request", "path_params", "body", "faker")
+
+    def __init__(self, request: Any, path_params: Mapping[str, str], body: Any, faker: Any) -> None:
+        self.request = request
+        self.path_params = path_params
+        self.body = body
+        self.faker = faker
+
+
+def _literal(raw: str) -> Any:
+    # Defaults are JSON when they parse (`| 1`, `| null`, `| "x"`) and text otherwise
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def _body_getter(keys: List[str]) -> Renderer:
+    steps = [int(key) if key.isdigit() else key for key in keys]
+
+    def get(context: TemplateContext) -> Any:
+        value = context.body
+        for step in steps:
+            if isinstance(value, dict):
+                value = value.get(str(step))
+            elif isinstance(value, list) and isinstance(step, int) and step < len(value):
+                value = value[step]
+            else:
+                return None
+        return value
+    return get
+
+
+def compile_expression(source: str) -> Renderer:
+    """Turns one placeholder's expression into a function of the context; raises on unknown names."""
+    expression, sep, default = source.partition("|")
+    expression = expression.strip()
+    parts = expression.split(".")
+    root, rest = parts[0], parts[1:]
+    getter: Renderer
+    if root == "request" and rest:
+        section, keys = rest[0], rest[1:]
+        name = ".".join(keys)
+        if section == "method" and not keys:
+            getter = lambda context: context.request.method
+        elif section == "path" and not keys:
+            getter = lambda context: context.request.url.path
+        elif section == "path":
+            getter = lambda context: context.path_params.get(name)
+        elif section == "query" and keys:
+            getter = lambda context: context.request.query_params.get(name)
+        elif section == "headers" and keys:
+            header = name.lower()
+            getter = lambda context: context.request.headers.get(header)
+        elif section == "body":
+            getter = _body_getter(keys)
+        else:
+            raise TemplateError(f"Unknown request field '{expression}'")
+    elif root == "faker" and len(rest) == 1 and rest[0]:
+        provider = rest[0]
+        getter = lambda context: context.faker.sample(provider)
+    elif expression == "uuid":
+        getter = lambda context: str(uuid4())
+    elif expression == "now":
+        getter = lambda context: datetime.now(timezone.utc).isoformat()
+    elif expression == "timestamp":
+        getter = lambda context: int(time.time())
+    else:
+        raise TemplateError(f"Unknown template expression '{expression}'")
+
+    if not sep:
+        return getter
+    fallback = _literal(default.strip())
+
+    def with_default(context: TemplateContext) -> Any:
+        value = getter(context)
+        return fallback if value is None else value
+    return with_default
+
+
+def compile_text(text: str) -> Optional[Renderer]:
+    """A renderer for a string with placeholders, or None when it has none.
+
+    A string that is exactly one placeholder renders the value itself, so a
+    number or object from the body stays one; otherwise values are
+    interpolated, non-strings as JSON.
+    """
+    pieces = PLACEHOLDER.split(text)
+    if len(pieces) == 1:
+        return None
+    if len(pieces) == 3 and not pieces[0] and not pieces[2]:
+        return compile_expression(pieces[1])
+    literals = pieces[0::2]
+    expressions = [compile_expression(piece) for piece in pieces[1::2]]
+    first = literals[0]
+    tail = list(zip(expressions, literals[1:]))
+
+    def render(context: TemplateContext) -> str:
+        out = [first]
+        for expression, literal in tail:
+            value = expression(context)
+            out.append("" if value is None else value if isinstance(value, str) else json.dumps(value))
+            out.append(literal)
+        return "".join(out)
+    return render
+
+
+def compile_tree(node: Any) -> Optional[Renderer]:
+    """A renderer for a JSON document with placeholders in its strings, or None when it is static.
+
+    Static subtrees are shared between responses rather than copied; rendered
+    documents are only serialized, never modified.
+    """
+    if isinstance(node, str):
+        return compile_text(node)
+    if isinstance(node, dict):
+        children = {key: compile_tree(value) for key, value in node.items()}
+        if not any(children.values()):
+            return None
+        items = [(key, children[key], value) for key, value in node.items()]
+        return lambda context: {key: render(context) if render else value for key, render, value in items}
+    if isinstance(node, list):
+        children = [compile_tree(value) for value in node]
+        if not any(children):
+            return None
+        items = list(zip(children, node))
+        return lambda context: [render(context) if render else value for render, value in items]
+    return None
+
+
+def _coerce(value: Any, schema_type: Any) -> Any:
+    # Request values arrive as strings; give the property the type its schema declares
+    if not isinstance(value, str):
+        return value
+    try:
+        if schema_type == "integer":
+            return int(value)
+        if schema_type == "number":
+            return float(value)
+    except ValueError:
+        return value
+    if schema_type == "boolean" and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return value
+
+
+def compile_schema_fields(schema: Any) -> List[Tuple[Tuple[Any, ...], Renderer]]:
+    """(path, renderer) for every property of a response schema that carries `x-template`."""
+    fields: List[Tuple[Tuple[Any, ...], Renderer]] = []
+
+    def walk(node: Any, path: Tuple[Any, ...]) -> None:
+        if not isinstance(node, dict):
+            return
+        template = node.get(SCHEMA_KEYWORD)
+        if isinstance(template, str):
+            render = compile_text(template) or (lambda context, text=template: text)
+            schema_type = node.get("type")
+            fields.append((path, lambda context, render=render: _coerce(render(context), schema_type)))
+        for name, child in (node.get("properties") or {}).items():
+            walk(child, path + (name,))
+        if isinstance(node.get("items"), dict):
+            walk(node["items"], path + (EACH_ITEM,))
+
+    walk(schema, ())
+    return fields
+
+
+def _assign(data: Any, path: Tuple[Any, ...], render: Renderer, context: TemplateContext) -> Any:
+    if not path:
+        return render(context)
+    step, rest = path[0], path[1:]
+    if step is EACH_ITEM:
+        if isinstance(data, list):
+            for index, item in enumerate(data):
+                data[index] = _assign(item, rest, render, context)
+    elif isinstance(data, dict):
+        # Optional properties jsf left out are filled in too; the client asked for them
+        data[step] = _assign(data.get(step), rest, render, context)
+    return data
+
+
+class ResponseTemplate:
+    """The templates of one endpoint version, compiled once.
+
+    `body` renders the static response body (None when it has no placeholders)
+    and `fields` overwrite schema-generated values marked with `x-template`.
+    """
+
+    def __init__(self, response_body: Optional[str], response_schema: Any) -> None:
+        self.body: Optional[Renderer] = None
+        self.body_is_json = False
+        if response_body and "{{" in response_body:
+            try:
+                self.body = compile_tree(json.loads(response_body))
+                self.body_is_json = True
+            except json.JSONDecodeError:
+                self.body = compile_text(response_body)
+        self.fields = compile_schema_fields(response_schema) if isinstance(response_schema, dict) else []
+        sources = (response_body or "") + (json.dumps(response_schema) if self.fields else "")
+        self.needs_body = "request.body" in sources
+
+    @property
+    def active(self) -> bool:
+        return self.body is not None or bool(self.fields)
+
+    def render_body(self, context: TemplateContext) -> Tuple[Any, str]:
+        """(content, media type) of the templated static body."""
+        content = self.body(context)
+        if self.body_is_json:
+            return content, "application/json"
+        # Placeholders outside JSON strings: the result may well be JSON
+        try:
+            return json.loads(content), "application/json"
+        except (json.JSONDecodeError, TypeError):
+            return content, "text/plain"
+
+    def apply(self, content: Any, context: TemplateContext) -> Any:
+        for path, render in self.fields:
+            content = _assign(content, path, render, context)
+        return content
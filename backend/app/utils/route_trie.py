@@ -0,0 +1,101 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+# A templated segment looks like "{name}" and captures exactly one path segment
+PARAM_SEGMENT = re.compile(r"^\{([A-Za-z_][A-Za-z0-9_]*)\}$")
+
+
+def normalize_path(path: str) -> str:
+    """Strips surrounding slashes so "/orders/{id}/" and "orders/{id}" are the same route."""
+    return path.strip().strip("/")
+
+
+def split_path(path: str) -> List[str]:
+    normalized = normalize_path(path)
+    return normalized.split("/") if normalized else []
+
+
+def route_shape(path: str) -> str:
+    """Returns the path with parameter names erased, e.g. "orders/{}/items".
+
+    Two endpoints with the same shape and method can never be told apart by the trie.
+    """
+    return "/".join("{}" if PARAM_SEGMENT.match(s) else s for s in split_path(path))
+
+
+def path_param_names(path: str) -> List[str]:
+    names = []
+    for segment in split_path(path):
+        match = PARAM_SEGMENT.match(segment)
+        if match:
+            names.append(match.group(1))
+    return names
+
+
+class _Node:
+    __slots__ = ("static", "param", "endpoint_id", "param_names")
+
+    def __init__(self) -> None:
+        self.static: Dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        self.endpoint_id: Optional[UUID] = None
+        self.param_names: Tuple[str, ...] = ()
+
+
+class RouteTrie:
+    """Segment trie for the endpoint paths of one group and method.
+
+    Static segments are dict lookups and every templated segment of a node shares
+    one parameter child, so a lookup walks at most one node per request segment
+    (plus backtracking when a static branch dead-ends) regardless of how many
+    endpoints the group has. Parameter names live on the leaf, which lets
+    "orders/{id}" and "orders/{order_id}/items" share the same parameter node.
+    """
+
+    def __init__(self) -> None:
+        self.root = _Node()
+        self.size = 0
+
+    def insert(self, path: str, endpoint_id: UUID) -> None:
+        node = self.root
+        names = []
+        for segment in split_path(path):
+            match = PARAM_SEGMENT.match(segment)
+            if match:
+                names.append(match.group(1))
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, _Node())
+        if node.endpoint_id is None:
+            self.size += 1
+        node.endpoint_id = endpoint_id
+        node.param_names = tuple(names)
+
+    def match(self, path: str) -> Optional[Tuple[UUID, Dict[str, str]]]:
+        segments = split_path(path)
+        captured: List[str] = []
+        node = self._walk(self.root, segments, 0, captured)
+        if node is None:
+            return None
+        return node.endpoint_id, dict(zip(node.param_names, captured))
+
+    def _walk(self, node: _Node, segments: List[str], index: int, captured: List[str]) -> Optional[_Node]:
+        if index == len(segments):
+            return node if node.endpoint_id is not None else None
+        segment = segments[index]
+        # Static segments always win over templated ones
+        child = node.static.get(segment)
+        if child is not None:
+            found = self._walk(child, segments, index + 1, captured)
+            if found is not None:
+                return found
+        if node.param is not None and segment:
+            captured.append(segment)
+            found = self._walk(node.param, segments, index + 1, captured)
+            if found is not None:
+                return found
+            captured.pop()
+        return None
@@ -0,0 +1,172 @@
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, Mapping, NamedTuple, Optional
+from uuid import UUID, uuid4
+
+# How a header or URL parameter value is checked. The rule's `value` is the literal
+# for "exact", the pattern for "regex" and the comma-separated choices for "enum";
+# "integer" and "number" accept optional minimum/maximum bounds.
+MATCH_TYPES = ("exact", "regex", "enum", "integer", "number", "boolean", "uuid")
+
+BOOLEAN_VALUES = frozenset(("true", "false", "1", "0"))
+
+
+def _in_range(value: float, minimum: Optional[float], maximum: Optional[float]) -> bool:
+    return (minimum is None or value >= minimum) and (maximum is None or value <= maximum)
+
+
+def _parses(parser: Callable[[str], Any], minimum: Optional[float], maximum: Optional[float]) -> Callable[[str], bool]:
+    def check(value: str) -> bool:
+        try:
+            parsed = parser(value)
+        except ValueError:
+            return False
+        return _in_range(parsed, minimum, maximum)
+    return check
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def compile_predicate(
+    match_type: str,
+    value: str,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+) -> Callable[[str], bool]:
+    """Builds the check for one rule. Raises ValueError for an unusable rule."""
+    if match_type == "exact":
+        return value.__eq__
+    if match_type == "regex":
+        try:
+            return re.compile(value).fullmatch
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression '{value}': {e}")
+    if match_type == "enum":
+        choices = frozenset(choice.strip() for choice in value.split(",") if choice.strip())
+        if not choices:
+            raise ValueError("Enum rules need at least one comma-separated value")
+        return choices.__contains__
+    if match_type in ("integer", "number"):
+        if minimum is not None and maximum is not None and minimum > maximum:
+            raise ValueError("minimum must not be greater than maximum")
+        return _parses(int if match_type == "integer" else float, minimum, maximum)
+    if match_type == "boolean":
+        return lambda candidate: candidate.lower() in BOOLEAN_VALUES
+    if match_type == "uuid":
+        return _is_uuid
+    raise ValueError(f"Unknown match type '{match_type}', expected one of {', '.join(MATCH_TYPES)}")
+
+
+def sample_value(
+    match_type: str,
+    value: str,
+    minimum: Optional[float] = None,
+    maximum: Optional[float] = None,
+) -> Optional[str]:
+    """A value the rule accepts, or None when none can be derived from it.
+
+    Regex rules only yield their own text when it matches itself (a literal
+    pattern); a pattern cannot be turned into an example in general.
+    """
+    match_type = match_type or "exact"
+    if match_type in ("exact", "regex"):
+        candidate = value
+    elif match_type == "enum":
+        candidate = next((choice.strip() for choice in value.split(",") if choice.strip()), "")
+    elif match_type == "integer":
+        low = math.ceil(minimum) if minimum is not None else 0
+        if minimum is None and maximum is not None and maximum < 0:
+            low = math.floor(maximum)
+        candidate = str(low)
+    elif match_type == "number":
+        low = minimum if minimum is not None else 0.0
+        if minimum is None and maximum is not None and maximum < 0:
+            low = maximum
+        candidate = repr(float(low))
+    elif match_type == "boolean":
+        candidate = "true"
+    elif match_type == "uuid":
+        candidate = str(uuid4())
+    else:
+        return None
+    try:
+        accepted = compile_predicate(match_type, value, minimum, maximum)(candidate)
+    except ValueError:
+        return None
+    return candidate if accepted else None
+
+
+class CompiledRule(NamedTuple):
+    name: str
+    check: Callable[[str], Any]
+    default_response: Optional[Dict[str, Any]]
+    default_status_code: Optional[int]
+
+
+class Violation(NamedTuple):
+    kind: str  # "header" or "parameter"
+    rule: CompiledRule
+
+
+def _compile(rules: Iterable[Any], lower_names: bool) -> Dict[str, CompiledRule]:
+    compiled: Dict[str, CompiledRule] = {}
+    for rule in rules:
+        # Only required rules reject requests; optional ones document the contract
+        if not rule.required:
+            continue
+        name = rule.name.lower() if lower_names else rule.name
+        compiled[name] = CompiledRule(
+            name=rule.name,
+            check=compile_predicate(
+                getattr(rule, "match_type", None) or "exact",
+                rule.value,
+                getattr(rule, "minimum", None),
+                getattr(rule, "maximum", None),
+            ),
+            default_response=rule.default_response,
+            default_status_code=rule.default_status_code,
+        )
+    return compiled
+
+
+class RequestMatcher:
+    """Required header and URL-parameter rules of one endpoint, compiled once.
+
+    Header names are stored lower-cased to match Starlette's header mapping, so
+    checking a request is one dict lookup and one precompiled predicate per rule.
+    """
+
+    __slots__ = ("headers", "params")
+
+    def __init__(self, headers: Iterable[Any], params: Iterable[Any]) -> None:
+        self.headers = _compile(headers, lower_names=True)
+        self.params = _compile(params, lower_names=False)
+
+    def __bool__(self) -> bool:
+        return bool(self.headers or self.params)
+
+    def check(
+        self,
+        headers: Mapping[str, str],
+        path_params: Mapping[str, str],
+        query_params: Mapping[str, str],
+    ) -> Optional[Violation]:
+        """Returns the first rule the request breaks, or None."""
+        for name, rule in self.headers.items():
+            value = headers.get(name)
+            if value is None or not rule.check(value):
+                return Violation("header", rule)
+        for name, rule in self.params.items():
+            # Captured path parameters take precedence over the query string
+            value = path_params.get(name)
+            if value is None:
+                value = query_params.get(name)
+            if value is None or not rule.check(value):
+                return Violation("parameter", rule)
+        return None
@@ -0,0 +1,309 @@
+"""Management commands for the Estoca Mock API backend.
+
+Usage: poetry run python manage.py <command> [options]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from uuid import UUID
+
+# Cold-import budget for the app module, and heavy packages it must only load on first use
+IMPORT_BUDGET_MS = 1000
+LAZY_MODULES = ("faker", "jsf", "jsonschema", "asyncpg")
+
+
+def loadgen(args: argparse.Namespace) -> int:
+    from app.services.load_generator import run_load_test
+
+    if args.rate is None and args.concurrency is None:
+        args.rate = 100.0
+    report = asyncio.run(
+        run_load_test(
+            args.group,
+            url=args.url,
+            rate=args.rate,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            chaos_ratio=args.chaos_ratio,
+            max_in_flight=args.max_in_flight,
+        )
+    )
+    if args.json:
+        print(json.dumps({"elapsed": report.elapsed, "unsent": report.unsent, "warnings": report.warnings, "results": report.summary()}, indent=2))
+    else:
+        print(report.render())
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    if args.config_dir:
+        # Read by the settings of every worker, so it must be set before they are imported
+        os.environ["EMBEDDED_CONFIG_DIR"] = os.path.abspath(args.config_dir)
+    from app.core.config import settings
+    from app.server import serve as run_server
+
+    def option(value, default):
+        return default if value is None else value
+
+    return run_server(
+        host=option(args.host, settings.SERVE_HOST),
+        port=option(args.port, settings.SERVE_PORT),
+        workers=option(args.workers, settings.SERVE_WORKERS),
+        max_requests=option(args.max_requests, settings.SERVE_MAX_REQUESTS),
+        max_requests_jitter=option(args.max_requests_jitter, settings.SERVE_MAX_REQUESTS_JITTER),
+        graceful_timeout=option(args.graceful_timeout, settings.SERVE_GRACEFUL_TIMEOUT_SECONDS),
+        backlog=args.backlog,
+        log_level=args.log_level,
+        access_log=args.access_log,
+    )
+
+
+def endpoint_filter(args: argparse.Namespace):
+    from app.services.maintenance import EndpointFilter
+
+    return EndpointFilter(group=args.group, path=args.path, method=args.method, name=args.name, ids=args.id)
+
+
+async def run_in_session(operation, *args, **kwargs):
+    from app.db.session import AsyncSessionLocal, dispose_engine
+
+    try:
+        async with AsyncSessionLocal() as session:
+            return await operation(session, *args, **kwargs)
+    finally:
+        await dispose_engine()
+
+
+def dedupe(args: argparse.Namespace) -> int:
+    from app.services.maintenance import dedupe_endpoints
+
+    count = asyncio.run(run_in_session(dedupe_endpoints, sys.stdout, dry_run=args.dry_run))
+    print(f"{'Would remove' if args.dry_run else 'Removed'} {count} duplicate endpoints", file=sys.stderr)
+    return 0
+
+
+def list_command(args: argparse.Namespace) -> int:
+    from app.services.maintenance import list_endpoints
+
+    count = asyncio.run(run_in_session(list_endpoints, endpoint_filter(args), sys.stdout))
+    print(f"{count} endpoints", file=sys.stderr)
+    return 0
+
+
+def export(args: argparse.Namespace) -> int:
+    from app.services.maintenance import export_endpoints
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        count = asyncio.run(run_in_session(export_endpoints, endpoint_filter(args), out))
+    finally:
+        if args.output:
+            out.close()
+    print(f"Exported {count} endpoints", file=sys.stderr)
+    return 0
+
+
+def update(args: argparse.Namespace) -> int:
+    from app.services.maintenance import parse_assignments, update_endpoints
+
+    selection = endpoint_filter(args)
+    if selection.empty and not args.all:
+        raise SystemExit("Select endpoints with --group/--path/--method/--name/--id, or pass --all")
+    try:
+        values = parse_assignments(args.set)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    try:
+        count = asyncio.run(run_in_session(update_endpoints, selection, values, sys.stdout, dry_run=args.dry_run))
+    except ValueError as e:
+        raise SystemExit(str(e))
+    print(f"{'Would update' if args.dry_run else 'Updated'} {count} endpoints", file=sys.stderr)
+    return 0
+
+
+def export_static(args: argparse.Namespace) -> int:
+    from app.core.config import settings
+    from app.services.static_export import export_static as export_static_endpoints
+
+    directory = args.output or settings.STATIC_EXPORT_DIR
+    if not directory:
+        raise SystemExit("Pass --output or set STATIC_EXPORT_DIR")
+    nginx_dir = args.nginx_dir or settings.STATIC_EXPORT_NGINX_DIR
+    manifest, exported, skipped = asyncio.run(run_in_session(export_static_endpoints, directory, nginx_dir))
+    state = f"version {manifest['version']}" if manifest else "unchanged"
+    print(f"Exported {exported} static endpoints ({state}); {skipped} candidates left to the backend", file=sys.stderr)
+    return 0
+
+
+def add_filter_arguments(cmd: argparse.ArgumentParser) -> None:
+    cmd.add_argument("--group", help="Group name (case-insensitive)")
+    cmd.add_argument("--path")
+    cmd.add_argument("--method")
+    cmd.add_argument("--name", help="Endpoint name")
+    cmd.add_argument("--id", action="append", type=UUID, help="Endpoint id (repeatable)")
+
+
+def measure_import(module: str) -> dict:
+    """Imports `module` in a fresh interpreter and returns {module: (self_us, cumulative_us)}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def importtime(args: argparse.Namespace) -> int:
+    # Best of several runs, so a noisy neighbour does not fail the budget
+    runs = [measure_import(args.module) for _ in range(args.runs)]
+    timings = min(runs, key=lambda run: run[args.module][1])
+    total_ms = timings[args.module][1] / 1000
+    print(f"import {args.module}: {total_ms:.0f} ms (budget {args.budget_ms} ms, best of {args.runs})")
+    print("Slowest modules by self time:")
+    for name, (self_us, _) in sorted(timings.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"{total_ms:.0f} ms exceeds the {args.budget_ms} ms budget")
+    eager = [name for name in LAZY_MODULES if name in timings]
+    if eager:
+        failures.append(f"imported eagerly, should load on first use: {', '.join(eager)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Estoca Mock API management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser(
+        "loadgen",
+        help="Drive a group's mock endpoints with synthesized valid requests",
+        description=(
+            "Builds valid requests from the stored endpoint definitions and sends them "
+            "either at a fixed rate (open loop, default) or with a fixed number of "
+            "outstanding requests (--concurrency)."
+        ),
+    )
+    cmd.add_argument("group", help="Group name")
+    cmd.add_argument("--url", help="Base URL of a running server, e.g. http://localhost:8000. Omit to run in-process")
+    mode = cmd.add_mutually_exclusive_group()
+    mode.add_argument("--rate", type=float, help="Target requests per second (open loop, default 100)")
+    mode.add_argument("--concurrency", type=int, help="Number of outstanding requests (closed loop)")
+    cmd.add_argument("--duration", type=float, default=10.0, help="Seconds to run (default 10)")
+    cmd.add_argument("--chaos-ratio", type=float, default=0.0, help="Share of requests sent to /chaos (default 0)")
+    cmd.add_argument("--max-in-flight", type=int, default=10000, help="Requests skipped and counted beyond this many in flight")
+    cmd.add_argument("--json", action="store_true", help="Print the report as JSON")
+    cmd.set_defaults(func=loadgen)
+
+    # Unset options fall back to the SERVE_* settings
+    cmd = commands.add_parser(
+        "serve",
+        help="Run the API with several worker processes",
+        description=(
+            "Starts N uvicorn workers sharing one listening socket. Workers warm up "
+            "before accepting, are replaced after --max-requests, and drain in-flight "
+            "requests on SIGTERM for up to --graceful-timeout seconds."
+        ),
+    )
+    cmd.add_argument("--host")
+    cmd.add_argument("--port", type=int)
+    cmd.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    cmd.add_argument("--max-requests", type=int, help="Recycle a worker after this many requests (0 disables)")
+    cmd.add_argument("--max-requests-jitter", type=int, help="Random extra requests per worker, to stagger recycling")
+    cmd.add_argument("--graceful-timeout", type=int, help="Seconds in-flight requests get to finish on shutdown")
+    cmd.add_argument("--backlog", type=int, default=2048)
+    cmd.add_argument("--log-level", default="info")
+    cmd.add_argument("--access-log", action="store_true", help="Log every request")
+    cmd.add_argument("--config-dir", help="Serve groups and endpoints from JSON/YAML files here, without a database")
+    cmd.set_defaults(func=serve)
+
+    cmd = commands.add_parser(
+        "importtime",
+        help="Check the app's cold import time against its budget",
+        description=(
+            "Imports the app in fresh interpreters with -X importtime, lists the slowest "
+            "modules and exits non-zero when the budget is exceeded or a heavy package "
+            f"({', '.join(LAZY_MODULES)}) is imported eagerly."
+        ),
+    )
+    cmd.add_argument("--module", default="app.main")
+    cmd.add_argument("--budget-ms", type=int, default=IMPORT_BUDGET_MS)
+    cmd.add_argument("--runs", type=int, default=3)
+    cmd.add_argument("--top", type=int, default=15)
+    cmd.set_defaults(func=importtime)
+
+    # Endpoint maintenance: set-based statements and streamed output, whatever the table size
+    cmd = commands.add_parser(
+        "dedupe",
+        help="Delete duplicate endpoints (same group, method and path shape), keeping the oldest",
+        description="Paths differing only in parameter names count as duplicates, as in the API.",
+    )
+    cmd.add_argument("--dry-run", action="store_true", help="Only list what would be deleted")
+    cmd.set_defaults(func=dedupe)
+
+    cmd = commands.add_parser("list", help="List endpoints with their hit totals")
+    add_filter_arguments(cmd)
+    cmd.set_defaults(func=list_command)
+
+    cmd = commands.add_parser(
+        "export",
+        help="Export endpoints as JSON Lines",
+        description="One endpoint per line, with its group name, headers and URL parameters.",
+    )
+    add_filter_arguments(cmd)
+    cmd.add_argument("--output", "-o", help="File to write (default: stdout)")
+    cmd.set_defaults(func=export)
+
+    cmd = commands.add_parser(
+        "export-static",
+        help="Compile constant GET endpoints into files and an nginx include",
+        description=(
+            "Writes the response of every endpoint nginx can serve on its own (constant body, "
+            "no header or parameter rules, no wait, no scenario) with a gzip variant, and "
+            "mock-static.conf with a location per endpoint. Nothing is rewritten when the export is unchanged."
+        ),
+    )
+    cmd.add_argument("--output", "-o", help="Export directory (default: STATIC_EXPORT_DIR)")
+    cmd.add_argument("--nginx-dir", help="The directory as nginx sees it, when mounted elsewhere")
+    cmd.set_defaults(func=export_static)
+
+    cmd = commands.add_parser(
+        "update",
+        help="Set fields on every selected endpoint with one UPDATE",
+        description=(
+            "Example: manage.py update --group shop --method GET --set max_wait_time=0 --set chaos_mode=false. "
+            "Values are parsed as JSON where possible; text fields such as response_body are taken verbatim."
+        ),
+    )
+    add_filter_arguments(cmd)
+    cmd.add_argument("--set", action="append", required=True, metavar="FIELD=VALUE")
+    cmd.add_argument("--all", action="store_true", help="Allow updating every endpoint when no filter is given")
+    cmd.add_argument("--dry-run", action="store_true", help="Only list the endpoints that would be updated")
+    cmd.set_defaults(func=update)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
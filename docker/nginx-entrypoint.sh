@@ -4,5 +4,19 @@
 envsubst '$DOMAIN' < /etc/nginx/nginx.conf > /etc/nginx/nginx.conf.tmp
 mv /etc/nginx/nginx.conf.tmp /etc/nginx/nginx.conf
 
+# Reload whenever the backend rewrites the static mock endpoint include; a config
+# that fails `nginx -t` is not loaded and the previous one keeps serving
+STATIC_CONF=/srv/mock-static/mock-static.conf
+(
+    last=$(md5sum "$STATIC_CONF" 2>/dev/null)
+    while sleep 2; do
+        current=$(md5sum "$STATIC_CONF" 2>/dev/null)
+        if [ "$current" != "$last" ]; then
+            last="$current"
+            nginx -t -q && nginx -s reload
+        fi
+    done
+) &
+
 # Start Nginx in the foreground
 exec nginx -g "daemon off;" 
\ No newline at end of file
@@ -47,8 +47,8 @@ const formSchema = z.object({
   path: z.string()
     .min(1, "Path is required")
     .regex(
-      /^[a-z0-9_-]+$/,
-      "Path can only contain lowercase letters, numbers, underscores, and hyphens (no spaces or slashes)"
+      /^([a-z0-9_-]+|\{[A-Za-z_][A-Za-z0-9_]*\})(\/([a-z0-9_-]+|\{[A-Za-z_][A-Za-z0-9_]*\}))*$/,
+      "Path segments can only contain lowercase letters, numbers, underscores, and hyphens, or be a parameter like {id} (e.g. orders/{id}/items)"
     ),
   method: z.enum(["GET", "POST", "PUT", "PATCH", "DELETE"]),
   max_wait_time: z.number().min(0),
@@ -258,6 +258,9 @@ export function EndpointForm({ groupId, initialData, endpointId }: EndpointFormP
         required: header.required || false,
         default_response: header.default_response || undefined, // Use undefined if needed
         default_status_code: header.default_status_code || undefined,
+        match_type: header.match_type || "exact",
+        minimum: header.minimum ?? null,
+        maximum: header.maximum ?? null,
       }))
 
       const sanitizedUrlParameters = values.url_parameters.map(param => ({
@@ -266,6 +269,9 @@ export function EndpointForm({ groupId, initialData, endpointId }: EndpointFormP
         required: param.required || false,
         default_response: param.default_response || undefined,
         default_status_code: param.default_status_code || undefined,
+        match_type: param.match_type || "exact",
+        minimum: param.minimum ?? null,
+        maximum: param.maximum ?? null,
       }))
 
       // Prepare the core data payload matching EndpointBase/EndpointUpdate type
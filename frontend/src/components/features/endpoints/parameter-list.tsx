@@ -4,11 +4,30 @@ import { useState } from "react"
 import { Button } from "@/components/ui/button"
 import { Input } from "@/components/ui/input"
 import { Textarea } from "@/components/ui/textarea"
-import { type Header, type UrlParameter } from "@/types/endpoint"
+import { type Header, type MatchType, type UrlParameter } from "@/types/endpoint"
 import { safeJsonParse, safeJsonStringify } from "@/lib/utils"
 import { useToast } from "@/components/ui/use-toast"
 import { cn } from "@/lib/utils"
 
+const MATCH_TYPES: { value: MatchType; label: string }[] = [
+  { value: "exact", label: "Exact value" },
+  { value: "regex", label: "Regex" },
+  { value: "enum", label: "One of (comma-separated)" },
+  { value: "integer", label: "Integer (range)" },
+  { value: "number", label: "Number (range)" },
+  { value: "boolean", label: "Boolean" },
+  { value: "uuid", label: "UUID" },
+]
+
+// Value-less rules only check the type (and range)
+const needsValue = (matchType?: MatchType) =>
+  !matchType || ["exact", "regex", "enum"].includes(matchType)
+
+const isRange = (matchType?: MatchType) =>
+  matchType === "integer" || matchType === "number"
+
+const parseBound = (value: string) => (value === "" ? null : Number(value))
+
 interface ParameterListProps {
   type: "header" | "parameter"
   items: (Header | UrlParameter)[]
@@ -25,10 +44,11 @@ export function ParameterList({ type, items, onChange }: ParameterListProps) {
     required: false,
     default_response: undefined,
     default_status_code: 400,
+    match_type: "exact" as MatchType,
   })
 
   const addItem = () => {
-    if (!newItem.name || !newItem.value) return
+    if (!newItem.name || (needsValue(newItem.match_type) && !newItem.value)) return
 
     const item: Header | UrlParameter = {
       id: crypto.randomUUID(),
@@ -38,6 +58,7 @@ export function ParameterList({ type, items, onChange }: ParameterListProps) {
       required: newItem.required,
       default_response: newItem.default_response,
       default_status_code: newItem.default_status_code,
+      match_type: newItem.match_type,
     }
 
     onChange([...items, item])
@@ -47,6 +68,7 @@ export function ParameterList({ type, items, onChange }: ParameterListProps) {
       required: false,
       default_response: undefined,
       default_status_code: 400,
+      match_type: "exact",
     })
   }
 
@@ -213,11 +235,22 @@ export function ParameterList({ type, items, onChange }: ParameterListProps) {
           value={newItem.name}
           onChange={(e) => setNewItem({ ...newItem, name: e.target.value })}
         />
-        <Input
-          placeholder={`Enter ${type} value`}
-          value={newItem.value}
-          onChange={(e) => setNewItem({ ...newItem, value: e.target.value })}
-        />
+        <select
+          className="h-10 rounded-md border border-input bg-background px-3 text-sm"
+          value={newItem.match_type}
+          onChange={(e) => setNewItem({ ...newItem, match_type: e.target.value as MatchType })}
+        >
+          {MATCH_TYPES.map((option) => (
+            <option key={option.value} value={option.value}>{option.label}</option>
+          ))}
+        </select>
+        {needsValue(newItem.match_type) && (
+          <Input
+            placeholder={`Enter ${type} value`}
+            value={newItem.value}
+            onChange={(e) => setNewItem({ ...newItem, value: e.target.value })}
+          />
+        )}
         <Button type="button" onClick={addItem}>
           Add {type}
         </Button>
@@ -238,13 +271,46 @@ export function ParameterList({ type, items, onChange }: ParameterListProps) {
                     updateItem(item.id, { name: e.target.value })
                   }
                 />
-                <Input
-                  placeholder="Value"
-                  value={item.value}
+                <select
+                  className="h-10 rounded-md border border-input bg-background px-3 text-sm"
+                  value={item.match_type || "exact"}
                   onChange={(e) =>
-                    updateItem(item.id, { value: e.target.value })
+                    updateItem(item.id, { match_type: e.target.value as MatchType })
                   }
-                />
+                >
+                  {MATCH_TYPES.map((option) => (
+                    <option key={option.value} value={option.value}>{option.label}</option>
+                  ))}
+                </select>
+                {needsValue(item.match_type) && (
+                  <Input
+                    placeholder={item.match_type === "regex" ? "Pattern" : item.match_type === "enum" ? "a, b, c" : "Value"}
+                    value={item.value}
+                    onChange={(e) =>
+                      updateItem(item.id, { value: e.target.value })
+                    }
+                  />
+                )}
+                {isRange(item.match_type) && (
+                  <>
+                    <Input
+                      type="number"
+                      placeholder="Min"
+                      value={item.minimum ?? ""}
+                      onChange={(e) =>
+                        updateItem(item.id, { minimum: parseBound(e.target.value) })
+                      }
+                    />
+                    <Input
+                      type="number"
+                      placeholder="Max"
+                      value={item.maximum ?? ""}
+                      onChange={(e) =>
+                        updateItem(item.id, { maximum: parseBound(e.target.value) })
+                      }
+                    />
+                  </>
+                )}
                 <div className="flex items-center gap-2">
                   <input
                     type="checkbox"
@@ -1,5 +1,6 @@
 export type HttpMethod = "GET" | "POST" | "PUT" | "PATCH" | "DELETE"
 export type UUID = string
+export type MatchType = "exact" | "regex" | "enum" | "integer" | "number" | "boolean" | "uuid"
 
 // --- Base types mirroring Pydantic Schemas ---
 
@@ -9,6 +10,9 @@ interface HeaderBase {
   required?: boolean
   default_response?: Record<string, any>
   default_status_code?: number
+  match_type?: MatchType
+  minimum?: number | null
+  maximum?: number | null
 }
 
 interface UrlParameterBase {
@@ -17,9 +21,24 @@ interface UrlParameterBase {
   required?: boolean
   default_response?: Record<string, any>
   default_status_code?: number
+  match_type?: MatchType
+  minimum?: number | null
+  maximum?: number | null
 }
 
 // Define EndpointBase mirroring Pydantic
+export interface StreamConfig {
+  rate?: number
+  jitter?: number
+  burst?: { size: number; every_seconds: number } | null
+  chaos?: {
+    disconnect_rate?: number
+    stall_rate?: number
+    stall_seconds?: number
+    malformed_rate?: number
+  }
+}
+
 export interface EndpointBase {
   name: string
   description?: string | null
@@ -32,6 +51,10 @@ export interface EndpointBase {
   response_status_code?: number
   response_body?: string | null
   request_body_schema?: Record<string, any> | null
+  response_size_bytes?: number | null
+  stream_type?: "sse" | "websocket" | null
+  stream_config?: StreamConfig | null
+  fixture_dataset?: string | null
   headers?: HeaderBase[]
   url_parameters?: UrlParameterBase[]
 }